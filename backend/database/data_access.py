@@ -2,11 +2,13 @@ from datetime import date, datetime, timedelta
 
 from cachetools import TTLCache, cached
 from sqlalchemy import String, Select, func
-from sqlmodel import select, col, Session, cast
+from sqlmodel import select, col, Session, cast, delete
 
+from model.cached_solution import CachedSolution
 from model.food import Food
 from food_vendors.food_vendor_type import FoodVendorType
 from model.job_run import JobRun, JobStatus, JobType
+from model.menu_version import MenuVersion, compute_menu_digest
 from monitoring.performance import benchmark
 from constants import ONE_DAY
 from settings import SETTINGS
@@ -36,13 +38,24 @@ def get_available_dates_for_vendor(session: Session, target_date: date, vendor_t
     return list(session.exec(statement).all())
 
 
+def get_foods_for_given_date(
+        session: Session,
+        target_date: date,
+        food_vendor: FoodVendorType,
+) -> list[Food]:
+    """Foods of the menu, cached per menu version so a re-ingested menu is picked up right away."""
+    return _get_foods_for_menu_version(session, target_date, food_vendor,
+                                       get_menu_version(session, target_date, food_vendor))
+
+
 @benchmark
 @cached(TTLCache(maxsize=SETTINGS.LARGE_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL),
-        key=lambda session, target_date, food_vendor: (target_date, food_vendor))
-def get_foods_for_given_date(
+        key=lambda session, target_date, food_vendor, menu_version: (target_date, food_vendor, menu_version))
+def _get_foods_for_menu_version(
         session: Session,
         target_date: date,
         food_vendor: FoodVendorType,
+        menu_version: str | None,
 ) -> list[Food]:
     statement = (select(Food)
                  .where(Food.date == target_date)
@@ -51,6 +64,14 @@ def get_foods_for_given_date(
     return list(session.exec(statement).all())
 
 
+@cached(TTLCache(maxsize=SETTINGS.LARGE_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL),
+        key=lambda session, target_date, food_vendor: (target_date, food_vendor))
+def get_menu_version(session: Session, target_date: date, food_vendor: FoodVendorType) -> str | None:
+    """Cached until `save_foods_to_db` stores a menu, the only place versions change."""
+    menu_version = session.get(MenuVersion, (target_date, food_vendor))
+    return menu_version.digest if menu_version else None
+
+
 def filter_blacklisted_foods(foods: list[Food], food_blacklist: list[str] = None) -> list[Food]:
     """Filter out blacklisted foods from the given list in memory."""
     if not food_blacklist:
@@ -105,6 +126,22 @@ def save_foods_to_db(session: Session, foods: list[Food]) -> None:
         session.merge(food)
     session.commit()
 
+    _update_menu_versions(session, {(food.date, food.food_vendor) for food in foods})
+    # New menus can add dates and change versions, the food caches are keyed by menu version and need no clearing
+    get_menu_version.cache_clear()
+    get_unique_dates_after.cache_clear()
+    get_available_dates_for_vendor.cache_clear()
+
+
+def _update_menu_versions(session: Session, menus: set[tuple[date, FoodVendorType]]) -> None:
+    for target_date, food_vendor in menus:
+        statement = (select(Food)
+                     .where(Food.date == target_date)
+                     .where(Food.food_vendor == food_vendor))
+        digest = compute_menu_digest(list(session.exec(statement).all()))
+        session.merge(MenuVersion(date=target_date, food_vendor=food_vendor, digest=digest))
+    session.commit()
+
 
 def has_recent_successful_backup(session: Session, days: int) -> bool:
     """Check if there's a successful backup within the specified number of days."""
@@ -116,3 +153,18 @@ def has_recent_successful_backup(session: Session, days: int) -> bool:
                 .where(JobRun.timestamp >= cutoff_time))
     
     return session.exec(statement).first() is not None
+
+
+def get_cached_solution(session: Session, fingerprint: str) -> CachedSolution | None:
+    return session.get(CachedSolution, fingerprint)
+
+
+def save_cached_solution(session: Session, cached_solution: CachedSolution) -> None:
+    session.merge(cached_solution)
+    session.commit()
+
+
+def delete_cached_solutions_before(session: Session, target_date: date) -> int:
+    result = session.exec(delete(CachedSolution).where(CachedSolution.date < target_date))
+    session.commit()
+    return result.rowcount
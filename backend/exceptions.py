@@ -6,4 +6,13 @@ class MealPlanRequestException(Exception):
         self.field = field
 
 class TeletalUnavailableFoodError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class SolverBackendUnavailableError(Exception):
+    pass
+
+class SolverPoolBusyError(Exception):
+    pass
+
+class WorkerModelMissingError(Exception):
+    pass
@@ -15,6 +15,7 @@ from food_vendors.strategies.food_collection_strategy import FoodCollectionStrat
 from food_vendors.strategies.teletal.teletal_client import TeletalClient
 from jobs.base_job import BaseJob
 from jobs.file_utils import save_to_json, save_image_to_webp
+from jobs.meal_plan_precompute_job import run_precompute_meal_plans_job
 from model.food import Food
 from model.job_run import JobType, FoodDataCollectorDetails
 import logging
@@ -33,6 +34,8 @@ def run_collect_food_data_job(mode: RunMode = SETTINGS.MODE):
         if mode == RunMode.TESTING:
             FoodDataCollector(session, [VENDOR_REGISTRY[FoodVendorType.CITY_FOOD].strategy]).run()
 
+    run_precompute_meal_plans_job()
+
 
 class FoodDataCollectorJob(BaseJob):
     """Individual job that collects food data for one vendor and one week."""
@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+from sqlmodel import Session
+
+from database.data_access import get_available_dates_for_vendor, get_foods_for_given_date, filter_blacklisted_foods
+from database.db import ENGINE
+from exceptions import SolverPoolBusyError
+from food_vendors.food_vendor_type import FoodVendorType
+from jobs.base_job import BaseJob
+from model.food import Food
+from model.job_run import JobType, MealPlanPrecomputeDetails
+from monitoring.logging import JOB_LOGGER
+from monitoring.performance import benchmark
+from optimizers.concurrent_solves import solve_concurrently
+from optimizers.meal_optimizer import find_meal_plan_infeasibility, solve_meal_plan_ilp
+from optimizers.meal_plan_model import MealPlanModel, get_meal_plan_model
+from optimizers.popular_requests import POPULAR_REQUESTS, PRESET_REQUEST_SHAPES, RequestShape
+from optimizers.request_fingerprint import RequestFingerprint
+from settings import SETTINGS
+
+
+@benchmark
+def run_precompute_meal_plans_job():
+    JOB_LOGGER.info("🔄 Precomputing popular meal plans...")
+    popular_shapes = POPULAR_REQUESTS.most_common(SETTINGS.PRECOMPUTE_POPULAR_REQUESTS)
+    shapes = list(dict.fromkeys(PRESET_REQUEST_SHAPES + popular_shapes))
+    with Session(ENGINE) as session:
+        MealPlanPrecomputeJob(session, shapes, list(FoodVendorType)).run()
+
+    POPULAR_REQUESTS.decay()
+
+
+class MealPlanPrecomputeJob(BaseJob):
+    """Solves the given request shapes for every upcoming menu, so their first request of the day is a cache hit."""
+
+    def __init__(self,
+                 session: Session,
+                 shapes: list[RequestShape],
+                 food_vendors: list[FoodVendorType],
+                 concurrency: int = SETTINGS.PRECOMPUTE_CONCURRENCY):
+        super().__init__(session, JobType.MEAL_PLAN_PRECOMPUTATION)
+        self._shapes = shapes
+        self._food_vendors = food_vendors
+        self._concurrency = concurrency
+
+    def _execute(self) -> dict:
+        yesterday = date.today() - timedelta(days=1)
+        solves = [(shape, plan_date, food_vendor)
+                  for food_vendor in self._food_vendors
+                  for plan_date in get_available_dates_for_vendor(self._session, yesterday, food_vendor)
+                  for shape in self._shapes]
+
+        menus = {}
+
+        def load(solve: tuple[RequestShape, date, FoodVendorType]) -> tuple[list[Food], MealPlanModel]:
+            _, plan_date, food_vendor = solve
+            if (plan_date, food_vendor) not in menus:
+                foods = get_foods_for_given_date(self._session, plan_date, food_vendor)
+                menus[plan_date, food_vendor] = foods, get_meal_plan_model(plan_date, food_vendor, foods)
+            return menus[plan_date, food_vendor]
+
+        solved = sum(solve_concurrently(solves, load, lambda solve, menu: _precompute(*solve, *menu),
+                                        max_workers=self._concurrency))
+
+        self._logger.info(f"✅ Precomputed {solved} of {len(solves)} meal plans")
+
+        details = MealPlanPrecomputeDetails(request_shapes=len(self._shapes), solved=solved,
+                                            skipped=len(solves) - solved)
+        return details.model_dump()
+
+    def _create_logger_context(self) -> dict:
+        return {"request_shapes": len(self._shapes)}
+
+
+def _precompute(shape: RequestShape, plan_date: date, food_vendor: FoodVendorType, foods: list[Food],
+                model: MealPlanModel) -> bool:
+    meal_plan_request = shape.for_menu(plan_date, food_vendor)
+    food_selection = filter_blacklisted_foods(foods, meal_plan_request.food_blacklist)
+    if not food_selection:
+        return False
+
+    fingerprint = RequestFingerprint.from_request(meal_plan_request, model.menu_version)
+    if find_meal_plan_infeasibility(fingerprint, model, food_selection) is not None:
+        return False
+
+    try:
+        # Stores the plan in the solution caches as a side effect
+        solution, _ = solve_meal_plan_ilp(fingerprint, model, food_selection)
+        return bool(solution.food_counts)
+    except SolverPoolBusyError:
+        # User requests have priority over warming the cache
+        return False
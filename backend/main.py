@@ -9,11 +9,14 @@ from starlette.responses import JSONResponse
 
 from database.data_access import is_database_empty
 from database.db import init_db, ENGINE
-from exceptions import MealPlanRequestException
+from exceptions import MealPlanRequestException, SolverPoolBusyError
 from jobs.food_data_collector_job import run_collect_food_data_job
 from jobs.database_backup_job import run_database_backup_job
 from jobs.job_scheduler import SCHEDULER
 from monitoring.logging import LoggingMiddleware, APP_LOGGER
+from optimizers.solution_store import SOLUTION_STORE, purge_expired_solutions
+from optimizers.solver_backends import get_solver_backend
+from optimizers.solver_pool import SOLVER_POOL
 from routers.meal_planner import meal_planner
 from settings import SETTINGS
 
@@ -26,10 +29,15 @@ async def lifespan(app: FastAPI):
         APP_LOGGER.info(f"🔧 Environment: {os.getenv('ENV', 'development')} mode: {SETTINGS.MODE.name}")
 
         try:
+            # Fail here rather than on the first meal plan request
+            get_solver_backend(SETTINGS.SOLVER_BACKEND)
+            APP_LOGGER.info(f"🧮 Solver backend: {SETTINGS.SOLVER_BACKEND.value}")
+
             init_db()
             APP_LOGGER.info("🌐 Database initialized.")
 
             SCHEDULER.add_job(run_collect_food_data_job, "cron", hour=0, minute=0)
+            SCHEDULER.add_job(purge_expired_solutions, "cron", hour=0, minute=5)
             
             if SETTINGS.DATABASE_BACKUP_ENABLED:
                 SCHEDULER.add_job(run_database_backup_job, "cron", hour=22, minute=0)
@@ -42,6 +50,8 @@ async def lifespan(app: FastAPI):
                 SCHEDULER.add_job(run_collect_food_data_job, "date")
 
             SCHEDULER.start()
+
+            SOLVER_POOL.start()
         except Exception as e:
             APP_LOGGER.error(f"Failed to initialize application: {e}")
             raise  # Re-raise to prevent app from starting in broken state
@@ -52,6 +62,10 @@ async def lifespan(app: FastAPI):
     SCHEDULER.shutdown()
     APP_LOGGER.info("Jobs stopped.")
 
+    SOLVER_POOL.shutdown()
+    SOLUTION_STORE.shutdown()
+    APP_LOGGER.info("Solver pool stopped.")
+
 
 app = FastAPI(root_path="/api", lifespan=lifespan)
 app.include_router(meal_planner)
@@ -75,3 +89,16 @@ async def meal_plan_exception_handler(request: Request, exc: MealPlanRequestExce
             "message": exc.message
         }
     )
+
+
+@app.exception_handler(SolverPoolBusyError)
+async def solver_pool_busy_handler(request: Request, exc: SolverPoolBusyError):
+    APP_LOGGER.warning(f"🚦 Solver pool is full, rejecting request | Path: {request.url.path}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "code": "SOLVER_BUSY",
+            "message": str(exc)
+        },
+        headers={"Retry-After": "1"}
+    )
@@ -10,6 +10,8 @@ from settings import SETTINGS
 # Import all models so they register with SQLModel.metadata
 from model.food import Food
 from model.job_run import JobRun
+from model.cached_solution import CachedSolution
+from model.menu_version import MenuVersion
 from model.meal_plan import MealPlan
 from model.food_log_entry import FoodLogEntry
 from model.nutritional_constraints import NutritionalConstraints
@@ -0,0 +1,39 @@
+"""add_cached_solution_table
+
+Revision ID: 5b7e2d94c1f0
+Revises: 44e3386c33b9
+Create Date: 2026-10-18 10:12:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d94c1f0'
+down_revision: Union[str, None] = '44e3386c33b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the persistent solution cache."""
+    op.create_table('cachedsolution',
+                    sa.Column('fingerprint', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('date', sa.Date(), nullable=False),
+                    sa.Column('food_vendor', sa.Enum('CITY_FOOD', 'INTER_FOOD', 'TELETAL', 'EFOOD',
+                                                     name='foodvendortype'), nullable=False),
+                    sa.Column('menu_version', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('food_counts', sa.JSON(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(), nullable=False),
+                    sa.PrimaryKeyConstraint('fingerprint'))
+    op.create_index(op.f('ix_cachedsolution_date'), 'cachedsolution', ['date'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the persistent solution cache."""
+    op.drop_index(op.f('ix_cachedsolution_date'), table_name='cachedsolution')
+    op.drop_table('cachedsolution')
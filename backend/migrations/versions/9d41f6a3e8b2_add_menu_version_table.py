@@ -0,0 +1,50 @@
+"""add_menu_version_table
+
+Revision ID: 9d41f6a3e8b2
+Revises: 5b7e2d94c1f0
+Create Date: 2026-10-18 11:02:17.604931
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlmodel import Session, select
+
+from model.food import Food
+from model.menu_version import MenuVersion, compute_menu_digest
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41f6a3e8b2'
+down_revision: Union[str, None] = '5b7e2d94c1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add per date and vendor menu digests and compute them for the menus already stored."""
+    op.create_table('menuversion',
+                    sa.Column('date', sa.Date(), nullable=False),
+                    sa.Column('food_vendor', sa.Enum('CITY_FOOD', 'INTER_FOOD', 'TELETAL', 'EFOOD',
+                                                     name='foodvendortype'), nullable=False),
+                    sa.Column('digest', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+                    sa.Column('updated_at', sa.DateTime(), nullable=False),
+                    sa.PrimaryKeyConstraint('date', 'food_vendor'))
+
+    with Session(op.get_bind()) as session:
+        menus: dict = {}
+        for food in session.exec(select(Food)).all():
+            menus.setdefault((food.date, food.food_vendor), []).append(food)
+
+        for (menu_date, food_vendor), foods in menus.items():
+            session.add(MenuVersion(date=menu_date, food_vendor=food_vendor, digest=compute_menu_digest(foods),
+                                    updated_at=datetime.now()))
+        session.commit()
+
+
+def downgrade() -> None:
+    """Drop the menu digests."""
+    op.drop_table('menuversion')
@@ -0,0 +1,15 @@
+from datetime import date as datetime_date, datetime
+
+from sqlmodel import SQLModel, Field, JSON
+
+from food_vendors.food_vendor_type import FoodVendorType
+
+
+class CachedSolution(SQLModel, table=True):
+    """Solver result of one request fingerprint, kept across restarts until its date has passed."""
+    fingerprint: str = Field(primary_key=True)
+    date: datetime_date = Field(index=True, nullable=False)
+    food_vendor: FoodVendorType = Field(nullable=False)
+    menu_version: str = Field(nullable=False)
+    food_counts: dict[str, int] = Field(sa_type=JSON, nullable=False)
+    created_at: datetime = Field(default_factory=lambda: datetime.now())
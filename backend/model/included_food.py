@@ -0,0 +1,27 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, NonNegativeInt, PositiveInt, model_validator
+from pydantic.alias_generators import to_camel
+from typing_extensions import Self
+
+from exceptions import MealPlanRequestException
+
+
+class IncludedFood(BaseModel):
+    """
+    Portion bounds of one food of the menu. The default includes the food at least once; `min_count=0`
+    with a `max_count` only limits it. `max_count` replaces the request's max food repeat for this food.
+    """
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True, frozen=True)
+
+    food_id: int
+    min_count: NonNegativeInt = 1
+    max_count: Optional[PositiveInt] = None
+
+    @model_validator(mode='after')
+    def _validate_min_lower_than_max(self) -> Self:
+        if self.max_count is not None and self.min_count > self.max_count:
+            raise MealPlanRequestException("min_count must be less than or equal to max_count",
+                                           "max_lower_than_min", "included_foods")
+
+        return self
@@ -17,6 +17,7 @@ class JobStatus(str, Enum):
 class JobType(str, Enum):
     FOOD_DATA_COLLECTION = "food_data_collection"
     DATABASE_BACKUP = "database_backup"
+    MEAL_PLAN_PRECOMPUTATION = "meal_plan_precomputation"
 
 
 class FoodDataCollectorDetails(BaseModel):
@@ -32,6 +33,12 @@ class DatabaseBackupDetails(BaseModel):
     backup_date: date
 
 
+class MealPlanPrecomputeDetails(BaseModel):
+    request_shapes: int
+    solved: int
+    skipped: int
+
+
 class JobRun(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     timestamp: datetime = Field(default_factory=lambda: datetime.now())
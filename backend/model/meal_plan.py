@@ -8,6 +8,9 @@ from pydantic.alias_generators import to_camel
 from model.food import Food
 from food_vendors.food_vendor_type import FoodVendorType
 from model.food_log_entry import FoodLogEntry
+from model.included_food import IncludedFood
+from model.meal_plan_unavailable_reason import MealPlanUnavailableReason
+from optimizers.solver_path import SolverPath
 
 
 class MealPlan(BaseModel):
@@ -16,6 +19,15 @@ class MealPlan(BaseModel):
     foods: list[Food] = Field(default_factory=list)
     date: datetime_date = None
     food_vendor: FoodVendorType = None
+    # False when the solver's time budget ran out first, the gap then bounds the possible saving relative to total_price
+    is_optimal: bool = True
+    optimality_gap: float = 0.0
+    solver_path: SolverPath = SolverPath.ILP
+    alternatives: list[AlternativeMealPlan] = Field(default_factory=list)
+    # Pass it to /meal-plan/swap to replace a food of this plan
+    plan_token: str | None = None
+    # Set on empty plans, tells why there is no plan
+    unavailable_reason: MealPlanUnavailableReason | None = None
 
     @computed_field
     def food_log_entry(self) -> FoodLogEntry:
@@ -64,11 +76,41 @@ class MealPlan(BaseModel):
 
     @classmethod
     def from_food_counts(cls, foods: list[Food], food_counts: dict[int, int], plan_date: datetime_date,
-                         food_vendor: FoodVendorType) -> MealPlan:
+                         food_vendor: FoodVendorType, duplicates: dict[int, list[int]] = None,
+                         max_food_repeat: int = None, is_optimal: bool = True,
+                         optimality_gap: float = 0.0, solver_path: SolverPath = SolverPath.ILP,
+                         included_foods: list[IncludedFood] = ()) -> MealPlan:
+        """
+        Build the plan from solver counts. Counts of merged duplicate foods are keyed by the group's
+        representative and are spread over the group members still in `foods`: included members get
+        their min_count first, then every member is filled up to its max_count or max_food_repeat.
+        """
         id_to_food = {f.food_id: f for f in foods}
-        selected = [
-            id_to_food[food_id]
-            for food_id, count in food_counts.items()
-            for _ in range(count)
-        ]
-        return cls(foods=selected, date=plan_date, food_vendor=food_vendor)
+        bounds = {included.food_id: included for included in included_foods}
+        selected = []
+        for food_id, count in food_counts.items():
+            members = [member for member in (duplicates or {}).get(food_id, [food_id]) if member in id_to_food]
+            taken = {member: 0 for member in members}
+            for member in members:
+                if member in bounds:
+                    taken[member] = min(count, bounds[member].min_count)
+                    count -= taken[member]
+            for member in members:
+                limit = bounds[member].max_count if member in bounds else None
+                limit = limit if limit is not None else max_food_repeat
+                extra = count if limit is None else min(count, limit - taken[member])
+                taken[member] += extra
+                count -= extra
+            for member in members:
+                selected.extend([id_to_food[member]] * taken[member])
+
+        return cls(foods=selected, date=plan_date, food_vendor=food_vendor, is_optimal=is_optimal,
+                   optimality_gap=optimality_gap, solver_path=solver_path)
+
+
+class AlternativeMealPlan(BaseModel):
+    """A runner-up plan, `cost_delta` is how much more it costs than the plan it is an alternative of."""
+    model_config = ConfigDict(arbitrary_types_allowed=True, alias_generator=to_camel, populate_by_name=True)
+
+    meal_plan: MealPlan
+    cost_delta: int
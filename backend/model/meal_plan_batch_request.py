@@ -0,0 +1,68 @@
+from datetime import date as datetime_date, timedelta
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, PositiveInt, model_validator
+from pydantic.alias_generators import to_camel
+from typing_extensions import Self
+
+from exceptions import MealPlanRequestException
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from settings import SETTINGS
+
+
+class MealPlanBatchRequest(BaseModel):
+    """
+    The same constraints planned for several dates, given either as a list or as an inclusive range.
+
+    The dates are solved independently unless a limit over all of them is set: `max_total_food_repeat`
+    (e.g. each dish at most twice a week) or `max_total_price` (a weekly budget). Then they are solved jointly.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, alias_generator=to_camel, populate_by_name=True,
+                              frozen=True)
+
+    dates: list[datetime_date] = []
+    start_date: Optional[datetime_date] = None
+    end_date: Optional[datetime_date] = None
+    nutritional_constraints: NutritionalConstraints
+    food_blacklist: list[str] = []
+    max_food_repeat: Optional[PositiveInt] = None
+    max_total_food_repeat: Optional[PositiveInt] = None
+    max_total_price: Optional[PositiveInt] = None
+    food_vendor: FoodVendorType
+
+    @model_validator(mode='after')
+    def _validate_dates(self) -> Self:
+        has_range = self.start_date is not None or self.end_date is not None
+        if bool(self.dates) == has_range:
+            raise MealPlanRequestException("Either dates or start_date and end_date must be given.",
+                                           "invalid_date_selection", "dates")
+
+        if has_range and (self.start_date is None or self.end_date is None or self.start_date > self.end_date):
+            raise MealPlanRequestException("start_date must be before or equal to end_date.",
+                                           "invalid_date_range", "start_date")
+
+        number_of_dates = len(set(self.dates)) if self.dates else (self.end_date - self.start_date).days + 1
+        if number_of_dates > SETTINGS.MEAL_PLAN_BATCH_MAX_DATES:
+            raise MealPlanRequestException(f"At most {SETTINGS.MEAL_PLAN_BATCH_MAX_DATES} dates can be planned at once.",
+                                           "too_many_dates", "dates")
+
+        return self
+
+    @property
+    def is_joint(self) -> bool:
+        return self.max_total_food_repeat is not None or self.max_total_price is not None
+
+    def plan_dates(self) -> list[datetime_date]:
+        if self.dates:
+            return sorted(set(self.dates))
+
+        return [self.start_date + timedelta(days=i) for i in range((self.end_date - self.start_date).days + 1)]
+
+    def for_date(self, plan_date: datetime_date) -> MealPlanRequest:
+        return MealPlanRequest(date=plan_date,
+                               nutritional_constraints=self.nutritional_constraints,
+                               food_blacklist=self.food_blacklist,
+                               max_food_repeat=self.max_food_repeat,
+                               food_vendor=self.food_vendor)
@@ -0,0 +1,27 @@
+from datetime import date as datetime_date
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, PositiveInt
+from pydantic.alias_generators import to_camel
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+
+
+class MealPlanComparisonRequest(BaseModel):
+    """A meal plan request without a vendor, planned at every vendor that has a menu for the date."""
+    model_config = ConfigDict(arbitrary_types_allowed=True, alias_generator=to_camel, populate_by_name=True,
+                              frozen=True)
+
+    date: datetime_date
+    nutritional_constraints: NutritionalConstraints
+    food_blacklist: list[str] = []
+    max_food_repeat: Optional[PositiveInt] = None
+
+    def for_vendor(self, food_vendor: FoodVendorType) -> MealPlanRequest:
+        return MealPlanRequest(date=self.date,
+                               nutritional_constraints=self.nutritional_constraints,
+                               food_blacklist=self.food_blacklist,
+                               max_food_repeat=self.max_food_repeat,
+                               food_vendor=food_vendor)
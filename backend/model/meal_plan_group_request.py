@@ -0,0 +1,48 @@
+from datetime import date as datetime_date
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, PositiveInt, model_validator
+from pydantic.alias_generators import to_camel
+from typing_extensions import Self
+
+from exceptions import MealPlanRequestException
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from settings import SETTINGS
+
+
+class MealPlanGroupRequest(BaseModel):
+    """
+    One meal plan per member of a group ordering from the same menu, each member with their own constraints.
+    `max_total_price` is a budget for the plans of the whole group. It is checked against the sum of the members'
+    cheapest plans after solving them one by one, which is the cheapest total the group can get as long as
+    every plan is proven optimal.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, alias_generator=to_camel, populate_by_name=True,
+                              frozen=True)
+
+    date: datetime_date
+    food_vendor: FoodVendorType
+    members: list[NutritionalConstraints]
+    food_blacklist: list[str] = []
+    max_food_repeat: Optional[PositiveInt] = None
+    max_total_price: Optional[PositiveInt] = None
+
+    @model_validator(mode='after')
+    def _validate_members(self) -> Self:
+        if not self.members:
+            raise MealPlanRequestException("At least one member must be given.", "empty_group", "members")
+
+        if len(self.members) > SETTINGS.MEAL_PLAN_GROUP_MAX_MEMBERS:
+            raise MealPlanRequestException(f"At most {SETTINGS.MEAL_PLAN_GROUP_MAX_MEMBERS} members can be planned "
+                                           f"at once.", "too_many_group_members", "members")
+
+        return self
+
+    def for_member(self, nutritional_constraints: NutritionalConstraints) -> MealPlanRequest:
+        return MealPlanRequest(date=self.date,
+                               nutritional_constraints=nutritional_constraints,
+                               food_blacklist=self.food_blacklist,
+                               max_food_repeat=self.max_food_repeat,
+                               food_vendor=self.food_vendor)
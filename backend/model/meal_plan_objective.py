@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class MealPlanObjective(str, Enum):
+    MIN_PRICE = "min_price"
+    MAX_PROTEIN = "max_protein"
+    MIN_FAT = "min_fat"
+    MIN_CALORIES = "min_calories"
+    # Cheapest plan, ties broken by the most protein
+    MIN_PRICE_MAX_PROTEIN = "min_price_max_protein"
@@ -1,10 +1,16 @@
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, PositiveInt
+import numpy as np
+from pydantic import BaseModel, ConfigDict, PositiveInt, model_validator
 from pydantic.alias_generators import to_camel
 from datetime import date as datetime_date
 
+from typing_extensions import Self
+
+from exceptions import MealPlanRequestException
 from food_vendors.food_vendor_type import FoodVendorType
+from model.included_food import IncludedFood
+from model.meal_plan_objective import MealPlanObjective
 from model.nutritional_constraints import NutritionalConstraints
 
 
@@ -17,3 +23,36 @@ class MealPlanRequest(BaseModel):
     food_blacklist: list[str] = []
     max_food_repeat: Optional[PositiveInt] = None
     food_vendor: FoodVendorType
+    objective: MealPlanObjective = MealPlanObjective.MIN_PRICE
+    max_price: Optional[PositiveInt] = None
+    included_foods: list[IncludedFood] = []
+
+    @model_validator(mode='after')
+    def _validate_objective_is_bounded(self) -> Self:
+        if self.objective == MealPlanObjective.MAX_PROTEIN and self.max_price is None:
+            raise MealPlanRequestException("max_price is required to maximize protein.", "missing_max_price",
+                                           "max_price")
+
+        # Without a lower bound the empty plan is the least fat or calories there is
+        min_values, _ = self.nutritional_constraints.bounds()
+        if (self.objective in (MealPlanObjective.MIN_FAT, MealPlanObjective.MIN_CALORIES)
+                and not np.any(min_values > 0)):
+            raise MealPlanRequestException(f"A positive minimum of a nutrient is required for {self.objective.value}.",
+                                           "missing_lower_bound", "nutritional_constraints")
+
+        return self
+
+    @model_validator(mode='after')
+    def _validate_included_foods(self) -> Self:
+        food_ids = [included.food_id for included in self.included_foods]
+        if len(set(food_ids)) != len(food_ids):
+            raise MealPlanRequestException("A food can only be included once.", "duplicate_included_food",
+                                           "included_foods")
+
+        for included in self.included_foods:
+            max_count = included.max_count if included.max_count is not None else self.max_food_repeat
+            if max_count is not None and included.min_count > max_count:
+                raise MealPlanRequestException(f"min_count of food {included.food_id} exceeds max_food_repeat",
+                                               "max_lower_than_min", "included_foods")
+
+        return self
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+
+from model.meal_plan import MealPlan
+
+
+class MealPlanSweepPoint(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True, alias_generator=to_camel, populate_by_name=True)
+
+    value: int
+    meal_plan: MealPlan
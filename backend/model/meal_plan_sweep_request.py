@@ -0,0 +1,68 @@
+from datetime import date as datetime_date
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, PositiveInt, NonNegativeInt, model_validator
+from pydantic.alias_generators import to_camel, to_snake
+from typing_extensions import Self
+
+from exceptions import MealPlanRequestException
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from settings import SETTINGS
+
+
+class MealPlanSweepRequest(BaseModel):
+    """
+    A meal plan request with one nutritional constraint swept from `start` to `stop` (inclusive) by `step`,
+    e.g. `minProtein` from 100 to 250 in steps of 10. The other constraints stay as given.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, alias_generator=to_camel, populate_by_name=True,
+                              frozen=True)
+
+    date: datetime_date
+    nutritional_constraints: NutritionalConstraints
+    food_blacklist: list[str] = []
+    max_food_repeat: Optional[PositiveInt] = None
+    food_vendor: FoodVendorType
+    constraint: str
+    start: NonNegativeInt
+    stop: NonNegativeInt
+    step: PositiveInt
+
+    @model_validator(mode='after')
+    def _validate_sweep(self) -> Self:
+        if self.swept_constraint not in NutritionalConstraints.model_fields:
+            raise MealPlanRequestException(f"{self.constraint} is not a nutritional constraint.",
+                                           "invalid_sweep_constraint", "constraint")
+
+        if self.start > self.stop:
+            raise MealPlanRequestException("start must be less than or equal to stop.", "invalid_sweep_range", "start")
+
+        if len(self.values()) > SETTINGS.MEAL_PLAN_SWEEP_MAX_POINTS:
+            raise MealPlanRequestException(f"At most {SETTINGS.MEAL_PLAN_SWEEP_MAX_POINTS} points can be swept at once.",
+                                           "too_many_sweep_points", "step")
+
+        # Constraint validation is monotone in the swept value, so checking both ends covers every point
+        self.for_value(self.start)
+        self.for_value(self.stop)
+
+        return self
+
+    @property
+    def swept_constraint(self) -> str:
+        """Field name of the swept constraint, which may be given in camel case like the API."""
+        return to_snake(self.constraint)
+
+    def values(self) -> list[int]:
+        return list(range(self.start, self.stop + 1, self.step))
+
+    def for_value(self, value: int) -> MealPlanRequest:
+        constraints = self.nutritional_constraints.model_dump()
+        constraints[self.swept_constraint] = value
+
+        return MealPlanRequest(date=self.date,
+                               nutritional_constraints=NutritionalConstraints(**constraints),
+                               food_blacklist=self.food_blacklist,
+                               max_food_repeat=self.max_food_repeat,
+                               food_vendor=self.food_vendor)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+
+from optimizers.preprocessing import Infeasibility
+
+
+class MealPlanUnavailableReason(BaseModel):
+    """
+    Why a plan of a multi-plan response has no foods. Code and message are the ones a single `/meal-plan`
+    request would have been rejected with, so a closed menu can be told apart from over-tight constraints.
+    """
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True, frozen=True)
+
+    code: str
+    message: str
+
+    @classmethod
+    def from_infeasibility(cls, infeasibility: Infeasibility) -> "MealPlanUnavailableReason":
+        return cls(code=f"unreachable_{infeasibility.constraint}", message=infeasibility.message)
@@ -0,0 +1,25 @@
+import hashlib
+from datetime import date as datetime_date, datetime
+
+from sqlmodel import SQLModel, Field
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.food import Food
+from model.nutrients import nutrient_values
+
+
+class MenuVersion(SQLModel, table=True):
+    """Content digest of one vendor's menu for one date, updated whenever the menu is ingested."""
+    date: datetime_date = Field(primary_key=True, nullable=False)
+    food_vendor: FoodVendorType = Field(primary_key=True, nullable=False)
+    digest: str = Field(nullable=False)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now())
+
+
+def compute_menu_digest(foods: list[Food]) -> str:
+    """Digest of everything on the menu that can change a solution: ids, names (blacklist), prices and nutrients."""
+    digest = hashlib.sha256()
+    for food in sorted(foods, key=lambda f: f.food_id):
+        digest.update(repr((food.food_id, food.name, food.price, *nutrient_values(food))).encode())
+
+    return digest.hexdigest()[:16]
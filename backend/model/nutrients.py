@@ -0,0 +1,21 @@
+from operator import attrgetter
+
+import numpy as np
+
+from model.food import Food
+
+# Food attribute -> label of its constraints. Also the column order of every nutrient matrix and bounds vector,
+# a new nutrient needs its `Food` column and `min_`/`max_` fields on `NutritionalConstraints`, nothing else.
+NUTRIENTS = {
+    "calories": "Calories",
+    "protein": "Protein",
+    "carb": "Carbs",
+    "fat": "Fat",
+}
+
+nutrient_values = attrgetter(*NUTRIENTS)
+
+
+def nutrient_matrix(foods: list[Food]) -> np.ndarray:
+    """One row per food and one column per nutrient, read in a single pass over the foods."""
+    return np.array([nutrient_values(food) for food in foods], dtype=float).reshape(len(foods), len(NUTRIENTS))
@@ -1,11 +1,13 @@
 from typing import Optional
 
+import numpy as np
 from pydantic import BaseModel, model_validator, PositiveInt, ConfigDict, NonNegativeInt
 from pydantic.alias_generators import to_camel
 from typing_extensions import Self
 
 from constants import PROTEIN_CALORIE, FAT_CALORIE, CARB_CALORIE
 from exceptions import MealPlanRequestException
+from model.nutrients import NUTRIENTS
 
 
 class NutritionalConstraints(BaseModel):
@@ -25,7 +27,7 @@ class NutritionalConstraints(BaseModel):
 
     @model_validator(mode='after')
     def _validate_min_lower_than_max(self) -> Self:
-        for attr in ["calories", "protein", "carb", "fat"]:
+        for attr in NUTRIENTS:
             min_val = getattr(self, f"min_{attr}")
             max_val = getattr(self, f"max_{attr}")
 
@@ -43,6 +45,11 @@ class NutritionalConstraints(BaseModel):
 
         return self
 
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """Min and max vectors in `NUTRIENTS` order, NaN where unconstrained."""
+        return (np.array([getattr(self, f"min_{attr}") for attr in NUTRIENTS], dtype=float),
+                np.array([getattr(self, f"max_{attr}") for attr in NUTRIENTS], dtype=float))
+
     # TODO: can it be deleted?
     def _total_max_macro_calories(self) -> int:
         return self._max_carb_calories() + self._max_fat_calories() + self._max_protein_calories()
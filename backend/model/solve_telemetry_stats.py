@@ -0,0 +1,45 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.nutritional_constraints import NutritionalConstraints
+
+
+class Percentiles(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    max: float
+
+
+class SlowSolve(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    date: date
+    nutritional_constraints: NutritionalConstraints
+    max_food_repeat: int | None
+    answered_by: str
+    duration_ms: float
+
+
+class VendorSolveStats(BaseModel):
+    """Percentiles of the recent meal plan requests of one vendor. Solver metrics only cover requests a solver answered."""
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    food_vendor: FoodVendorType
+    requests: int
+    answered_by: dict[str, int]
+    solver_statuses: dict[str, int]
+    duration_ms: Percentiles
+    solver_duration_ms: Percentiles | None
+    variables: Percentiles | None
+    constraints: Percentiles | None
+    pruned_foods: Percentiles | None
+    nodes: Percentiles | None
+    optimality_gap: Percentiles | None
+    slowest: list[SlowSolve]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan import MealPlan
+
+
+class VendorMealPlan(BaseModel):
+    """A vendor's plan of a comparison, `meal_plan.unavailable_reason` tells why a vendor has none."""
+    model_config = ConfigDict(arbitrary_types_allowed=True, alias_generator=to_camel, populate_by_name=True)
+
+    food_vendor: FoodVendorType
+    meal_plan: MealPlan
+    solve_time_ms: float
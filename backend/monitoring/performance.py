@@ -1,9 +1,11 @@
+import functools
 import time
 
 from monitoring.logging import PERF_LOGGER
 
 
 def benchmark(func):
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.perf_counter()
         result = func(*args, **kwargs)
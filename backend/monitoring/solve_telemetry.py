@@ -0,0 +1,105 @@
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+
+import numpy as np
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.nutritional_constraints import NutritionalConstraints
+from model.solve_telemetry_stats import Percentiles, SlowSolve, VendorSolveStats
+from settings import SETTINGS
+
+_PERCENTILES = (50, 90, 95, 99, 100)
+_SLOWEST_SOLVES = 5
+
+
+class AnswerTier(str, Enum):
+    MEMORY_CACHE = "memory_cache"
+    # Waited for an identical request solving at the same time
+    IN_FLIGHT = "in_flight"
+    SOLUTION_STORE = "solution_store"
+    HEURISTIC = "heuristic"
+    SOLVER = "solver"
+
+
+@dataclass(frozen=True)
+class SolveRecord:
+    """One answered meal plan request. The solver fields are None unless the solver answered it."""
+    date: date
+    food_vendor: FoodVendorType
+    nutritional_constraints: NutritionalConstraints
+    max_food_repeat: int | None
+    answered_by: AnswerTier
+    duration: float
+    status: str | None = None
+    variables: int | None = None
+    constraints: int | None = None
+    pruned_foods: int | None = None
+    nodes: int | None = None
+    optimality_gap: float | None = None
+
+
+class SolveTelemetry:
+    """
+    Ring buffer of the last `max_size` answered requests, summarized as percentiles per vendor to find
+    which menus and constraint shapes make up the latency tail.
+    """
+
+    def __init__(self, max_size: int):
+        self._records: deque[SolveRecord] = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+
+    def record(self, solve_record: SolveRecord):
+        with self._lock:
+            self._records.append(solve_record)
+
+    def records(self) -> list[SolveRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summarize(self) -> list[VendorSolveStats]:
+        by_vendor: dict[FoodVendorType, list[SolveRecord]] = {}
+        for solve_record in self.records():
+            by_vendor.setdefault(solve_record.food_vendor, []).append(solve_record)
+
+        return [_summarize_vendor(food_vendor, records) for food_vendor, records in by_vendor.items()]
+
+
+def _summarize_vendor(food_vendor: FoodVendorType, records: list[SolveRecord]) -> VendorSolveStats:
+    solved = [r for r in records if r.answered_by == AnswerTier.SOLVER]
+    slowest = sorted(records, key=lambda r: r.duration, reverse=True)[:_SLOWEST_SOLVES]
+
+    return VendorSolveStats(
+        food_vendor=food_vendor,
+        requests=len(records),
+        answered_by=dict(Counter(r.answered_by.value for r in records)),
+        solver_statuses=dict(Counter(r.status for r in solved)),
+        duration_ms=_percentiles([r.duration * 1000 for r in records]),
+        solver_duration_ms=_percentiles([r.duration * 1000 for r in solved]),
+        variables=_percentiles([r.variables for r in solved]),
+        constraints=_percentiles([r.constraints for r in solved]),
+        pruned_foods=_percentiles([r.pruned_foods for r in solved]),
+        nodes=_percentiles([r.nodes for r in solved]),
+        optimality_gap=_percentiles([r.optimality_gap for r in solved]),
+        slowest=[SlowSolve(date=r.date, nutritional_constraints=r.nutritional_constraints,
+                           max_food_repeat=r.max_food_repeat, answered_by=r.answered_by.value,
+                           duration_ms=r.duration * 1000) for r in slowest],
+    )
+
+
+def _percentiles(values: list[float | None]) -> Percentiles | None:
+    known = [value for value in values if value is not None]
+    if not known:
+        return None
+
+    p50, p90, p95, p99, p100 = np.percentile(np.array(known, dtype=float), _PERCENTILES)
+    return Percentiles(p50=p50, p90=p90, p95=p95, p99=p99, max=p100)
+
+
+SOLVE_TELEMETRY = SolveTelemetry(SETTINGS.SOLVE_TELEMETRY_SIZE)
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+_EPS = 1e-9
+_FEASIBILITY_TOL = 1e-7
+_INTEGRALITY_TOL = 1e-6
+_DEGENERATE_PIVOTS_BEFORE_BLAND = 50
+
+
+@dataclass
+class LpResult:
+    status: str
+    x: np.ndarray | None = None
+    objective: float | None = None
+    reduced_costs: np.ndarray | None = None
+    # Shadow price of each a_ub row: a column a with cost c not in the problem has reduced cost c - duals @ a
+    duals: np.ndarray | None = None
+
+
+@dataclass
+class IlpResult:
+    status: str
+    x: np.ndarray | None = None
+    objective: float | None = None
+    nodes: int = 0
+    gap: float | None = None
+
+
+class _Tableau:
+    """
+    Dense bounded-variable simplex tableau over structural, slack and artificial columns.
+
+    Variable bounds are handled implicitly, so there is only one row per constraint - the meal plan
+    models have a handful of nutrient rows and many food columns, which keeps every pivot cheap.
+    The tableau can be re-optimized with the dual simplex after bounds change, which is what makes
+    branch and bound nodes cheap.
+    """
+
+    def __init__(self, tableau: np.ndarray, values: np.ndarray, basis: np.ndarray, lower: np.ndarray,
+                 upper: np.ndarray, cost: np.ndarray):
+        self.tableau = tableau
+        self.values = values
+        self.basis = basis
+        self.lower = lower
+        self.upper = upper
+        self.cost = cost
+
+    @classmethod
+    def build(cls, c: np.ndarray, a_ub: np.ndarray, b_ub: np.ndarray, lower: np.ndarray,
+              upper: np.ndarray) -> _Tableau | None:
+        """Set up the tableau and drive it to a feasible basis, None if the problem is infeasible."""
+        m, n = a_ub.shape
+        if np.any(upper - lower < -_EPS) or np.isinf(lower).any():
+            return None
+
+        rhs = b_ub - a_ub @ lower
+        flipped = rhs < 0
+        sign = np.where(flipped, -1.0, 1.0)
+
+        # Rows with a negative right-hand side are negated so that their artificial column (+1)
+        # forms the starting basis together with the slacks of the other rows.
+        tableau = np.zeros((m, n + 2 * m))
+        tableau[:, :n] = a_ub * sign[:, None]
+        tableau[:, n:n + m] = np.diag(sign)
+        tableau[:, n + m:] = np.eye(m)
+
+        column_lower = np.concatenate([lower, np.zeros(2 * m)])
+        column_upper = np.concatenate([upper, np.full(m, np.inf), np.where(flipped, np.inf, 0.0)])
+        values = column_lower.copy()
+        basis = np.where(flipped, n + m + np.arange(m), n + np.arange(m))
+        values[basis] = np.abs(rhs)
+
+        state = cls(tableau, values, basis, column_lower, column_upper, np.concatenate([c, np.zeros(2 * m)]))
+        if flipped.any():
+            phase_one_cost = np.concatenate([np.zeros(n + m), flipped.astype(float)])
+            status = state.primal(phase_one_cost)
+            if status != "Optimal" or phase_one_cost @ values > _FEASIBILITY_TOL * max(1.0, np.abs(rhs).max()):
+                return None
+            state.upper[n + m:] = 0.0
+
+        return state
+
+    def copy(self) -> _Tableau:
+        return _Tableau(self.tableau.copy(), self.values.copy(), self.basis.copy(), self.lower.copy(),
+                        self.upper.copy(), self.cost)
+
+    def reduced_costs(self, cost: np.ndarray) -> np.ndarray:
+        return cost - cost[self.basis] @ self.tableau
+
+    def set_structural_bounds(self, lower: np.ndarray, upper: np.ndarray):
+        """Change bounds, moving nonbasic columns onto them and adjusting the basic values accordingly."""
+        n = len(lower)
+        self.lower[:n] = lower
+        self.upper[:n] = upper
+        nonbasic = np.ones(n, dtype=bool)
+        nonbasic[self.basis[self.basis < n]] = False
+        moved = np.where(nonbasic, np.clip(self.values[:n], lower, upper), self.values[:n]) - self.values[:n]
+        if np.any(moved):
+            self.values[self.basis] -= self.tableau[:, :n] @ moved
+            self.values[:n] += moved
+
+    def primal(self, cost: np.ndarray) -> str:
+        """Primal simplex from a feasible basis."""
+        m, total = self.tableau.shape
+        is_basic = np.zeros(total, dtype=bool)
+        is_basic[self.basis] = True
+        degenerate_pivots = 0
+
+        for _ in range(50 * (m + total)):
+            reduced_costs = self.reduced_costs(cost)
+            movable = self.upper - self.lower > _EPS
+            at_upper = self.values >= self.upper - _EPS
+            can_increase = ~is_basic & movable & ~at_upper & (reduced_costs < -_EPS)
+            can_decrease = ~is_basic & movable & at_upper & (reduced_costs > _EPS)
+            candidates = np.flatnonzero(can_increase | can_decrease)
+            if candidates.size == 0:
+                return "Optimal"
+
+            if degenerate_pivots < _DEGENERATE_PIVOTS_BEFORE_BLAND:
+                entering = candidates[np.argmax(np.abs(reduced_costs[candidates]))]
+            else:
+                entering = candidates[0]
+            direction = 1.0 if can_increase[entering] else -1.0
+
+            step, leaving_row, leaving_to_upper = self.upper[entering] - self.lower[entering], -1, False
+            rates = direction * self.tableau[:, entering]
+            basic_values = self.values[self.basis]
+            for row in np.flatnonzero(np.abs(rates) > _EPS):
+                if rates[row] > 0:
+                    limit = (basic_values[row] - self.lower[self.basis[row]]) / rates[row]
+                    to_upper = False
+                else:
+                    limit = (self.upper[self.basis[row]] - basic_values[row]) / -rates[row]
+                    to_upper = True
+                if limit < step - _EPS or (leaving_row >= 0 and limit < step + _EPS
+                                           and self.basis[row] < self.basis[leaving_row]):
+                    step, leaving_row, leaving_to_upper = max(limit, 0.0), row, to_upper
+
+            if math.isinf(step):
+                return "Unbounded"
+
+            degenerate_pivots = degenerate_pivots + 1 if step <= _EPS else 0
+            self.values[self.basis] = basic_values - rates * step
+            self.values[entering] += direction * step
+            if leaving_row < 0:
+                continue
+
+            leaving = self.basis[leaving_row]
+            self.values[leaving] = self.upper[leaving] if leaving_to_upper else self.lower[leaving]
+            self._pivot(leaving_row, entering)
+            is_basic[leaving] = False
+            is_basic[entering] = True
+
+        return "Not Solved"
+
+    def dual(self) -> str:
+        """Dual simplex from a dual feasible basis whose basic values may violate their bounds."""
+        m, total = self.tableau.shape
+        is_basic = np.zeros(total, dtype=bool)
+        is_basic[self.basis] = True
+
+        for _ in range(50 * (m + total)):
+            basic_values = self.values[self.basis]
+            below = self.lower[self.basis] - basic_values
+            above = basic_values - self.upper[self.basis]
+            violation = np.maximum(below, above)
+            row = int(np.argmax(violation))
+            if violation[row] <= _FEASIBILITY_TOL:
+                return "Optimal"
+
+            target = self.lower[self.basis[row]] if below[row] > 0 else self.upper[self.basis[row]]
+            excess = basic_values[row] - target
+            pivot_row = self.tableau[row] * np.sign(excess)
+            movable = ~is_basic & (self.upper - self.lower > _EPS)
+            at_upper = self.values >= self.upper - _EPS
+            eligible = movable & ((~at_upper & (pivot_row > _EPS)) | (at_upper & (pivot_row < -_EPS)))
+            candidates = np.flatnonzero(eligible)
+            if candidates.size == 0:
+                return "Infeasible"
+
+            ratios = np.abs(self.reduced_costs(self.cost)[candidates]) / np.abs(pivot_row[candidates])
+            entering = candidates[np.argmin(ratios)]
+            change = excess / self.tableau[row, entering]
+
+            leaving = self.basis[row]
+            self.values[self.basis] -= self.tableau[:, entering] * change
+            self.values[entering] += change
+            self.values[leaving] = target
+            self._pivot(row, entering)
+            is_basic[leaving] = False
+            is_basic[entering] = True
+
+        return "Not Solved"
+
+    def _pivot(self, row: int, column: int):
+        self.tableau[row] /= self.tableau[row, column]
+        factors = self.tableau[:, column].copy()
+        factors[row] = 0.0
+        self.tableau -= np.outer(factors, self.tableau[row])
+        self.basis[row] = column
+
+    def result(self, c: np.ndarray) -> LpResult:
+        n, m = len(c), len(self.basis)
+        x = self.values[:n].copy()
+        reduced_costs = self.reduced_costs(self.cost)
+        # A slack column is its row's unit vector at zero cost, so its reduced cost is minus the row's dual
+        return LpResult("Optimal", x, float(c @ x), reduced_costs[:n], -reduced_costs[n:n + m])
+
+
+def solve_lp(c: np.ndarray, a_ub: np.ndarray, b_ub: np.ndarray,
+             lower: np.ndarray, upper: np.ndarray) -> LpResult:
+    """Minimize c @ x subject to a_ub @ x <= b_ub and lower <= x <= upper (lower must be finite)."""
+    result, _ = _solve_relaxation(c, a_ub, b_ub, lower, upper)
+    return result
+
+
+def _solve_relaxation(c: np.ndarray, a_ub: np.ndarray, b_ub: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                      warm_start: _Tableau | None = None) -> tuple[LpResult, _Tableau | None]:
+    state = None
+    if warm_start is not None:
+        state = warm_start
+        state.set_structural_bounds(lower, upper)
+        status = state.dual()
+        if status == "Infeasible":
+            return LpResult("Infeasible"), None
+        if status != "Optimal":
+            state = None
+
+    if state is None:
+        state = _Tableau.build(c, a_ub, b_ub, lower, upper)
+        if state is None:
+            return LpResult("Infeasible"), None
+
+    status = state.primal(state.cost)
+    if status != "Optimal":
+        return LpResult(status), None
+
+    return state.result(c), state
+
+
+def solve_ilp(c: np.ndarray, a_ub: np.ndarray, b_ub: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+              time_limit: float | None = None, max_nodes: int = 100_000,
+              incumbent: np.ndarray | None = None) -> IlpResult:
+    """
+    Minimize c @ x over integer x subject to a_ub @ x <= b_ub and lower <= x <= upper.
+
+    Depth-first branch and bound on the LP relaxation; children re-optimize their parent's tableau
+    instead of starting over. When every cost coefficient is integral (food prices are), any better
+    solution must be cheaper by at least the gcd of the costs, so nodes whose bound cannot beat the
+    incumbent by that step are pruned. A feasible `incumbent` prunes from the first node on.
+    """
+    started = time.perf_counter()
+    step = objective_step(c)
+    best_x, best_objective = None, math.inf
+    if incumbent is not None and _is_feasible(incumbent, a_ub, b_ub, lower, upper):
+        best_x, best_objective = incumbent.astype(float), float(c @ incumbent)
+    open_nodes = [(lower.astype(float), upper.astype(float), -math.inf, None)]
+    nodes = 0
+
+    def cannot_improve(bound: float) -> bool:
+        if math.isinf(bound):
+            return False
+        if step:
+            steps = math.ceil(bound / step - _INTEGRALITY_TOL)
+            return steps * step >= best_objective - _INTEGRALITY_TOL
+        return bound >= best_objective - _FEASIBILITY_TOL
+
+    while open_nodes:
+        if nodes >= max_nodes or (time_limit is not None and time.perf_counter() - started > time_limit):
+            break
+
+        node_lower, node_upper, parent_bound, parent_state = open_nodes.pop()
+        if cannot_improve(parent_bound):
+            continue
+
+        relaxation, state = _solve_relaxation(c, a_ub, b_ub, node_lower, node_upper, parent_state)
+        nodes += 1
+        if relaxation.status == "Unbounded":
+            return IlpResult("Unbounded", nodes=nodes)
+        if relaxation.status != "Optimal" or cannot_improve(relaxation.objective):
+            continue
+
+        x = relaxation.x
+        fractionality = np.abs(x - np.round(x))
+        if fractionality.max(initial=0.0) <= _INTEGRALITY_TOL:
+            best_x, best_objective = np.round(x), float(c @ np.round(x))
+            continue
+
+        rounded_up = np.minimum(np.ceil(x - _INTEGRALITY_TOL), node_upper)
+        if np.all(a_ub @ rounded_up <= b_ub + _FEASIBILITY_TOL) and c @ rounded_up < best_objective:
+            best_x, best_objective = rounded_up, float(c @ rounded_up)
+
+        if not math.isinf(best_objective):
+            node_lower, node_upper = _fix_by_reduced_costs(
+                relaxation, node_lower, node_upper, best_objective - step - relaxation.objective)
+
+        branch = int(np.argmax(fractionality))
+        down_upper = node_upper.copy()
+        down_upper[branch] = math.floor(x[branch])
+        up_lower = node_lower.copy()
+        up_lower[branch] = math.ceil(x[branch])
+        down = (node_lower, down_upper, relaxation.objective)
+        up = (up_lower, node_upper, relaxation.objective)
+        # Explore the side closer to the LP value first (pushed last, reusing the tableau without a copy).
+        first, second = (down, up) if x[branch] - math.floor(x[branch]) < 0.5 else (up, down)
+        open_nodes.extend([(*second, state.copy()), (*first, state)])
+
+    remaining_bound = min((bound for _, _, bound, _ in open_nodes if not cannot_improve(bound)), default=None)
+    if best_x is None:
+        return IlpResult("Not Solved" if remaining_bound is not None else "Infeasible", nodes=nodes)
+    if remaining_bound is None:
+        return IlpResult("Optimal", best_x, best_objective, nodes, 0.0)
+
+    gap = (best_objective - remaining_bound) / max(abs(best_objective), _EPS)
+    return IlpResult("Optimal", best_x, best_objective, nodes, max(gap, 0.0))
+
+
+def _is_feasible(x: np.ndarray, a_ub: np.ndarray, b_ub: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> bool:
+    return bool(np.all(np.abs(x - np.round(x)) <= _INTEGRALITY_TOL) and np.all(x >= lower) and np.all(x <= upper)
+                and np.all(a_ub @ x <= b_ub + _FEASIBILITY_TOL))
+
+
+def objective_step(c: np.ndarray) -> int:
+    """Smallest possible difference between two integer solutions' objectives, 0 if costs are fractional."""
+    if c.size == 0 or np.any(np.abs(c - np.round(c)) > _EPS):
+        return 0
+    return int(np.gcd.reduce(np.abs(np.round(c)).astype(np.int64)))
+
+
+def _fix_by_reduced_costs(relaxation: LpResult, lower: np.ndarray, upper: np.ndarray,
+                          allowance: float) -> tuple[np.ndarray, np.ndarray]:
+    """Tighten bounds of nonbasic variables that cannot move further without exceeding the incumbent."""
+    x, reduced_costs = relaxation.x, relaxation.reduced_costs
+    allowance = max(allowance, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        at_lower = (x - lower <= _INTEGRALITY_TOL) & (reduced_costs > _EPS)
+        at_upper = (upper - x <= _INTEGRALITY_TOL) & (reduced_costs < -_EPS)
+        movement = np.floor(allowance / np.abs(reduced_costs) + _INTEGRALITY_TOL)
+        upper = np.where(at_lower, np.minimum(upper, lower + movement), upper)
+        lower = np.where(at_upper, np.maximum(lower, upper - movement), lower)
+
+    return lower, upper
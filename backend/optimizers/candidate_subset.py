@@ -0,0 +1,48 @@
+import numpy as np
+
+from optimizers.branch_and_bound import solve_lp, objective_step
+
+_TOL = 1e-6
+
+
+def rank_candidates(prices: np.ndarray, nutrients: np.ndarray, min_values: np.ndarray) -> np.ndarray:
+    """
+    Food indices from the most to the least promising for a cheap plan: by the share of the minimum
+    nutrient requirements a portion covers per unit of price. Arguments are laid out as for
+    `find_dominated_foods`.
+    """
+    has_min = ~np.isnan(min_values) & (min_values > 0)
+    coverage = (nutrients[:, has_min] / min_values[has_min]).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = np.where(prices > 0, coverage / prices, np.inf)
+
+    return np.argsort(-value, kind="stable")
+
+
+def find_improving_foods(prices: np.ndarray, nutrients: np.ndarray, capacities: np.ndarray,
+                         min_values: np.ndarray, max_values: np.ndarray, max_price: float | None,
+                         plan_cost: float) -> np.ndarray | None:
+    """
+    Mask of the foods that might be part of a plan cheaper than `plan_cost`, None when the LP relaxation fails.
+
+    Every plan costs at least the LP relaxation's objective plus the reduced cost of each portion it takes
+    of a food, so a food whose reduced cost alone lifts that bound past the next cheaper plan price can be
+    left out of the search for a cheaper plan.
+    """
+    has_min, has_max = ~np.isnan(min_values), ~np.isnan(max_values)
+    a_ub = np.vstack([-nutrients[:, has_min].T, nutrients[:, has_max].T])
+    b_ub = np.concatenate([-min_values[has_min], max_values[has_max]])
+    if max_price is not None:
+        a_ub = np.vstack([a_ub, prices[None, :]])
+        b_ub = np.append(b_ub, max_price)
+
+    relaxation = solve_lp(prices, a_ub, b_ub, np.zeros(len(prices)), capacities.astype(float))
+    if relaxation.status != "Optimal":
+        return None
+
+    step = objective_step(prices)
+    # Plan costs are multiples of the price step, so a cheaper plan costs at most plan_cost - step
+    cheaper_than = plan_cost - step if step else plan_cost
+    improving = relaxation.objective + np.maximum(relaxation.reduced_costs, 0) <= cheaper_than + _TOL
+
+    return improving & (capacities > 0)
@@ -0,0 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable
+
+
+def solve_concurrently(keys: list[Hashable], load: Callable[[Hashable], Any], solve: Callable[[Hashable, Any], Any],
+                       max_workers: int) -> list:
+    """
+    `solve(key, load(key))` for every key, in order. The database session is not thread-safe, so every `load`
+    runs up front on the calling thread and only the solves run concurrently, on up to `max_workers` threads.
+    """
+    loaded = [load(key) for key in keys]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(solve, keys, loaded))
@@ -0,0 +1,134 @@
+import math
+
+import numpy as np
+
+from optimizers.branch_and_bound import solve_lp, objective_step
+
+_TOL = 1e-6
+_MAX_TOP_UP_PORTIONS = 50
+
+
+def find_proven_optimal_counts(prices: np.ndarray, nutrients: np.ndarray, capacities: np.ndarray,
+                               min_values: np.ndarray, max_values: np.ndarray) -> np.ndarray | None:
+    """
+    Portions per food of a plan proven optimal without the ILP solver, None when it can't be proven.
+
+    Requests constraining a single nutrient (e.g. only a calorie range) are knapsacks, solved exactly by
+    dynamic programming over the nutrient total. Other requests get the LP relaxation rounded, which
+    is only accepted when its price meets the LP bound.
+
+    Arguments are laid out as for `find_dominated_foods`.
+    """
+    constrained = np.flatnonzero(~np.isnan(min_values) | ~np.isnan(max_values))
+    if len(constrained) <= 1:
+        column = constrained[0] if len(constrained) else 0
+        amounts = nutrients[:, column]
+        if np.all(amounts == np.round(amounts)):
+            return _solve_single_nutrient(prices, amounts.astype(int), capacities,
+                                          min_values[column], max_values[column])
+
+    return _round_lp_relaxation(prices, nutrients, capacities, min_values, max_values)
+
+
+def _solve_single_nutrient(prices: np.ndarray, amounts: np.ndarray, capacities: np.ndarray,
+                           min_value: float, max_value: float) -> np.ndarray | None:
+    low = 0 if np.isnan(min_value) else max(math.ceil(min_value), 0)
+    high = None if np.isnan(max_value) else math.floor(max_value)
+    if high is not None and high < low:
+        return None
+
+    # Without a maximum every total above the minimum is as good as the minimum, they share the last state
+    top = high if high is not None else low
+    items = []
+    for i in np.flatnonzero((amounts > 0) & (capacities > 0)):
+        needed = high // amounts[i] if high is not None else -(-low // amounts[i])
+        items.extend((i, portions) for portions in _split(int(min(capacities[i], needed))))
+
+    cost = np.full(top + 1, np.inf)
+    cost[0] = 0.0
+    taken = np.zeros((len(items), top + 1), dtype=bool)
+    overflow_from = np.zeros(len(items), dtype=int)
+    for k, (i, portions) in enumerate(items):
+        amount, price = amounts[i] * portions, prices[i] * portions
+        candidate = np.full(top + 1, np.inf)
+        if amount <= top:
+            candidate[amount:] = cost[:top + 1 - amount] + price
+        if high is None:
+            overflow_from[k] = max(top - amount, 0) + int(np.argmin(cost[max(top - amount, 0):]))
+            candidate[top] = cost[overflow_from[k]] + price
+        taken[k] = candidate < cost
+        cost = np.minimum(cost, candidate)
+
+    total = low + int(np.argmin(cost[low:]))
+    if np.isinf(cost[total]):
+        return None
+
+    counts = np.zeros(len(prices))
+    for k in reversed(range(len(items))):
+        if taken[k, total]:
+            i, portions = items[k]
+            counts[i] += portions
+            total = overflow_from[k] if high is None and total == top else total - amounts[i] * portions
+
+    return counts
+
+
+def _split(portions: int) -> list[int]:
+    """Split a portion limit into powers of two (and the rest), every count up to it is a sum of a subset."""
+    parts, size = [], 1
+    while portions > 0:
+        parts.append(min(size, portions))
+        portions -= parts[-1]
+        size *= 2
+
+    return parts
+
+
+def _round_lp_relaxation(prices: np.ndarray, nutrients: np.ndarray, capacities: np.ndarray,
+                         min_values: np.ndarray, max_values: np.ndarray) -> np.ndarray | None:
+    """
+    Round the LP relaxation up, or down and top it up greedily by price per missing nutrient. The cheaper
+    feasible rounding is optimal when its price is the LP bound rounded up to the price step.
+    """
+    has_min, has_max = ~np.isnan(min_values), ~np.isnan(max_values)
+    a_ub = np.vstack([-nutrients[:, has_min].T, nutrients[:, has_max].T])
+    b_ub = np.concatenate([-min_values[has_min], max_values[has_max]])
+
+    relaxation = solve_lp(prices, a_ub, b_ub, np.zeros(len(prices)), capacities.astype(float))
+    if relaxation.status != "Optimal":
+        return None
+
+    candidates = [np.minimum(np.ceil(relaxation.x - _TOL), capacities),
+                  _top_up(np.floor(relaxation.x + _TOL), prices, nutrients, capacities, min_values, max_values)]
+    feasible = [counts for counts in candidates
+                if counts is not None and np.all(a_ub @ counts <= b_ub + _TOL)]
+    if not feasible:
+        return None
+
+    best = min(feasible, key=lambda counts: prices @ counts)
+    step = objective_step(prices)
+    bound = math.ceil(relaxation.objective / step - _TOL) * step if step else relaxation.objective
+
+    return best if prices @ best <= bound + _TOL else None
+
+
+def _top_up(counts: np.ndarray, prices: np.ndarray, nutrients: np.ndarray, capacities: np.ndarray,
+            min_values: np.ndarray, max_values: np.ndarray) -> np.ndarray | None:
+    counts = counts.copy()
+    min_values, max_values = np.nan_to_num(min_values, nan=0.0), np.nan_to_num(max_values, nan=np.inf)
+    for _ in range(_MAX_TOP_UP_PORTIONS):
+        totals = counts @ nutrients
+        deficit = np.maximum(min_values - totals, 0.0)
+        if not np.any(deficit > _TOL):
+            return counts
+
+        # Share of the remaining deficit a portion covers, summed over the nutrients still missing
+        coverage = (np.minimum(nutrients, deficit) / np.where(deficit > _TOL, deficit, np.inf)).sum(axis=1)
+        fits = (counts < capacities) & np.all(totals + nutrients <= max_values + _TOL, axis=1) & (coverage > 0)
+        if not np.any(fits):
+            return None
+
+        with np.errstate(divide="ignore"):
+            counts[np.argmin(np.where(fits, prices / coverage, np.inf))] += 1
+
+    return None
@@ -1,78 +1,461 @@
+import threading
 import time
+from dataclasses import replace
+from datetime import date
+from typing import Callable
 
 from cachetools import TTLCache, cached
-from pulp import LpProblem, LpMinimize, LpInteger, LpVariable, lpSum, PULP_CBC_CMD, LpStatus
+from pulp import LpProblem, LpSolutionOptimal
 
+from exceptions import WorkerModelMissingError
+from model.cache_stats import CacheStats
 from model.food import Food
+from model.meal_plan_objective import MealPlanObjective
 from model.nutritional_constraints import NutritionalConstraints
-from monitoring.logging import APP_LOGGER
+from monitoring.logging import APP_LOGGER, PERF_LOGGER
 from monitoring.performance import benchmark
+from monitoring.solve_telemetry import SOLVE_TELEMETRY, AnswerTier, SolveRecord
+from optimizers.meal_plan_model import MealPlanModel
+from optimizers.meal_plan_solution import MealPlanSolution
+from optimizers.preprocessing import Infeasibility
+from optimizers.request_fingerprint import RequestFingerprint
+from optimizers.solution_store import SOLUTION_STORE
+from optimizers.solve_stats import SolveStats
+from optimizers.solver_backends import SolverBackend, get_solver_backend, optimality_gap, explored_nodes
+from optimizers.solver_path import SolverPath
+from optimizers.single_flight import SingleFlight
+from optimizers.solver_pool import SOLVER_POOL
+from optimizers.weekly_meal_plan_model import WeeklyMealPlanModel
 from settings import SETTINGS
 
 
+@cached(TTLCache(maxsize=SETTINGS.LARGE_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL),
+        key=lambda fingerprint, model, food_selection: fingerprint, lock=threading.Lock())
+def find_meal_plan_infeasibility(fingerprint: RequestFingerprint, model: MealPlanModel,
+                                 food_selection: list[Food]) -> Infeasibility | None:
+    """Cached both ways, so retrying an infeasible request costs a lookup instead of a solve."""
+    excluded_food_ids = frozenset(f.food_id for f in model.foods) - {f.food_id for f in food_selection}
+    infeasibility = model.find_infeasibility(fingerprint.nutritional_constraints, fingerprint.max_food_repeat,
+                                             excluded_food_ids, fingerprint.included_foods)
+    if infeasibility is not None:
+        PERF_LOGGER.info(f"🚫 Rejected infeasible request without solving: {infeasibility.constraint}")
+
+    return infeasibility
+
+
+@benchmark
+def solve_meal_plan(fingerprint: RequestFingerprint, model: MealPlanModel,
+                    food_selection: list[Food]) -> MealPlanSolution:
+    """Answer from the heuristic fast path when it proves its plan optimal, otherwise from `solve_meal_plan_ilp`."""
+    start_time = time.perf_counter()
+    # The heuristic only knows the plain cheapest plan
+    if (fingerprint.objective == MealPlanObjective.MIN_PRICE and fingerprint.max_price is None
+            and not fingerprint.included_foods):
+        excluded_food_ids = frozenset(f.food_id for f in model.foods) - {f.food_id for f in food_selection}
+        food_counts = model.find_proven_plan(fingerprint.nutritional_constraints, fingerprint.max_food_repeat,
+                                             excluded_food_ids)
+        if food_counts is not None:
+            PERF_LOGGER.info("⚡ Meal plan proven optimal by the heuristic, skipped the ILP solver")
+            _record_answer(fingerprint, AnswerTier.HEURISTIC, time.perf_counter() - start_time)
+            return MealPlanSolution(food_counts, solver_path=SolverPath.HEURISTIC)
+
+    solution, answered_by = solve_meal_plan_ilp(fingerprint, model, food_selection)
+    # Only a solve of this request has stats worth recording, a shared or cached solution belongs to another one
+    _record_answer(fingerprint, answered_by, time.perf_counter() - start_time,
+                   solution if answered_by == AnswerTier.SOLVER else None)
+
+    return solution
+
+
+# Identical requests arriving before the first one is cached wait for its solve instead of starting their own
+_IN_FLIGHT_SOLVES = SingleFlight()
+
+
 @benchmark
+def solve_meal_plan_ilp(fingerprint: RequestFingerprint, model: MealPlanModel,
+                        food_selection: list[Food]) -> tuple[MealPlanSolution, AnswerTier]:
+    """
+    Cached by the request fingerprint only, `model` and `food_selection` must belong to the same request.
+    Returns the solution along with the tier that answered it.
+    """
+    computed_by = []
+    solution, shared = _IN_FLIGHT_SOLVES.run_shared(fingerprint, _solve_meal_plan_ilp, fingerprint, model,
+                                                    food_selection, computed_by)
+    if shared:
+        return solution, AnswerTier.IN_FLIGHT
+
+    if computed_by:
+        _uncache_unless_optimal(_solve_meal_plan_ilp, solution.is_optimal, fingerprint, model, food_selection,
+                                computed_by)
+
+    return solution, _answered_by(computed_by)
+
+
 @cached(TTLCache(maxsize=SETTINGS.DEFAULT_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL),
-        key=lambda foods, nutritional_constraints, max_food_repeat: (
-                tuple(foods), nutritional_constraints, max_food_repeat)
-        )
-def solve_meal_plan_ilp(foods: list[Food], nutrition_constraints: NutritionalConstraints,
-                        max_food_repeat: int = None) -> dict[int, int]:
-    problem, x_vars = _create_price_minimization_problem(foods)
+        key=lambda fingerprint, model, food_selection, computed_by: fingerprint, lock=threading.Lock(), info=True)
+def _solve_meal_plan_ilp(fingerprint: RequestFingerprint, model: MealPlanModel, food_selection: list[Food],
+                         computed_by: list[AnswerTier]) -> MealPlanSolution:
+    stored_solution = SOLUTION_STORE.get(fingerprint)
+    if stored_solution is not None:
+        computed_by.append(AnswerTier.SOLUTION_STORE)
+        return stored_solution
+
+    excluded_food_ids = frozenset(f.food_id for f in model.foods) - {f.food_id for f in food_selection}
+
+    if SOLVER_POOL.enabled:
+        solution = _run_in_pool(model, _solve_in_worker, fingerprint, excluded_food_ids, None)
+    else:
+        solution = _solve(model, fingerprint, excluded_food_ids)
+    computed_by.append(AnswerTier.SOLVER)
+
+    # Plans cut short by the time budget or missing get another chance after a restart
+    if solution.is_optimal:
+        SOLUTION_STORE.put(fingerprint, solution)
+
+    return solution
+
+
+# Models compiled inside a solver worker process, keyed by menu version
+_WORKER_MODELS: TTLCache = TTLCache(maxsize=SETTINGS.LARGE_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL)
+
+
+def _run_in_pool(model: MealPlanModel, fn: Callable, *args):
+    """
+    Run `fn(*args, foods)` in the solver pool. Only the fingerprint and food ids cross the process boundary,
+    the menu is sent again only to a worker that has no compiled model of it yet.
+    """
+    try:
+        return SOLVER_POOL.submit(fn, *args, None).result()
+    except WorkerModelMissingError:
+        return SOLVER_POOL.submit(fn, *args, model.foods).result()
+
+
+def _solve_in_worker(fingerprint: RequestFingerprint, excluded_food_ids: frozenset[int],
+                     start_counts: dict[int, int] | None, foods: list[Food] | None) -> MealPlanSolution:
+    return _solve(_get_worker_model(fingerprint, foods), fingerprint, excluded_food_ids, start_counts)
+
+
+def _get_worker_model(fingerprint: RequestFingerprint, foods: list[Food] | None) -> MealPlanModel:
+    model = _WORKER_MODELS.get(fingerprint.menu_version)
+    if model is None:
+        if foods is None:
+            raise WorkerModelMissingError(fingerprint.menu_version)
+        model = MealPlanModel(foods)
+        _WORKER_MODELS[fingerprint.menu_version] = model
+
+    return model
+
+
+def _solve(model: MealPlanModel, fingerprint: RequestFingerprint, excluded_food_ids: frozenset[int],
+           start_counts: dict[int, int] | None = None) -> MealPlanSolution:
+    with model.lock:
+        problem = model.apply(fingerprint.nutritional_constraints, fingerprint.max_food_repeat, excluded_food_ids,
+                              fingerprint.objective, fingerprint.max_price, fingerprint.included_foods)
+        if start_counts is not None:
+            model.set_initial_counts(start_counts)
+
+        start_time = time.time()
+        backend = get_solver_backend(SETTINGS.SOLVER_BACKEND)
+        if (fingerprint.objective == MealPlanObjective.MIN_PRICE and SETTINGS.CANDIDATE_SUBSET_SIZE
+                and model.restrict_to_candidates(SETTINGS.CANDIDATE_SUBSET_SIZE)):
+            status = _solve_on_candidates(model, backend, problem, start_counts is not None)
+        else:
+            status = backend.solve(problem, time_limit=SETTINGS.SOLVER_TIME_LIMIT, warm_start=start_counts is not None)
+        stats = SolveStats(status, len(problem.variables()), len(problem.constraints), model.pruned_food_count,
+                           explored_nodes(problem), time.time() - start_time)
+        if status == "Optimal":
+            solution = MealPlanSolution(model.food_counts(), *_optimality(problem), stats=stats)
+            if fingerprint.objective == MealPlanObjective.MIN_PRICE_MAX_PROTEIN:
+                # Starts from the cheapest plan, so it can only trade it for one with more protein at the same price
+                if backend.solve(model.apply_tie_break(), time_limit=SETTINGS.SOLVER_TIME_LIMIT,
+                                 warm_start=True) == "Optimal":
+                    solution = replace(solution, food_counts=model.food_counts())
+            duration = time.time() - start_time
+
+            _log_solution(solution, duration, "meal plan")
+            return solution
+
+    APP_LOGGER.info("Could not create meal plan. Status: %s", status)
+
+    return MealPlanSolution(is_optimal=False, stats=stats)
+
+
+def _solve_on_candidates(model: MealPlanModel, backend: SolverBackend, problem: LpProblem, warm_start: bool) -> str:
+    """Solve on the candidate foods, letting more back in until the plan is proven to hold for the whole menu."""
+    deadline = time.time() + SETTINGS.SOLVER_TIME_LIMIT
+    while True:
+        status = backend.solve(problem, time_limit=max(deadline - time.time(), 0.1), warm_start=warm_start)
+        if status not in ("Optimal", "Infeasible"):
+            return status
+
+        plan_cost = problem.objective.value() if status == "Optimal" else None
+        if not model.expand_candidates(plan_cost):
+            PERF_LOGGER.info(f"🎯 Solved on {model.candidate_count} candidate foods")
+            return status
+
+        if status == "Optimal":
+            # The plan of the candidates stays feasible with more foods
+            model.set_initial_counts(model.food_counts())
+            warm_start = True
+
+
+@benchmark
+def solve_swapped_meal_plan(fingerprint: RequestFingerprint, model: MealPlanModel, food_selection: list[Food],
+                            previous_solution: MealPlanSolution) -> MealPlanSolution:
+    """
+    Re-optimize a plan after foods were taken out of `food_selection`, warm started from what is left of
+    `previous_solution`. Not cached: `fingerprint` doesn't tell the swapped out foods apart.
+    """
+    start_time = time.perf_counter()
+    excluded_food_ids = frozenset(f.food_id for f in model.foods) - {f.food_id for f in food_selection}
+    if SOLVER_POOL.enabled:
+        solution = _run_in_pool(model, _solve_in_worker, fingerprint, excluded_food_ids,
+                                previous_solution.food_counts)
+    else:
+        solution = _solve(model, fingerprint, excluded_food_ids, previous_solution.food_counts)
+    _record_answer(fingerprint, AnswerTier.SOLVER, time.perf_counter() - start_time, solution)
+
+    return solution
+
+
+@benchmark
+def solve_meal_plan_alternatives(fingerprint: RequestFingerprint, model: MealPlanModel, food_selection: list[Food],
+                                 alternatives: int) -> list[MealPlanSolution]:
+    """The cheapest plan followed by up to `alternatives` next cheapest ones, each with a food the earlier ones lack."""
+    start_time = time.perf_counter()
+    computed_by = []
+    solutions = _solve_meal_plan_alternatives(fingerprint, model, food_selection, alternatives, computed_by)
+    if computed_by:
+        _uncache_unless_optimal(_solve_meal_plan_alternatives, all(s.is_optimal for s in solutions), fingerprint,
+                                model, food_selection, alternatives, computed_by)
+    _record_answer(fingerprint, _answered_by(computed_by), time.perf_counter() - start_time)
 
-    _add_nutrient_constraints_to_problem(foods, nutrition_constraints, problem, x_vars)
+    return solutions
 
-    _add_max_food_repeat_to_problem(foods, max_food_repeat, problem, x_vars)
 
+@cached(TTLCache(maxsize=SETTINGS.DEFAULT_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL),
+        key=lambda fingerprint, model, food_selection, alternatives, computed_by: (fingerprint, alternatives),
+        lock=threading.Lock())
+def _solve_meal_plan_alternatives(fingerprint: RequestFingerprint, model: MealPlanModel, food_selection: list[Food],
+                                  alternatives: int, computed_by: list[AnswerTier]) -> list[MealPlanSolution]:
+    computed_by.append(AnswerTier.SOLVER)
+    excluded_food_ids = frozenset(f.food_id for f in model.foods) - {f.food_id for f in food_selection}
+    if SOLVER_POOL.enabled:
+        return _run_in_pool(model, _solve_alternatives_in_worker, fingerprint, excluded_food_ids, alternatives)
+
+    return _solve_alternatives(model, fingerprint, excluded_food_ids, alternatives)
+
+
+def _solve_alternatives_in_worker(fingerprint: RequestFingerprint, excluded_food_ids: frozenset[int],
+                                  alternatives: int, foods: list[Food] | None) -> list[MealPlanSolution]:
+    return _solve_alternatives(_get_worker_model(fingerprint, foods), fingerprint, excluded_food_ids, alternatives)
+
+
+def _solve_alternatives(model: MealPlanModel, fingerprint: RequestFingerprint, excluded_food_ids: frozenset[int],
+                        alternatives: int) -> list[MealPlanSolution]:
+    solutions = []
+    with model.lock:
+        # The next cheapest plan is often the optimum with a food swapped for one it dominates
+        problem = model.apply(fingerprint.nutritional_constraints, fingerprint.max_food_repeat, excluded_food_ids,
+                              fingerprint.objective, fingerprint.max_price, fingerprint.included_foods,
+                              prune_dominated=False)
+
+        start_time = time.time()
+        # Every cut only adds a constraint to the model already in memory, nothing is rebuilt between the solves
+        for _ in range(alternatives + 1):
+            status = get_solver_backend(SETTINGS.SOLVER_BACKEND).solve(problem, time_limit=SETTINGS.SOLVER_TIME_LIMIT)
+            if status != "Optimal":
+                break
+            solutions.append(MealPlanSolution(model.food_counts(), *_optimality(problem)))
+            model.exclude_plan(solutions[-1].food_counts)
+        duration = time.time() - start_time
+
+    if not solutions:
+        APP_LOGGER.info("Could not create meal plan. Status: %s", status)
+        return [MealPlanSolution(is_optimal=False)]
+
+    APP_LOGGER.info(f"✅ Successfully created a meal plan and {len(solutions) - 1} alternatives "
+                    f"in {duration * 1000:.2f} ms.")
+
+    return solutions
+
+
+@benchmark
+def solve_meal_plan_sweep(fingerprints: tuple[RequestFingerprint, ...], model: MealPlanModel,
+                          food_selection: list[Food]) -> list[MealPlanSolution]:
+    """One plan per fingerprint, all of the same menu. Each solve is warm started from the plan before it."""
+    start_time = time.perf_counter()
+    computed_by = []
+    solutions = _solve_meal_plan_sweep(fingerprints, model, food_selection, computed_by)
+    if computed_by:
+        _uncache_unless_optimal(_solve_meal_plan_sweep, all(s.is_optimal for s in solutions), fingerprints, model,
+                                food_selection, computed_by)
+    # One record for the whole sweep, filed under its first point
+    _record_answer(fingerprints[0], _answered_by(computed_by), time.perf_counter() - start_time)
+
+    return solutions
+
+
+@cached(TTLCache(maxsize=SETTINGS.DEFAULT_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL),
+        key=lambda fingerprints, model, food_selection, computed_by: fingerprints, lock=threading.Lock())
+def _solve_meal_plan_sweep(fingerprints: tuple[RequestFingerprint, ...], model: MealPlanModel,
+                           food_selection: list[Food], computed_by: list[AnswerTier]) -> list[MealPlanSolution]:
+    computed_by.append(AnswerTier.SOLVER)
+    excluded_food_ids = frozenset(f.food_id for f in model.foods) - {f.food_id for f in food_selection}
+    if SOLVER_POOL.enabled:
+        return _run_in_pool(model, _solve_sweep_in_worker, fingerprints, excluded_food_ids)
+
+    return _solve_sweep(model, fingerprints, excluded_food_ids)
+
+
+def _solve_sweep_in_worker(fingerprints: tuple[RequestFingerprint, ...], excluded_food_ids: frozenset[int],
+                           foods: list[Food] | None) -> list[MealPlanSolution]:
+    return _solve_sweep(_get_worker_model(fingerprints[0], foods), fingerprints, excluded_food_ids)
+
+
+def _solve_sweep(model: MealPlanModel, fingerprints: tuple[RequestFingerprint, ...],
+                 excluded_food_ids: frozenset[int]) -> list[MealPlanSolution]:
+    solutions = []
+    start_counts = None
     start_time = time.time()
-    solver = PULP_CBC_CMD(msg=False)
-    status = LpStatus[problem.solve(solver)]
+    with model.lock:
+        for fingerprint in fingerprints:
+            constraints, max_food_repeat = fingerprint.nutritional_constraints, fingerprint.max_food_repeat
+            if model.find_infeasibility(constraints, max_food_repeat, excluded_food_ids,
+                                        fingerprint.included_foods) is not None:
+                # Proven to have no plan, as final an answer as an optimal one
+                solutions.append(MealPlanSolution())
+                continue
+
+            # Neighbouring points share the compiled model, only the swept bound is patched between them
+            problem = model.apply(constraints, max_food_repeat, excluded_food_ids, fingerprint.objective,
+                                  fingerprint.max_price, fingerprint.included_foods)
+            if start_counts is not None:
+                model.set_initial_counts(start_counts)
+            status = get_solver_backend(SETTINGS.SOLVER_BACKEND).solve(problem, time_limit=SETTINGS.SOLVER_TIME_LIMIT,
+                                                                       warm_start=start_counts is not None)
+            if status != "Optimal":
+                solutions.append(MealPlanSolution(is_optimal=False))
+                continue
+
+            solutions.append(MealPlanSolution(model.food_counts(), *_optimality(problem)))
+            start_counts = solutions[-1].food_counts
+    duration = time.time() - start_time
+
+    APP_LOGGER.info(f"✅ Successfully swept {len(fingerprints)} meal plans in {duration * 1000:.2f} ms.")
+
+    return solutions
+
+
+@benchmark
+def solve_weekly_meal_plan_ilp(fingerprints: tuple[RequestFingerprint, ...], food_selections: dict[date, list[Food]],
+                               max_total_food_repeat: int = None,
+                               max_total_price: int = None) -> dict[date, MealPlanSolution]:
+    """Solve all dates in one model. `fingerprints` holds one per date of `food_selections`, all with the same constraints."""
+    start_time = time.perf_counter()
+    computed_by = []
+    solutions = _solve_weekly_meal_plan_ilp(fingerprints, food_selections, max_total_food_repeat, max_total_price,
+                                            computed_by)
+    if computed_by:
+        _uncache_unless_optimal(_solve_weekly_meal_plan_ilp, bool(solutions) and all(
+            s.is_optimal for s in solutions.values()), fingerprints, food_selections, max_total_food_repeat,
+                                max_total_price, computed_by)
+    # One record for all dates, filed under the first one
+    _record_answer(fingerprints[0], _answered_by(computed_by), time.perf_counter() - start_time)
+
+    return solutions
+
+
+@cached(TTLCache(maxsize=SETTINGS.DEFAULT_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL),
+        key=lambda fingerprints, food_selections, max_total_food_repeat, max_total_price, computed_by: (
+                fingerprints, max_total_food_repeat, max_total_price),
+        lock=threading.Lock())
+def _solve_weekly_meal_plan_ilp(fingerprints: tuple[RequestFingerprint, ...], food_selections: dict[date, list[Food]],
+                                max_total_food_repeat: int | None, max_total_price: int | None,
+                                computed_by: list[AnswerTier]) -> dict[date, MealPlanSolution]:
+    computed_by.append(AnswerTier.SOLVER)
+    args = (food_selections, fingerprints[0].nutritional_constraints, fingerprints[0].max_food_repeat,
+            max_total_food_repeat, max_total_price)
+    if SOLVER_POOL.enabled:
+        return SOLVER_POOL.submit(_solve_weekly, *args).result()
+
+    return _solve_weekly(*args)
+
+
+def _solve_weekly(food_selections: dict[date, list[Food]], nutrition_constraints: NutritionalConstraints,
+                  max_food_repeat: int | None, max_total_food_repeat: int | None,
+                  max_total_price: int | None) -> dict[date, MealPlanSolution]:
+    model = WeeklyMealPlanModel(food_selections, nutrition_constraints, max_food_repeat, max_total_food_repeat,
+                                max_total_price)
+
+    start_time = time.time()
+    status = get_solver_backend(SETTINGS.SOLVER_BACKEND).solve(model.problem, time_limit=SETTINGS.SOLVER_TIME_LIMIT)
     duration = time.time() - start_time
 
     if status == "Optimal":
-        APP_LOGGER.info(f"✅ Successfully created a meal plan in {duration * 1000:.2f} ms.")
-        return _get_food_counts(foods, x_vars)
+        is_optimal, gap = _optimality(model.problem)
+        _log_solution(MealPlanSolution(is_optimal=is_optimal, optimality_gap=gap), duration,
+                      f"{len(food_selections)} day meal plan")
+        return {plan_date: MealPlanSolution(food_counts, is_optimal, gap)
+                for plan_date, food_counts in model.food_counts().items()}
 
-    APP_LOGGER.info("Could not create meal plan. Status: %s", status)
+    APP_LOGGER.info("Could not create weekly meal plan. Status: %s", status)
 
     return {}
 
 
-def _get_food_counts(foods, x_vars):
-    return {
-        f.food_id: int(x_vars[f.food_id].varValue)
-        for f in foods if x_vars[f.food_id].varValue and x_vars[f.food_id].varValue > 0
-    }
+def _optimality(problem: LpProblem) -> tuple[bool, float]:
+    return problem.sol_status == LpSolutionOptimal, optimality_gap(problem)
+
+
+def _log_solution(solution: MealPlanSolution, duration: float, description: str):
+    if solution.is_optimal:
+        APP_LOGGER.info(f"✅ Successfully created a {description} in {duration * 1000:.2f} ms.")
+    else:
+        APP_LOGGER.info(f"⏳ Time budget ran out, created a {description} within "
+                        f"{solution.optimality_gap:.1%} of optimal in {duration * 1000:.2f} ms.")
+
+
+def _uncache_unless_optimal(cached_function: Callable, is_optimal: bool, *args):
+    """
+    Drop what `cached_function(*args)` just cached unless it is optimal. Plans cut short by the time budget, or
+    missing because of it, are solved again by the next request instead of being served for the cache's TTL.
+    """
+    if not is_optimal:
+        with cached_function.cache_lock:
+            cached_function.cache.pop(cached_function.cache_key(*args), None)
 
 
-def _create_price_minimization_problem(foods) -> [LpProblem, dict]:
-    problem = LpProblem("MealPlan_Generation_ILP", LpMinimize)
-    x_vars = {food.food_id: LpVariable(f"x_{food.food_id}", lowBound=0, cat=LpInteger) for food in foods}
-    problem += lpSum(x_vars[f.food_id] * f.price for f in foods), "TotalCost"
+def _answered_by(computed_by: list[AnswerTier]) -> AnswerTier:
+    """The tier a cached function appended to `computed_by` when it ran, the solution cache when it didn't."""
+    return computed_by[0] if computed_by else AnswerTier.MEMORY_CACHE
 
-    return problem, x_vars
 
+def _record_answer(fingerprint: RequestFingerprint, answered_by: AnswerTier, duration: float,
+                   solution: MealPlanSolution = None):
+    stats = solution.stats if solution is not None else None
+    SOLVE_TELEMETRY.record(SolveRecord(
+        date=fingerprint.date,
+        food_vendor=fingerprint.food_vendor,
+        nutritional_constraints=fingerprint.nutritional_constraints,
+        max_food_repeat=fingerprint.max_food_repeat,
+        answered_by=answered_by,
+        duration=duration,
+        status=stats.status if stats else None,
+        variables=stats.variables if stats else None,
+        constraints=stats.constraints if stats else None,
+        pruned_foods=stats.pruned_foods if stats else None,
+        nodes=stats.nodes if stats else None,
+        optimality_gap=solution.optimality_gap if stats else None,
+    ))
 
-def _add_nutrient_constraints_to_problem(foods: list[Food], nutrition_constraints: NutritionalConstraints, problem,
-                                         x_vars: dict):
-    constraints = {
-        "calories": "Calories",
-        "protein": "Protein",
-        "carb": "Carbs",
-        "fat": "Fat"
-    }
-    for attr, label in constraints.items():
-        min_val = getattr(nutrition_constraints, f"min_{attr}")
-        max_val = getattr(nutrition_constraints, f"max_{attr}")
 
-        total_nutrient = lpSum(x_vars[f.food_id] * getattr(f, attr) for f in foods)
+def get_solution_cache_stats() -> CacheStats:
+    cache_info = _solve_meal_plan_ilp.cache_info()
 
-        if min_val is not None:
-            problem += total_nutrient >= min_val, f"Min{label}"
-        if max_val is not None:
-            problem += total_nutrient <= max_val, f"Max{label}"
+    return CacheStats(hits=cache_info.hits, misses=cache_info.misses, size=cache_info.currsize,
+                      max_size=cache_info.maxsize, coalesced=_IN_FLIGHT_SOLVES.coalesced)
 
 
-def _add_max_food_repeat_to_problem(foods: list[Food], max_food_repeat: int, problem, x_vars):
-    if max_food_repeat is not None:
-        for f in foods:
-            problem += (x_vars[f.food_id] <= max_food_repeat), f"MaxRepeatEach_{f.food_id}"
+def clear_solution_cache():
+    _solve_meal_plan_ilp.cache_clear()
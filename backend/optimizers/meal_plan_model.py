@@ -0,0 +1,320 @@
+import threading
+from datetime import date
+
+import numpy as np
+from cachetools import TTLCache
+from pulp import LpProblem, LpMinimize, LpMaximize, LpInteger, LpVariable, LpConstraint, LpConstraintGE, \
+    LpConstraintLE, LpAffineExpression, lpSum, value
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.food import Food
+from model.included_food import IncludedFood
+from model.meal_plan_objective import MealPlanObjective
+from model.menu_version import compute_menu_digest
+from model.nutrients import NUTRIENTS, nutrient_matrix
+from model.nutritional_constraints import NutritionalConstraints
+from monitoring.logging import PERF_LOGGER
+from monitoring.performance import benchmark
+from optimizers.candidate_subset import rank_candidates, find_improving_foods
+from optimizers.heuristic import find_proven_optimal_counts
+from optimizers.preprocessing import group_duplicate_foods, find_dominated_foods, find_infeasibility, Infeasibility
+from settings import SETTINGS
+
+class MealPlanModel:
+    """
+    Meal plan ILP over one day's menu of one vendor, minimizing the price unless another objective is asked for.
+
+    The price and nutrient sums are built once per menu, from the columns of the nutrient matrix. A request only patches the right-hand sides
+    of the constraints it uses, the bounds of the food variables (max food repeat, zero for blacklisted
+    or dominated foods, the portions of included foods) and which of the prebuilt sums is the objective, so no PuLP
+    expressions are rebuilt per request. Foods with identical price and macros share one variable,
+    keyed by the first food of the group; see `duplicates`.
+    Patching mutates the shared model, hold `lock` from `apply` until the solution has been read.
+    """
+
+    def __init__(self, foods: list[Food]):
+        self._foods = foods
+        self._menu_version = compute_menu_digest(foods)
+        self._duplicates = group_duplicate_foods(foods)
+        representatives = [food for food in foods if food.food_id in self._duplicates]
+        self._prices = np.array([f.price for f in representatives], dtype=float)
+        self._nutrients = nutrient_matrix(representatives)
+
+        self._problem = LpProblem("MealPlan_Generation_ILP", LpMinimize)
+        self._x_vars = {f.food_id: LpVariable(f"x_{f.food_id}", lowBound=0, cat=LpInteger) for f in representatives}
+        self._food_groups = list(self._duplicates.values())
+        self._variable_index = {food_id: i for i, food_ids in enumerate(self._food_groups) for food_id in food_ids}
+        x_vars = list(self._x_vars.values())
+        self._total_price = column_sum(x_vars, self._prices)
+        self._nutrient_totals = {attr: column_sum(x_vars, self._nutrients[:, k]) for k, attr in enumerate(NUTRIENTS)}
+        self._objectives = {
+            MealPlanObjective.MIN_PRICE: (self._total_price, LpMinimize),
+            MealPlanObjective.MAX_PROTEIN: (self._nutrient_totals["protein"], LpMaximize),
+            MealPlanObjective.MIN_FAT: (self._nutrient_totals["fat"], LpMinimize),
+            MealPlanObjective.MIN_CALORIES: (self._nutrient_totals["calories"], LpMinimize),
+            # Second stage in `apply_tie_break`
+            MealPlanObjective.MIN_PRICE_MAX_PROTEIN: (self._total_price, LpMinimize),
+        }
+        self._nutrient_constraints = self._create_nutrient_constraints()
+        self._max_price_constraint = LpConstraint(self._total_price, LpConstraintLE, "MaxPrice", 0)
+        self._pruned_food_count = 0
+        self._upper_bounds = np.zeros(len(representatives))
+        self._lower_bounds = np.zeros(len(representatives))
+        self._candidates = np.ones(len(representatives), dtype=bool)
+        self.lock = threading.Lock()
+
+    @property
+    def foods(self) -> list[Food]:
+        return self._foods
+
+    @property
+    def menu_version(self) -> str:
+        return self._menu_version
+
+    @property
+    def x_vars(self) -> dict[int, LpVariable]:
+        return self._x_vars
+
+    @property
+    def duplicates(self) -> dict[int, list[int]]:
+        return self._duplicates
+
+    @property
+    def candidate_count(self) -> int:
+        """Foods `restrict_to_candidates` and `expand_candidates` left in the problem."""
+        return int(np.count_nonzero(self._candidates))
+
+    @property
+    def pruned_food_count(self) -> int:
+        """Dominated foods the last `apply` took out of the problem."""
+        return self._pruned_food_count
+
+    def apply(self, nutrition_constraints: NutritionalConstraints, max_food_repeat: int = None,
+              excluded_food_ids: frozenset[int] = frozenset(),
+              objective: MealPlanObjective = MealPlanObjective.MIN_PRICE, max_price: int = None,
+              included_foods: tuple[IncludedFood, ...] = (), prune_dominated: bool = True) -> LpProblem:
+        """
+        Patch the model for one request and return the problem ready to be solved. Included foods only
+        move variable bounds, no constraint rows are added for them. Dominated foods are pruned for MIN_PRICE
+        unless `prune_dominated` is off, pruning keeps the optimum but not the plans next to it.
+        """
+        self._set_objective(objective)
+        self._min_values, self._max_values = nutrition_constraints.bounds()
+        self._max_price = max_price
+
+        active_constraints = {}
+        right_hand_sides = np.column_stack([self._min_values, self._max_values]).ravel()
+        for (name, constraint), rhs in zip(self._nutrient_constraints, right_hand_sides):
+            if not np.isnan(rhs):
+                constraint.changeRHS(_to_rhs(rhs))
+                active_constraints[name] = constraint
+        if max_price is not None:
+            self._max_price_constraint.changeRHS(max_price)
+            active_constraints["MaxPrice"] = self._max_price_constraint
+        self._problem.constraints = active_constraints
+
+        # Dominance only holds for the price, a pricier food may have more protein or less fat
+        prune_dominated = prune_dominated and objective == MealPlanObjective.MIN_PRICE
+        self._apply_food_bounds(max_food_repeat, excluded_food_ids, included_foods, prune_dominated)
+
+        return self._problem
+
+    def apply_tie_break(self) -> LpProblem:
+        """
+        Second stage of MIN_PRICE_MAX_PROTEIN once the first one is solved: keep its price and maximize
+        protein, warm started from its plan. The next `apply` restores the first stage.
+        """
+        self._set_initial_values(self.food_counts())
+        price = value(self._total_price)
+        self._problem.constraints["OptimalPrice"] = LpConstraint(self._total_price, LpConstraintLE, "OptimalPrice",
+                                                                 price)
+        self._set_objective(MealPlanObjective.MAX_PROTEIN)
+
+        return self._problem
+
+    def restrict_to_candidates(self, size: int) -> bool:
+        """
+        Leave only the `size` most promising foods of the last `apply` in the problem, see `expand_candidates`.
+        False, with the problem left as is, when there are no more than twice as many foods anyway.
+        """
+        available = self._upper_bounds > 0
+        if np.count_nonzero(available) <= 2 * size:
+            return False
+
+        ranking = rank_candidates(self._prices, self._nutrients, self._min_values)
+        self._candidate_ranking = ranking[available[ranking]]
+        self._candidates = np.zeros(len(self._x_vars), dtype=bool)
+        for x_var in self._x_vars.values():
+            x_var.upBound = 0
+        # Included foods must stay, their lower bounds would make the problem infeasible otherwise
+        self._add_candidates(np.union1d(self._candidate_ranking[:size], np.flatnonzero(self._lower_bounds > 0)))
+
+        return True
+
+    def expand_candidates(self, plan_cost: float | None) -> bool:
+        """
+        Let foods left out by `restrict_to_candidates` back in: the ones LP reduced costs can't rule out of
+        a plan cheaper than `plan_cost`, the best plan of the candidates, or twice as many foods when the
+        candidates had no plan (None). False when none qualify, the last plan then holds for the whole menu.
+        """
+        left_out = ~self._candidates & (self._upper_bounds > 0)
+        if plan_cost is None:
+            # Doubling keeps the number of infeasible solves logarithmic in the menu size
+            added = self._candidate_ranking[left_out[self._candidate_ranking]][:np.count_nonzero(self._candidates)]
+        else:
+            improving = find_improving_foods(self._prices, self._nutrients, self._upper_bounds, self._min_values,
+                                             self._max_values, self._max_price, plan_cost)
+            added = np.flatnonzero(left_out if improving is None else improving & left_out)
+        self._add_candidates(added)
+
+        return len(added) > 0
+
+    def _add_candidates(self, indices: np.ndarray):
+        self._candidates[indices] = True
+        x_vars = list(self._x_vars.values())
+        for i in indices:
+            x_vars[i].upBound = _to_up_bound(self._upper_bounds[i])
+
+    def _set_objective(self, objective: MealPlanObjective):
+        expression, sense = self._objectives[objective]
+        # A copy, so the solver naming the objective doesn't touch the sums shared with the constraints
+        self._problem.setObjective(LpAffineExpression(expression))
+        self._problem.sense = sense
+
+    def set_initial_counts(self, food_counts: dict[int, int]):
+        """Starting solution for a warm started solve, clipped to the bounds of the last `apply`."""
+        self._set_initial_values(food_counts)
+
+    def _set_initial_values(self, food_counts: dict[int, int]):
+        for food_id, x_var in self._x_vars.items():
+            count = max(food_counts.get(food_id, 0), x_var.lowBound)
+            x_var.setInitialValue(count if x_var.upBound is None else min(count, x_var.upBound))
+
+    def exclude_plan(self, food_counts: dict[int, int]):
+        """
+        No-good cut for the last `apply`: later solves must pick at least one food outside `food_counts`.
+        The next `apply` drops the cuts again.
+        """
+        name = f"NoGood_{sum(1 for name in self._problem.constraints if name.startswith('NoGood_'))}"
+        other_foods = lpSum(x_var for food_id, x_var in self._x_vars.items() if food_id not in food_counts)
+        self._problem.constraints[name] = LpConstraint(other_foods, LpConstraintGE, name, 1)
+
+    def _apply_food_bounds(self, max_food_repeat: int | None, excluded_food_ids: frozenset[int],
+                           included_foods: tuple[IncludedFood, ...], prune_dominated: bool = True):
+        capacities = self._capacities(max_food_repeat, excluded_food_ids, included_foods)
+        self._lower_bounds = self._min_counts(excluded_food_ids, included_foods)
+        if prune_dominated:
+            dominated = find_dominated_foods(self._prices, self._nutrients, self._min_values, self._max_values,
+                                             capacities)
+            # A dominated food is still as good as any other once it has to be in the plan anyway
+            dominated &= self._lower_bounds == 0
+        else:
+            dominated = np.zeros(len(self._x_vars), dtype=bool)
+
+        self._upper_bounds = np.where(dominated, 0, capacities)
+        for x_var, lower_bound, upper_bound in zip(self._x_vars.values(), self._lower_bounds, self._upper_bounds):
+            x_var.lowBound = int(lower_bound)
+            x_var.upBound = _to_up_bound(upper_bound)
+
+        self._pruned_food_count = int(np.count_nonzero(dominated & (capacities > 0)))
+        PERF_LOGGER.info(f"✂️ Pruned {self._pruned_food_count} dominated and "
+                         f"merged {len(self._foods) - len(self._x_vars)} duplicate foods, "
+                         f"{int(np.count_nonzero(~dominated & (capacities > 0)))} of {len(self._foods)} left")
+
+    def find_infeasibility(self, nutrition_constraints: NutritionalConstraints, max_food_repeat: int = None,
+                           excluded_food_ids: frozenset[int] = frozenset(),
+                           included_foods: tuple[IncludedFood, ...] = ()) -> Infeasibility | None:
+        """Reject requests the menu obviously can't satisfy without patching or solving the model."""
+        for included in included_foods:
+            if included.min_count and (included.food_id not in self._variable_index
+                                       or included.food_id in excluded_food_ids):
+                return Infeasibility("included_foods", f"Included food {included.food_id} is not on the menu "
+                                                       f"or is blacklisted.")
+
+        return find_infeasibility(self._nutrients, self._capacities(max_food_repeat, excluded_food_ids, included_foods),
+                                  *nutrition_constraints.bounds(), list(NUTRIENTS),
+                                  self._min_counts(excluded_food_ids, included_foods))
+
+    def find_proven_plan(self, nutrition_constraints: NutritionalConstraints, max_food_repeat: int = None,
+                         excluded_food_ids: frozenset[int] = frozenset()) -> dict[int, int] | None:
+        """Food counts (like `food_counts`) of a plan proven optimal by the heuristic, None to fall back to the ILP."""
+        counts = find_proven_optimal_counts(self._prices, self._nutrients,
+                                            self._capacities(max_food_repeat, excluded_food_ids),
+                                            *nutrition_constraints.bounds())
+        if counts is None:
+            return None
+
+        return {food_id: int(count) for food_id, count in zip(self._x_vars, counts) if count > 0}
+
+    def _capacities(self, max_food_repeat: int | None, excluded_food_ids: frozenset[int],
+                    included_foods: tuple[IncludedFood, ...] = ()) -> np.ndarray:
+        """Portion limit of each variable, 0 when unavailable and inf when unlimited."""
+        available = np.array([sum(1 for food_id in food_ids if food_id not in excluded_food_ids)
+                              for food_ids in self._duplicates.values()], dtype=float)
+        capacities = available * max_food_repeat if max_food_repeat is not None else np.where(available > 0, np.inf, 0)
+        # Groups with a food limited on its own add up the limits of their members
+        own_limits = {included.food_id: included.max_count for included in included_foods
+                      if included.max_count is not None and included.food_id in self._variable_index}
+        default_limit = max_food_repeat if max_food_repeat is not None else np.inf
+        for i in {self._variable_index[food_id] for food_id in own_limits}:
+            capacities[i] = sum(own_limits.get(food_id, default_limit) for food_id in self._food_groups[i]
+                                if food_id not in excluded_food_ids)
+
+        return capacities
+
+    def _min_counts(self, excluded_food_ids: frozenset[int], included_foods: tuple[IncludedFood, ...]) -> np.ndarray:
+        """Portions each variable must have in the plan, summed over the included foods it stands for."""
+        min_counts = np.zeros(len(self._x_vars))
+        for included in included_foods:
+            i = self._variable_index.get(included.food_id)
+            if i is not None and included.food_id not in excluded_food_ids:
+                min_counts[i] += included.min_count
+
+        return min_counts
+
+    def food_counts(self) -> dict[int, int]:
+        return {
+            food_id: int(round(x_var.varValue))
+            for food_id, x_var in self._x_vars.items() if x_var.varValue and x_var.varValue > 0.5
+        }
+
+    def _create_nutrient_constraints(self) -> list[tuple[str, LpConstraint]]:
+        """Min and max constraint of every nutrient, interleaved like the flattened (nutrient, bound) vector."""
+        constraints = []
+        for attr, label in NUTRIENTS.items():
+            total_nutrient = self._nutrient_totals[attr]
+            constraints.append((f"Min{label}", LpConstraint(total_nutrient, LpConstraintGE, f"Min{label}", 0)))
+            constraints.append((f"Max{label}", LpConstraint(total_nutrient, LpConstraintLE, f"Max{label}", 0)))
+
+        return constraints
+
+
+def column_sum(x_vars: list[LpVariable], coefficients: np.ndarray) -> LpAffineExpression:
+    """Sum of the variables weighted by one matrix column, foods without the nutrient are left out."""
+    return LpAffineExpression((x_var, coefficient) for x_var, coefficient in zip(x_vars, coefficients.tolist())
+                              if coefficient)
+
+
+def _to_up_bound(capacity: float) -> int | None:
+    return None if np.isinf(capacity) else int(capacity)
+
+
+def _to_rhs(bound: float) -> int | float:
+    return int(bound) if bound.is_integer() else bound
+
+
+_MEAL_PLAN_MODELS: TTLCache = TTLCache(maxsize=SETTINGS.LARGE_CACHE_SIZE, ttl=SETTINGS.DEFAULT_CACHE_TTL)
+# Concurrent solves share the cache, and cold requests for one menu must not each compile their own model
+_MEAL_PLAN_MODELS_LOCK = threading.Lock()
+
+
+@benchmark
+def get_meal_plan_model(target_date: date, food_vendor: FoodVendorType, foods: list[Food]) -> MealPlanModel:
+    """Return the compiled model of the menu, rebuilding it only when the menu itself was reloaded."""
+    with _MEAL_PLAN_MODELS_LOCK:
+        model = _MEAL_PLAN_MODELS.get((target_date, food_vendor))
+        if model is None or model.foods is not foods:
+            model = MealPlanModel(foods)
+            _MEAL_PLAN_MODELS[(target_date, food_vendor)] = model
+
+    return model
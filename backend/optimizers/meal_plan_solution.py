@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+
+from optimizers.solve_stats import SolveStats
+from optimizers.solver_path import SolverPath
+
+
+@dataclass(frozen=True)
+class MealPlanSolution:
+    """
+    Portions per food id chosen by the solver, empty when no plan was found.
+
+    `is_optimal` is False when the solver ran out of its time budget and returned its best plan so far,
+    `optimality_gap` then bounds how much cheaper the optimal plan can be, relative to this one.
+    It is also False when the solver ended without a plan, whatever its status.
+    `stats` describes the solver run behind the plan, None when no solver ran.
+    """
+    food_counts: dict[int, int] = field(default_factory=dict)
+    is_optimal: bool = True
+    optimality_gap: float = 0.0
+    solver_path: SolverPath = SolverPath.ILP
+    stats: SolveStats | None = field(default=None, compare=False)
@@ -0,0 +1,40 @@
+import secrets
+import threading
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+
+from model.meal_plan_request import MealPlanRequest
+from optimizers.meal_plan_solution import MealPlanSolution
+from settings import SETTINGS
+
+
+@dataclass(frozen=True)
+class PlanSession:
+    """What a swap needs to re-optimize a plan handed out earlier."""
+    meal_plan_request: MealPlanRequest
+    menu_version: str
+    swapped_food_ids: frozenset[int]
+    solution: MealPlanSolution
+
+
+class PlanSessions:
+    """Plans handed out with a token, kept for a while so follow-up swaps can start from them."""
+
+    def __init__(self, max_size: int, ttl: int):
+        self._sessions: TTLCache = TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def create(self, plan_session: PlanSession) -> str:
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._sessions[token] = plan_session
+
+        return token
+
+    def get(self, token: str) -> PlanSession | None:
+        with self._lock:
+            return self._sessions.get(token)
+
+
+PLAN_SESSIONS = PlanSessions(SETTINGS.PLAN_SESSION_CACHE_SIZE, SETTINGS.SHORT_CACHE_TTL)
@@ -0,0 +1,81 @@
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan_objective import MealPlanObjective
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.request_fingerprint import normalize_blacklist
+from settings import SETTINGS
+
+
+@dataclass(frozen=True)
+class RequestShape:
+    """The constraints of a meal plan request, without the date and vendor it was asked for."""
+    nutritional_constraints: NutritionalConstraints
+    food_blacklist: tuple[str, ...] = ()
+    max_food_repeat: int | None = None
+    objective: MealPlanObjective = MealPlanObjective.MIN_PRICE
+    max_price: int | None = None
+
+    @classmethod
+    def from_request(cls, meal_plan_request: MealPlanRequest) -> "RequestShape":
+        return cls(nutritional_constraints=meal_plan_request.nutritional_constraints,
+                   food_blacklist=normalize_blacklist(meal_plan_request.food_blacklist),
+                   max_food_repeat=meal_plan_request.max_food_repeat,
+                   objective=meal_plan_request.objective,
+                   max_price=meal_plan_request.max_price)
+
+    def for_menu(self, plan_date: date, food_vendor: FoodVendorType) -> MealPlanRequest:
+        return MealPlanRequest(date=plan_date, food_vendor=food_vendor,
+                               nutritional_constraints=self.nutritional_constraints,
+                               food_blacklist=list(self.food_blacklist), max_food_repeat=self.max_food_repeat,
+                               objective=self.objective, max_price=self.max_price)
+
+
+# The frontend's default and reset forms, and the perftest.py payload
+PRESET_REQUEST_SHAPES = [
+    RequestShape(NutritionalConstraints(min_calories=2300, max_calories=2700, min_protein=200, max_fat=100)),
+    RequestShape(NutritionalConstraints(min_calories=2300, max_calories=2700)),
+    RequestShape(NutritionalConstraints(min_calories=2300, max_calories=2700, min_protein=180, max_fat=100),
+                 food_blacklist=("hal", "uborka")),
+]
+
+
+class PopularRequests:
+    """
+    Counts how often each request shape was asked for recently, so the popular ones can be solved ahead of time.
+
+    Counts are halved on every `decay()`, shapes nobody asks for anymore fade out. At most `max_size`
+    shapes are tracked, the least requested ones are dropped first.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._counts: Counter[RequestShape] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, meal_plan_request: MealPlanRequest):
+        if meal_plan_request.included_foods:
+            # Food ids belong to one date's menu, the shape couldn't be solved for another one
+            return
+
+        shape = RequestShape.from_request(meal_plan_request)
+        with self._lock:
+            self._counts[shape] += 1
+            if len(self._counts) > self._max_size:
+                least_requested, _ = min(self._counts.items(), key=lambda item: item[1])
+                del self._counts[least_requested]
+
+    def most_common(self, n: int) -> list[RequestShape]:
+        with self._lock:
+            return [shape for shape, _ in self._counts.most_common(n)]
+
+    def decay(self):
+        with self._lock:
+            self._counts = Counter({shape: count // 2 for shape, count in self._counts.items() if count > 1})
+
+
+POPULAR_REQUESTS = PopularRequests(SETTINGS.LARGE_CACHE_SIZE)
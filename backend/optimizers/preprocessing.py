@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from model.food import Food
+from model.nutrients import nutrient_values
+
+
+def group_duplicate_foods(foods: list[Food]) -> dict[int, list[int]]:
+    """
+    Group foods with identical price and macros, which the ILP cannot tell apart.
+
+    Returns representative food id -> ids of all foods in its group (representative first).
+    """
+    groups: dict[tuple, list[int]] = {}
+    for food in foods:
+        key = (food.price, *nutrient_values(food))
+        groups.setdefault(key, []).append(food.food_id)
+
+    return {food_ids[0]: food_ids for food_ids in groups.values()}
+
+
+def find_dominated_foods(prices: np.ndarray, nutrients: np.ndarray, min_values: np.ndarray,
+                         max_values: np.ndarray, capacities: np.ndarray) -> np.ndarray:
+    """
+    Mask of foods that an optimal plan never needs.
+
+    Food b dominates food a when it is no more expensive, has at least as much of every nutrient
+    with a minimum and at most as much of every nutrient with a maximum (ties broken by index).
+    Swapping a portion of a for b keeps a plan feasible and no more expensive, unless every
+    dominator of a is already at its capacity (max food repeat). So a is only dropped when its
+    dominators can absorb the largest plan the max constraints allow.
+
+    `min_values`/`max_values` hold one bound per nutrient column, NaN when unconstrained.
+    `capacities` holds the portion limit of each food, 0 when unavailable and inf when unlimited.
+    """
+    n = len(prices)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    has_min = ~np.isnan(min_values)
+    has_max = ~np.isnan(max_values)
+    # [a, b] compares dominated candidate a (rows) with dominator candidate b (columns)
+    price_diff = prices[:, None] - prices[None, :]
+    min_diff = nutrients[None, :, has_min] - nutrients[:, None, has_min]
+    max_diff = nutrients[:, None, has_max] - nutrients[None, :, has_max]
+
+    no_worse = (price_diff >= 0) & np.all(min_diff >= 0, axis=2) & np.all(max_diff >= 0, axis=2)
+    strictly_better = (price_diff > 0) | np.any(min_diff > 0, axis=2) | np.any(max_diff > 0, axis=2)
+    index = np.arange(n)
+    dominates = no_worse & (strictly_better | (index[None, :] < index[:, None])) & (capacities[None, :] > 0)
+    np.fill_diagonal(dominates, False)
+
+    dominator_capacity = np.where(dominates, capacities[None, :], 0).sum(axis=1)
+
+    return dominator_capacity >= _max_portions(nutrients[capacities > 0], max_values)
+
+
+def _max_portions(nutrients: np.ndarray, max_values: np.ndarray) -> float:
+    """Upper bound on the number of portions in a plan, inf when the max constraints don't imply one."""
+    max_portions = np.inf
+    for column in np.flatnonzero(~np.isnan(max_values)):
+        smallest = nutrients[:, column].min(initial=np.inf)
+        if 0 < smallest < np.inf:
+            max_portions = min(max_portions, np.floor(max_values[column] / smallest))
+
+    return max_portions
+
+
+@dataclass(frozen=True)
+class Infeasibility:
+    constraint: str
+    message: str
+
+
+def find_infeasibility(nutrients: np.ndarray, capacities: np.ndarray, min_values: np.ndarray,
+                       max_values: np.ndarray, nutrient_names: list[str],
+                       min_counts: np.ndarray = None) -> Infeasibility | None:
+    """
+    Cheap bounds-based check for constraints no plan can satisfy, None when the ILP may be feasible.
+
+    Only foods with capacity and without a single portion above a max can be part of a plan. A min
+    is unreachable when all of those at full capacity fall short of it, or when even the food with
+    the best ratio to a maxed nutrient can't reach it within that max. A max is exceeded when the
+    portions every plan must have (`min_counts`) already exceed it.
+    """
+    has_max = ~np.isnan(max_values)
+    if min_counts is not None:
+        required = min_counts @ nutrients
+        for k in np.flatnonzero(has_max & (required > max_values)):
+            return Infeasibility(f"max_{nutrient_names[k]}", f"The included foods alone exceed "
+                                                             f"max_{nutrient_names[k]} of {max_values[k]:g} "
+                                                             f"with {required[k]:g}.")
+
+    usable = (capacities > 0) & np.all(nutrients[:, has_max] <= max_values[has_max], axis=1)
+    nutrients, capacities = nutrients[usable], capacities[usable]
+
+    for k in np.flatnonzero(~np.isnan(min_values) & (min_values > 0)):
+        name, min_value = nutrient_names[k], min_values[k]
+        provides = nutrients[:, k] > 0
+
+        reachable = np.sum(capacities[provides] * nutrients[provides, k])
+        if reachable < min_value:
+            return Infeasibility(f"min_{name}", f"min_{name} of {min_value:g} can't be reached, "
+                                                f"the menu provides at most {reachable:g}.")
+
+        for j in np.flatnonzero(has_max):
+            if j == k or np.any(provides & (nutrients[:, j] == 0)):
+                continue
+
+            reachable = max_values[j] * np.max(nutrients[provides, k] / nutrients[provides, j])
+            if reachable < min_value:
+                return Infeasibility(f"min_{name}", f"min_{name} of {min_value:g} can't be reached within "
+                                                    f"max_{nutrient_names[j]} of {max_values[j]:g}, "
+                                                    f"the menu provides at most {np.floor(reachable):g}.")
+
+    return None
@@ -0,0 +1,69 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.included_food import IncludedFood
+from model.meal_plan_objective import MealPlanObjective
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+
+
+@dataclass(frozen=True)
+class RequestFingerprint:
+    """
+    Canonical cache key of a meal plan request.
+
+    Blacklist matching is case-insensitive, so the blacklist is lowercased, deduplicated and sorted, included
+    foods are sorted by id.
+    The menu itself is represented by its content version, which keeps hashing independent of the menu size.
+    """
+    date: date
+    food_vendor: FoodVendorType
+    menu_version: str
+    food_blacklist: tuple[str, ...]
+    nutritional_constraints: NutritionalConstraints
+    max_food_repeat: int | None
+    objective: MealPlanObjective = MealPlanObjective.MIN_PRICE
+    max_price: int | None = None
+    included_foods: tuple[IncludedFood, ...] = ()
+
+    @classmethod
+    def from_request(cls, meal_plan_request: MealPlanRequest, menu_version: str) -> "RequestFingerprint":
+        return cls(
+            date=meal_plan_request.date,
+            food_vendor=meal_plan_request.food_vendor,
+            menu_version=menu_version,
+            food_blacklist=normalize_blacklist(meal_plan_request.food_blacklist),
+            nutritional_constraints=meal_plan_request.nutritional_constraints,
+            max_food_repeat=meal_plan_request.max_food_repeat,
+            objective=meal_plan_request.objective,
+            max_price=meal_plan_request.max_price,
+            included_foods=tuple(sorted(meal_plan_request.included_foods, key=lambda included: included.food_id)),
+        )
+
+    def digest(self) -> str:
+        """Stable across processes and restarts, unlike `hash()`, so it can key persistent caches."""
+        fields = {
+            "date": self.date.isoformat(),
+            "food_vendor": self.food_vendor.value,
+            "menu_version": self.menu_version,
+            "food_blacklist": self.food_blacklist,
+            "nutritional_constraints": self.nutritional_constraints.model_dump(),
+            "max_food_repeat": self.max_food_repeat,
+        }
+        # Only present when set, so digests of plain price minimizing requests stay what they were
+        if self.objective != MealPlanObjective.MIN_PRICE:
+            fields["objective"] = self.objective.value
+        if self.max_price is not None:
+            fields["max_price"] = self.max_price
+        if self.included_foods:
+            fields["included_foods"] = [included.model_dump() for included in self.included_foods]
+        canonical = json.dumps(fields, sort_keys=True)
+
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def normalize_blacklist(food_blacklist: list[str]) -> tuple[str, ...]:
+    return tuple(sorted({blacklisted.lower() for blacklisted in food_blacklist}))
@@ -0,0 +1,57 @@
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class SingleFlight:
+    """Lets concurrent calls with the same key share the result of the first one instead of recomputing it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future] = {}
+        self._coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Number of calls that waited on another call's result."""
+        return self._coalesced
+
+    def run(self, key: Hashable, fn: Callable, *args, **kwargs):
+        return self.run_shared(key, fn, *args, **kwargs)[0]
+
+    def run_shared(self, key: Hashable, fn: Callable, *args, **kwargs) -> tuple[Any, bool]:
+        """Like `run`, also telling whether the result was shared from another call instead of computed by this one."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._coalesced += 1
+
+        if not is_leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+def single_flight(flights: SingleFlight, key: Callable[..., Hashable]):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return flights.run(key(*args, **kwargs), func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,76 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from database.data_access import get_cached_solution, save_cached_solution, delete_cached_solutions_before
+from database.db import ENGINE
+from model.cached_solution import CachedSolution
+from monitoring.logging import APP_LOGGER
+from monitoring.performance import benchmark
+from optimizers.meal_plan_solution import MealPlanSolution
+from optimizers.request_fingerprint import RequestFingerprint
+
+
+class SolutionStore:
+    """
+    Second-tier solution cache in the application database, so a restart doesn't start from cold solves.
+
+    Reads go through before solving, writes happen on a background thread after it. The store is only a
+    cache: database errors are logged and treated as a miss.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solution-store")
+
+    def get(self, fingerprint: RequestFingerprint) -> MealPlanSolution | None:
+        try:
+            with Session(self.engine) as session:
+                cached_solution = get_cached_solution(session, fingerprint.digest())
+        except Exception as e:
+            APP_LOGGER.warning(f"⚠️ Could not read cached solution: {e}")
+            return None
+
+        if cached_solution is None:
+            return None
+
+        return MealPlanSolution({int(food_id): count for food_id, count in cached_solution.food_counts.items()})
+
+    def put(self, fingerprint: RequestFingerprint, solution: MealPlanSolution) -> Future:
+        """Only proven optimal solutions belong here, they are read back as such."""
+        cached_solution = CachedSolution(fingerprint=fingerprint.digest(),
+                                         date=fingerprint.date,
+                                         food_vendor=fingerprint.food_vendor,
+                                         menu_version=fingerprint.menu_version,
+                                         food_counts={str(food_id): count for food_id, count in solution.food_counts.items()})
+
+        return self._writer.submit(self._save, cached_solution)
+
+    def purge_expired(self, today: date) -> int:
+        with Session(self.engine) as session:
+            return delete_cached_solutions_before(session, today)
+
+    def flush(self):
+        """Wait until every write submitted so far is done."""
+        self._writer.submit(lambda: None).result()
+
+    def shutdown(self):
+        self._writer.shutdown(wait=True)
+
+    def _save(self, cached_solution: CachedSolution):
+        try:
+            with Session(self.engine) as session:
+                save_cached_solution(session, cached_solution)
+        except Exception as e:
+            APP_LOGGER.warning(f"⚠️ Could not store cached solution: {e}")
+
+
+SOLUTION_STORE = SolutionStore(ENGINE)
+
+
+@benchmark
+def purge_expired_solutions():
+    purged = SOLUTION_STORE.purge_expired(date.today())
+    APP_LOGGER.info(f"🧹 Purged {purged} cached solutions of past dates.")
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SolveStats:
+    """Size and outcome of one solver run, see `monitoring.solve_telemetry`."""
+    status: str
+    variables: int
+    constraints: int
+    pruned_foods: int
+    # None when the solver backend doesn't report them
+    nodes: int | None
+    duration: float
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class SolverBackendType(str, Enum):
+    CBC = "cbc"
+    HIGHS = "highs"
+    BRANCH_AND_BOUND = "branch_and_bound"
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+from cachetools import cached
+from pulp import LpProblem, LpStatus, LpMaximize, LpConstraintGE, LpConstraintLE, PULP_CBC_CMD, HiGHS, \
+    LpStatusOptimal, LpStatusInfeasible, LpStatusUnbounded, LpStatusNotSolved, LpSolutionOptimal, \
+    LpSolutionIntegerFeasible
+
+from exceptions import SolverBackendUnavailableError
+from optimizers.branch_and_bound import solve_ilp, solve_lp
+from optimizers.solver_backend_type import SolverBackendType
+from optimizers.solver_profiles import SolverProfile, SOLVER_PROFILES
+from settings import SETTINGS
+
+_STATUS_CODES = {
+    "Optimal": LpStatusOptimal,
+    "Infeasible": LpStatusInfeasible,
+    "Unbounded": LpStatusUnbounded,
+    "Not Solved": LpStatusNotSolved,
+}
+
+
+class SolverBackend(ABC):
+
+    @abstractmethod
+    def solve(self, problem: LpProblem, time_limit: float | None = None, warm_start: bool = False) -> str:
+        """
+        Solve the problem in place (variable values are assigned) and return its PuLP status name.
+
+        When `time_limit` (seconds) runs out the best plan found so far is kept, the status is still
+        "Optimal" but `problem.sol_status` is LpSolutionIntegerFeasible instead of LpSolutionOptimal.
+        With `warm_start` the current variable values (see `LpVariable.setInitialValue`) are the
+        starting solution. Afterwards `explored_nodes(problem)` tells how many branch and bound nodes it took.
+        """
+        pass
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        pass
+
+
+class CbcBackend(SolverBackend):
+    """
+    CBC through PuLP: forks a solver process and exchanges the model through temp files.
+    With `capture_nodes` every solve also writes a log to read the node count from, otherwise it is None.
+    """
+
+    def __init__(self, profile: SolverProfile = SolverProfile(), capture_nodes: bool = False):
+        self.profile = profile
+        self.capture_nodes = capture_nodes
+
+    def solve(self, problem: LpProblem, time_limit: float | None = None, warm_start: bool = False) -> str:
+        if not self.capture_nodes:
+            problem.explored_nodes = None
+            return LpStatus[problem.solve(self._solver(time_limit, warm_start))]
+
+        # The node count is only reported in the solver log
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, "cbc.log")
+            status = problem.solve(self._solver(time_limit, warm_start, log_path))
+            problem.explored_nodes = _read_cbc_nodes(log_path)
+
+        return LpStatus[status]
+
+    def _solver(self, time_limit: float | None, warm_start: bool, log_path: str | None = None) -> PULP_CBC_CMD:
+        return PULP_CBC_CMD(msg=False, timeLimit=time_limit, warmStart=warm_start, logPath=log_path,
+                            threads=self.profile.threads, presolve=self.profile.presolve, cuts=self.profile.cuts,
+                            options=list(self.profile.options))
+
+    def is_available(self) -> bool:
+        return PULP_CBC_CMD(msg=False).available()
+
+
+class HighsBackend(SolverBackend):
+    """HiGHS through its in-process Python bindings (optional `highspy` dependency)."""
+
+    def solve(self, problem: LpProblem, time_limit: float | None = None, warm_start: bool = False) -> str:
+        problem.explored_nodes = None
+        return LpStatus[problem.solve(HiGHS(msg=False, timeLimit=time_limit, warmStart=warm_start))]
+
+    def is_available(self) -> bool:
+        return HiGHS(msg=False).available()
+
+
+class BranchAndBoundBackend(SolverBackend):
+    """In-process NumPy branch and bound, no external solver needed. Every variable is treated as integer."""
+
+    def solve(self, problem: LpProblem, time_limit: float | None = None, warm_start: bool = False) -> str:
+        variables = problem.variables()
+        index = {v.name: i for i, v in enumerate(variables)}
+        c, a_ub, b_ub = _to_arrays(problem, index)
+        lower = np.array([v.lowBound if v.lowBound is not None else -np.inf for v in variables], dtype=float)
+        upper = np.array([v.upBound if v.upBound is not None else np.inf for v in variables], dtype=float)
+        if np.isinf(lower).any():
+            raise ValueError("Branch and bound backend requires finite lower bounds on every variable")
+        a_ub, b_ub = _move_singleton_rows_to_bounds(a_ub, b_ub, lower, upper)
+
+        # Fixed columns (pruned or blacklisted foods) are moved to the right-hand side
+        free = upper != lower
+        start = np.array([v.varValue or 0.0 for v in variables], dtype=float)[free] if warm_start else None
+        result = solve_ilp(c[free], a_ub[:, free], b_ub - a_ub[:, ~free] @ lower[~free], lower[free], upper[free],
+                           time_limit=time_limit, incumbent=start)
+        if result.x is not None:
+            x = lower.copy()
+            x[free] = result.x
+            for variable, value in zip(variables, x):
+                variable.varValue = float(value)
+        problem.assignStatus(_STATUS_CODES[result.status],
+                             LpSolutionIntegerFeasible if result.status == "Optimal" and result.gap > 0 else None)
+        problem.explored_nodes = result.nodes
+
+        return result.status
+
+    def is_available(self) -> bool:
+        return True
+
+
+def explored_nodes(problem: LpProblem) -> int | None:
+    """Branch and bound nodes of the last solve, None when its backend doesn't report them."""
+    return getattr(problem, "explored_nodes", None)
+
+
+def _read_cbc_nodes(log_path: str) -> int | None:
+    try:
+        with open(log_path) as log:
+            match = re.search(r"Enumerated nodes:\s+(\d+)", log.read())
+    except OSError:
+        return None
+
+    return int(match.group(1)) if match else None
+
+
+def optimality_gap(problem: LpProblem) -> float:
+    """
+    Relative gap of a solved problem, 0 when proven optimal. Otherwise it is measured against the
+    LP relaxation, so it is an upper bound on the true gap.
+    """
+    if problem.sol_status == LpSolutionOptimal:
+        return 0.0
+
+    variables = problem.variables()
+    c, a_ub, b_ub = _to_arrays(problem, {v.name: i for i, v in enumerate(variables)})
+    lower = np.array([v.lowBound if v.lowBound is not None else -np.inf for v in variables], dtype=float)
+    upper = np.array([v.upBound if v.upBound is not None else np.inf for v in variables], dtype=float)
+    relaxation = solve_lp(c, a_ub, b_ub, lower, upper)
+    objective = c @ np.array([v.varValue or 0.0 for v in variables], dtype=float)
+    if relaxation.status != "Optimal" or objective == 0:
+        return 0.0
+
+    return max((objective - relaxation.objective) / abs(objective), 0.0)
+
+
+def _to_arrays(problem: LpProblem, index: dict[str, int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    c = np.zeros(len(index))
+    for variable, coefficient in problem.objective.items():
+        c[index[variable.name]] = coefficient
+    if problem.sense == LpMaximize:
+        c = -c
+
+    rows, rhs = [], []
+    for constraint in problem.constraints.values():
+        row = np.zeros(len(index))
+        for variable, coefficient in constraint.items():
+            row[index[variable.name]] = coefficient
+        bound = -constraint.constant
+        if constraint.sense != LpConstraintGE:
+            rows.append(row)
+            rhs.append(bound)
+        if constraint.sense != LpConstraintLE:
+            rows.append(-row)
+            rhs.append(-bound)
+
+    a_ub = np.array(rows).reshape(len(rows), len(index))
+    return c, a_ub, np.array(rhs, dtype=float)
+
+
+def _move_singleton_rows_to_bounds(a_ub: np.ndarray, b_ub: np.ndarray, lower: np.ndarray,
+                                   upper: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Turn rows like `x_i <= max_food_repeat` into variable bounds (in place), keeping the tableau small."""
+    singleton = np.count_nonzero(a_ub, axis=1) == 1
+    for row in np.flatnonzero(singleton):
+        column = np.flatnonzero(a_ub[row])[0]
+        bound = b_ub[row] / a_ub[row, column]
+        if a_ub[row, column] > 0:
+            upper[column] = min(upper[column], np.floor(bound + 1e-9))
+        else:
+            lower[column] = max(lower[column], np.ceil(bound - 1e-9))
+
+    return a_ub[~singleton], b_ub[~singleton]
+
+
+SOLVER_BACKENDS: dict[SolverBackendType, SolverBackend] = {
+    SolverBackendType.CBC: CbcBackend(SOLVER_PROFILES[SETTINGS.SOLVER_PROFILE], SETTINGS.SOLVER_CAPTURE_NODES),
+    SolverBackendType.HIGHS: HighsBackend(),
+    SolverBackendType.BRANCH_AND_BOUND: BranchAndBoundBackend(),
+}
+
+
+def get_solver_backend(backend_type: SolverBackendType = SETTINGS.SOLVER_BACKEND) -> SolverBackend:
+    if not is_solver_backend_available(backend_type):
+        raise SolverBackendUnavailableError(f"Solver backend '{backend_type.value}' is not available")
+
+    return SOLVER_BACKENDS[backend_type]
+
+
+@cached(cache={}, lock=threading.Lock())
+def is_solver_backend_available(backend_type: SolverBackendType) -> bool:
+    """Checked once per backend, probing CBC runs its binary, which a solve shouldn't pay for every time."""
+    return SOLVER_BACKENDS[backend_type].is_available()
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class SolverPath(str, Enum):
+    HEURISTIC = "heuristic"
+    ILP = "ilp"
@@ -0,0 +1,80 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
+from exceptions import SolverPoolBusyError
+from monitoring.logging import APP_LOGGER
+from settings import SETTINGS
+
+# Imported by the fork server once, so every worker starts with the solver stack loaded
+WARM_IMPORTS = ["numpy", "pulp", "optimizers.meal_optimizer"]
+
+
+class SolverPool:
+    """
+    Process pool the ILP solves are dispatched to, so they run in parallel on all cores instead of
+    competing for Starlette's threadpool and the GIL.
+
+    At most `size + queue_depth` solves are accepted at once, further submissions raise
+    SolverPoolBusyError instead of queueing without limit. A size of 0 disables the pool.
+    """
+
+    def __init__(self, size: int, queue_depth: int):
+        self._size = size
+        self._slots = threading.BoundedSemaphore(size + queue_depth) if size > 0 else None
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._size > 0
+
+    def start(self):
+        """Start the workers up front instead of on the first request."""
+        if self.enabled:
+            self._get_executor().submit(_warm_up).result()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise SolverPoolBusyError("Too many meal plans are being optimized, try again later")
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._size, mp_context=_create_mp_context())
+                APP_LOGGER.info(f"🧮 Started solver pool with {self._size} workers.")
+
+            return self._executor
+
+
+def _create_mp_context():
+    # Forking a threaded server is unsafe, workers are forked from a clean fork server where available
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(WARM_IMPORTS)
+    return context
+
+
+def _warm_up():
+    pass
+
+
+SOLVER_POOL = SolverPool(SETTINGS.SOLVER_POOL_SIZE, SETTINGS.SOLVER_QUEUE_DEPTH)
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class SolverProfileType(str, Enum):
+    DEFAULT = "default"
+    SINGLE_THREAD = "single_thread"
+    NO_PRESOLVE = "no_presolve"
+    NO_CUTS = "no_cuts"
+    NO_HEURISTICS = "no_heuristics"
+    SMALL_ILP = "small_ilp"
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+
+from optimizers.solver_profile_type import SolverProfileType
+
+
+@dataclass(frozen=True)
+class SolverProfile:
+    """CBC parameters, None keeps CBC's own default. `options` are passed to CBC as `-<option>`."""
+    threads: int | None = None
+    presolve: bool | None = None
+    cuts: bool | None = None
+    options: tuple[str, ...] = ()
+
+
+# Candidates of the tuning harness, python -m test.solver_tuning picks the fastest one
+SOLVER_PROFILES: dict[SolverProfileType, SolverProfile] = {
+    SolverProfileType.DEFAULT: SolverProfile(),
+    SolverProfileType.SINGLE_THREAD: SolverProfile(threads=1),
+    SolverProfileType.NO_PRESOLVE: SolverProfile(presolve=False),
+    SolverProfileType.NO_CUTS: SolverProfile(cuts=False),
+    SolverProfileType.NO_HEURISTICS: SolverProfile(options=("heuristicsOnOff off",)),
+    # Meal plans are tiny integer programs, the root LP is usually close and branching is cheaper than cutting
+    SolverProfileType.SMALL_ILP: SolverProfile(threads=1, cuts=False, options=("heuristicsOnOff off", "strategy 0")),
+}
@@ -0,0 +1,86 @@
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+from pulp import LpProblem, LpMinimize, LpInteger, LpVariable, lpSum
+
+from model.food import Food
+from model.nutrients import NUTRIENTS, nutrient_matrix
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.meal_plan_model import column_sum
+
+
+class WeeklyMealPlanModel:
+    """
+    One price minimization ILP over the menus of several dates of a vendor.
+
+    Every date gets the daily nutrient constraints and `max_food_repeat`, on top of that a dish can
+    be limited across all dates (`max_total_food_repeat`) and the whole plan can get a budget
+    (`max_total_price`). Vendors give a dish a new food id on every date, so dishes are matched by name.
+    """
+
+    def __init__(self, daily_foods: dict[date, list[Food]], nutrition_constraints: NutritionalConstraints,
+                 max_food_repeat: int = None, max_total_food_repeat: int = None, max_total_price: int = None):
+        self._problem = LpProblem("Weekly_MealPlan_Generation_ILP", LpMinimize)
+        self._x_vars = {
+            (plan_date, food.food_id): LpVariable(f"x_{plan_date:%Y%m%d}_{food.food_id}", lowBound=0,
+                                                   upBound=max_food_repeat, cat=LpInteger)
+            for plan_date, foods in daily_foods.items() for food in foods
+        }
+        total_price = lpSum(self._x_vars[plan_date, f.food_id] * f.price
+                            for plan_date, foods in daily_foods.items() for f in foods)
+        self._problem += total_price, "TotalCost"
+
+        for plan_date, foods in daily_foods.items():
+            self._add_daily_nutrient_constraints(plan_date, foods, nutrition_constraints)
+
+        if max_total_food_repeat is not None:
+            # Dish names can contain anything, so the constraints are numbered instead of named after them
+            for i, x_vars in enumerate(_group_by_dish(daily_foods, self._x_vars)):
+                if max_food_repeat is not None and len(x_vars) * max_food_repeat <= max_total_food_repeat:
+                    continue
+                self._problem += lpSum(x_vars) <= max_total_food_repeat, f"MaxDishRepeat_{i}"
+
+        if max_total_price is not None:
+            self._problem += total_price <= max_total_price, "MaxTotalPrice"
+
+    @property
+    def problem(self) -> LpProblem:
+        return self._problem
+
+    def food_counts(self) -> dict[date, dict[int, int]]:
+        daily_counts: dict[date, dict[int, int]] = defaultdict(dict)
+        for (plan_date, food_id), x_var in self._x_vars.items():
+            if x_var.varValue and x_var.varValue > 0.5:
+                daily_counts[plan_date][food_id] = int(round(x_var.varValue))
+
+        return dict(daily_counts)
+
+    def _add_daily_nutrient_constraints(self, plan_date: date, foods: list[Food],
+                                        nutrition_constraints: NutritionalConstraints):
+        x_vars = [self._x_vars[plan_date, f.food_id] for f in foods]
+        nutrients = nutrient_matrix(foods)
+        min_values, max_values = nutrition_constraints.bounds()
+        for k, label in enumerate(NUTRIENTS.values()):
+            if np.isnan(min_values[k]) and np.isnan(max_values[k]):
+                continue
+
+            total_nutrient = column_sum(x_vars, nutrients[:, k])
+            if not np.isnan(min_values[k]):
+                self._problem += total_nutrient >= min_values[k], f"Min{label}_{plan_date:%Y%m%d}"
+            if not np.isnan(max_values[k]):
+                self._problem += total_nutrient <= max_values[k], f"Max{label}_{plan_date:%Y%m%d}"
+
+
+def _group_by_dish(daily_foods: dict[date, list[Food]],
+                   x_vars: dict[tuple[date, int], LpVariable]) -> list[list[LpVariable]]:
+    dishes: dict[str, list[LpVariable]] = defaultdict(list)
+    for plan_date, foods in daily_foods.items():
+        for food in foods:
+            dishes[_dish_key(food.name)].append(x_vars[plan_date, food.food_id])
+
+    return list(dishes.values())
+
+
+def _dish_key(name: str) -> str:
+    return " ".join(name.lower().split())
@@ -1,18 +1,44 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select
 from starlette.responses import JSONResponse
 
 from constants import ONE_DAY
 from database.data_access import get_unique_dates_after, get_foods_for_given_date, filter_blacklisted_foods
 from database.db import get_session
+from exceptions import MealPlanRequestException
 from food_vendors.food_vendor import VENDOR_REGISTRY
+from food_vendors.food_vendor_type import FoodVendorType
+from model.cache_stats import CacheStats
+from model.food import Food
 from model.food_vendor_data import FoodVendorData
-from model.meal_plan import MealPlan
+from model.meal_plan import MealPlan, AlternativeMealPlan
+from model.meal_plan_batch_request import MealPlanBatchRequest
+from model.meal_plan_comparison_request import MealPlanComparisonRequest
+from model.meal_plan_group_request import MealPlanGroupRequest
 from model.meal_plan_request import MealPlanRequest
+from model.meal_plan_swap_request import MealPlanSwapRequest
+from model.meal_plan_sweep_point import MealPlanSweepPoint
+from model.meal_plan_sweep_request import MealPlanSweepRequest
+from model.meal_plan_unavailable_reason import MealPlanUnavailableReason
+from model.solve_telemetry_stats import VendorSolveStats
+from model.vendor_meal_plan import VendorMealPlan
 from monitoring.logging import APP_LOGGER
-from optimizers.meal_optimizer import solve_meal_plan_ilp
+from monitoring.solve_telemetry import SOLVE_TELEMETRY
+from optimizers.meal_optimizer import solve_meal_plan, solve_weekly_meal_plan_ilp, get_solution_cache_stats, \
+    find_meal_plan_infeasibility, solve_meal_plan_alternatives, solve_swapped_meal_plan, solve_meal_plan_sweep
+from optimizers.concurrent_solves import solve_concurrently
+from optimizers.meal_plan_model import get_meal_plan_model, MealPlanModel
+from optimizers.meal_plan_solution import MealPlanSolution
+from optimizers.plan_sessions import PLAN_SESSIONS, PlanSession
+from optimizers.popular_requests import POPULAR_REQUESTS
+from optimizers.request_fingerprint import RequestFingerprint
+from settings import SETTINGS
 
 
 class AppStatus:
@@ -22,6 +48,27 @@ class AppStatus:
 
 meal_planner = APIRouter()
 
+_NO_FEASIBLE_PLAN = MealPlanUnavailableReason(code="no_feasible_plan",
+                                              message="No combination of the menu's foods meets the constraints.")
+_JOINT_LIMITS_UNREACHABLE = MealPlanUnavailableReason(
+    code="no_feasible_plan",
+    message="No plans meet the constraints of every date together with the limits over all dates.")
+
+# Solving routes wait for their solves here instead of in Starlette's threadpool, which the cheap routes and the
+# session dependency share. Sized to the solves the solver pool admits, more are rejected with 503 anyway.
+_SOLVE_THREADS = ThreadPoolExecutor(max_workers=SETTINGS.SOLVER_POOL_SIZE + SETTINGS.SOLVER_QUEUE_DEPTH,
+                                    thread_name_prefix="solve")
+
+
+def _solving_route(route):
+    """Turn a blocking route into an async one awaiting it on `_SOLVE_THREADS`."""
+    @functools.wraps(route)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(_SOLVE_THREADS,
+                                                                functools.partial(route, *args, **kwargs))
+
+    return wrapper
+
 
 @meal_planner.get("/dates")
 def get_available_dates(session: Session = Depends(get_session)) -> list[str]:
@@ -47,29 +94,309 @@ def get_vendor_data(session: Session = Depends(get_session)) -> JSONResponse:
 
 
 @meal_planner.post("/meal-plan", response_model=MealPlan)
+@_solving_route
 def generate_meal_plan(meal_plan_request: MealPlanRequest,
+                       alternatives: int = Query(0, ge=0, le=SETTINGS.MEAL_PLAN_MAX_ALTERNATIVES),
                        session: Session = Depends(get_session)) -> MealPlan:
     # Basic date validation - prevent past date requests
     if meal_plan_request.date < date.today():
         raise HTTPException(status_code=400, detail="Cannot generate meal plan for past dates")
-    
+
+    POPULAR_REQUESTS.record(meal_plan_request)
+    food_selection, model = _load_menu(session, meal_plan_request)
+
+    if not food_selection:
+        APP_LOGGER.warning(f"No food selection available for {meal_plan_request.date} from {meal_plan_request.food_vendor}")
+        return _unavailable_meal_plan(meal_plan_request, _empty_selection_reason(session, meal_plan_request))
+
+    return _solve_meal_plan(meal_plan_request, food_selection, model, alternatives=alternatives)
+
+
+@meal_planner.post("/meal-plan/swap", response_model=MealPlan)
+@_solving_route
+def swap_meal_plan_food(swap_request: MealPlanSwapRequest, session: Session = Depends(get_session)) -> MealPlan:
+    plan_session = PLAN_SESSIONS.get(swap_request.plan_token)
+    if plan_session is None:
+        raise HTTPException(status_code=404, detail="Meal plan expired, generate a new one")
+
+    meal_plan_request = plan_session.meal_plan_request
+    food_selection, model = _load_menu(session, meal_plan_request)
+    if model is None or model.menu_version != plan_session.menu_version:
+        raise HTTPException(status_code=409, detail="The menu changed since the meal plan was generated")
+
+    planned_food_ids = {food_id for representative in plan_session.solution.food_counts
+                        for food_id in model.duplicates[representative]}
+    if swap_request.food_id not in planned_food_ids:
+        raise MealPlanRequestException("The food is not part of the meal plan", "food_not_in_plan", "food_id")
+
+    swapped_food_ids = plan_session.swapped_food_ids | {swap_request.food_id}
+    food_selection = [f for f in food_selection if f.food_id not in swapped_food_ids]
+    fingerprint = RequestFingerprint.from_request(meal_plan_request, model.menu_version)
+    excluded_food_ids = frozenset(f.food_id for f in model.foods) - {f.food_id for f in food_selection}
+    infeasibility = model.find_infeasibility(meal_plan_request.nutritional_constraints,
+                                             meal_plan_request.max_food_repeat, excluded_food_ids,
+                                             fingerprint.included_foods)
+    if infeasibility is not None:
+        raise MealPlanRequestException(infeasibility.message, f"unreachable_{infeasibility.constraint}",
+                                       infeasibility.constraint)
+
+    solution = solve_swapped_meal_plan(fingerprint, model, food_selection, plan_session.solution)
+
+    return _to_meal_plan(meal_plan_request, food_selection, model, solution, swapped_food_ids)
+
+
+@meal_planner.post("/meal-plans/sweep", response_model=list[MealPlanSweepPoint])
+@_solving_route
+def sweep_meal_plans(sweep_request: MealPlanSweepRequest,
+                     session: Session = Depends(get_session)) -> list[MealPlanSweepPoint]:
+    if sweep_request.date < date.today():
+        raise HTTPException(status_code=400, detail="Cannot generate meal plan for past dates")
+
+    values = sweep_request.values()
+    meal_plan_requests = [sweep_request.for_value(value) for value in values]
+    food_selection, model = _load_menu(session, meal_plan_requests[0])
+    if not food_selection:
+        return []
+
+    fingerprints = tuple(RequestFingerprint.from_request(r, model.menu_version) for r in meal_plan_requests)
+    solutions = solve_meal_plan_sweep(fingerprints, model, food_selection)
+
+    return [MealPlanSweepPoint(value=value, meal_plan=_to_meal_plan(meal_plan_request, food_selection, model, solution))
+            for value, meal_plan_request, solution in zip(values, meal_plan_requests, solutions)]
+
+
+@meal_planner.post("/meal-plans/batch", response_model=list[MealPlan])
+@_solving_route
+def generate_meal_plans(batch_request: MealPlanBatchRequest,
+                        session: Session = Depends(get_session)) -> list[MealPlan]:
+    plan_dates = batch_request.plan_dates()
+    if plan_dates[0] < date.today():
+        raise HTTPException(status_code=400, detail="Cannot generate meal plan for past dates")
+
+    def load(plan_date: date) -> tuple[list[Food], MealPlanModel | None, MealPlanUnavailableReason | None]:
+        food_selection, model = _load_menu(session, batch_request.for_date(plan_date))
+        if not food_selection:
+            return food_selection, model, _empty_selection_reason(session, batch_request.for_date(plan_date))
+
+        return food_selection, model, None
+
+    if batch_request.is_joint:
+        menus = {plan_date: load(plan_date) for plan_date in plan_dates}
+        return _solve_joint_meal_plan(batch_request,
+                                      {plan_date: (food_selection, model)
+                                       for plan_date, (food_selection, model, _) in menus.items()},
+                                      {plan_date: reason for plan_date, (_, _, reason) in menus.items() if reason})
+
+    def solve(plan_date: date, menu: tuple[list[Food], MealPlanModel | None, MealPlanUnavailableReason | None]
+              ) -> MealPlan:
+        food_selection, model, empty_menu_reason = menu
+        if not food_selection:
+            return _unavailable_meal_plan(batch_request.for_date(plan_date), empty_menu_reason)
+
+        return _solve_meal_plan(batch_request.for_date(plan_date), food_selection, model, reject_infeasible=False)
+
+    return solve_concurrently(plan_dates, load, solve, max_workers=len(plan_dates))
+
+
+@meal_planner.post("/meal-plans/group", response_model=list[MealPlan])
+@_solving_route
+def generate_group_meal_plans(group_request: MealPlanGroupRequest,
+                              session: Session = Depends(get_session)) -> list[MealPlan]:
+    if group_request.date < date.today():
+        raise HTTPException(status_code=400, detail="Cannot generate meal plan for past dates")
+
+    meal_plan_requests = [group_request.for_member(constraints) for constraints in group_request.members]
+    # The members share the menu and its compiled model, they only differ in the bounds patched on it
+    food_selection, model = _load_menu(session, meal_plan_requests[0])
+    if not food_selection:
+        reason = _empty_selection_reason(session, meal_plan_requests[0])
+        return [_unavailable_meal_plan(meal_plan_request, reason) for meal_plan_request in meal_plan_requests]
+
+    # The group orders together, so a member without a plan fails the whole request instead of a plan of price 0
+    # slipping under the budget
+    fingerprints = [RequestFingerprint.from_request(r, model.menu_version) for r in meal_plan_requests]
+    for member, fingerprint in enumerate(fingerprints, start=1):
+        infeasibility = find_meal_plan_infeasibility(fingerprint, model, food_selection)
+        if infeasibility is not None:
+            raise MealPlanRequestException(f"Member {member}: {infeasibility.message}",
+                                           f"unreachable_{infeasibility.constraint}", "members")
+
+    def solve(meal_plan_request: MealPlanRequest, fingerprint: RequestFingerprint) -> MealPlan:
+        return _to_meal_plan(meal_plan_request, food_selection, model,
+                             solve_meal_plan(fingerprint, model, food_selection))
+
+    # The members share one compiled model, which solves in-process one member at a time, so only the solver
+    # pool's workers, each compiling its own copy, solve members in parallel
+    max_workers = max(min(len(meal_plan_requests), SETTINGS.SOLVER_POOL_SIZE), 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        meal_plans = list(executor.map(solve, meal_plan_requests, fingerprints))
+
+    for member, meal_plan in enumerate(meal_plans, start=1):
+        if not meal_plan.foods:
+            raise MealPlanRequestException(f"Member {member}: {_NO_FEASIBLE_PLAN.message}", _NO_FEASIBLE_PLAN.code,
+                                           "members")
+
+    # The budget is checked after solving, not modelled jointly: when every plan is proven the cheapest for its
+    # member, their sum is the cheapest total of the group and no other split of the budget fits
+    total_price = sum(meal_plan.total_price for meal_plan in meal_plans)
+    if group_request.max_total_price is not None and total_price > group_request.max_total_price:
+        if all(meal_plan.is_optimal for meal_plan in meal_plans):
+            raise MealPlanRequestException(f"The cheapest plans of the group cost {total_price} together, "
+                                           f"more than max_total_price of {group_request.max_total_price}.",
+                                           "unreachable_max_total_price", "max_total_price")
+        raise MealPlanRequestException(f"The plans of the group cost {total_price} together, more than "
+                                       f"max_total_price of {group_request.max_total_price}. The time budget ran "
+                                       f"out before every plan was proven the cheapest, cheaper ones may fit.",
+                                       "unproven_max_total_price", "max_total_price")
+
+    return meal_plans
+
+
+@meal_planner.post("/meal-plans/compare", response_model=list[VendorMealPlan])
+@_solving_route
+def compare_meal_plans(comparison_request: MealPlanComparisonRequest,
+                       session: Session = Depends(get_session)) -> list[VendorMealPlan]:
+    if comparison_request.date < date.today():
+        raise HTTPException(status_code=400, detail="Cannot generate meal plan for past dates")
+
+    def load(vendor: FoodVendorType) -> tuple[list[Food], MealPlanModel | None]:
+        return _load_menu(session, comparison_request.for_vendor(vendor))
+
+    def solve(vendor: FoodVendorType, menu: tuple[list[Food], MealPlanModel | None]) -> VendorMealPlan | None:
+        food_selection, model = menu
+        if not food_selection:
+            return None
+
+        start_time = time.perf_counter()
+        meal_plan = _solve_meal_plan(comparison_request.for_vendor(vendor), food_selection, model,
+                                     reject_infeasible=False)
+        solve_time = time.perf_counter() - start_time
+
+        return VendorMealPlan(food_vendor=vendor, meal_plan=meal_plan, solve_time_ms=round(solve_time * 1000, 2))
+
+    vendor_meal_plans = [vendor_meal_plan for vendor_meal_plan in solve_concurrently(
+        list(VENDOR_REGISTRY), load, solve, max_workers=len(VENDOR_REGISTRY)) if vendor_meal_plan is not None]
+
+    # Cheapest first, vendors without a plan last, their price of 0 is no offer
+    return sorted(vendor_meal_plans, key=lambda p: (p.meal_plan.unavailable_reason is not None,
+                                                    p.meal_plan.total_price))
+
+
+def _solve_joint_meal_plan(batch_request: MealPlanBatchRequest,
+                           menus: dict[date, tuple[list[Food], MealPlanModel | None]],
+                           empty_menu_reasons: dict[date, MealPlanUnavailableReason]) -> list[MealPlan]:
+    # Dates that can't have a plan on their own are left out, like closed ones, instead of failing every date
+    reasons = dict(empty_menu_reasons)
+    fingerprints = {}
+    for plan_date, (food_selection, model) in menus.items():
+        if plan_date in reasons:
+            continue
+        fingerprint = RequestFingerprint.from_request(batch_request.for_date(plan_date), model.menu_version)
+        infeasibility = find_meal_plan_infeasibility(fingerprint, model, food_selection)
+        if infeasibility is not None:
+            reasons[plan_date] = MealPlanUnavailableReason.from_infeasibility(infeasibility)
+        else:
+            fingerprints[plan_date] = fingerprint
+
+    food_selections = {plan_date: menus[plan_date][0] for plan_date in fingerprints}
+    daily_solutions = solve_weekly_meal_plan_ilp(tuple(fingerprints.values()), food_selections,
+                                                 batch_request.max_total_food_repeat,
+                                                 batch_request.max_total_price) if food_selections else {}
+
+    meal_plans = []
+    for plan_date, (food_selection, _) in menus.items():
+        if plan_date in reasons:
+            meal_plans.append(_unavailable_meal_plan(batch_request.for_date(plan_date), reasons[plan_date]))
+            continue
+
+        solution = daily_solutions.get(plan_date, MealPlanSolution(is_optimal=False))
+        meal_plan = MealPlan.from_food_counts(food_selection, solution.food_counts, plan_date,
+                                              batch_request.food_vendor, is_optimal=solution.is_optimal,
+                                              optimality_gap=solution.optimality_gap)
+        if not meal_plan.foods:
+            meal_plan.unavailable_reason = _JOINT_LIMITS_UNREACHABLE
+        meal_plans.append(meal_plan)
+
+    return meal_plans
+
+
+def _load_menu(session: Session, meal_plan_request: MealPlanRequest) -> tuple[list[Food], MealPlanModel | None]:
     # Get all foods for the date/vendor (cached)
     all_foods = get_foods_for_given_date(session,
                                          meal_plan_request.date,
                                          meal_plan_request.food_vendor)
-    
+
     # Filter blacklisted foods in memory
     food_selection = filter_blacklisted_foods(all_foods, meal_plan_request.food_blacklist)
-
     if not food_selection:
-        APP_LOGGER.warning(f"No food selection available for {meal_plan_request.date} from {meal_plan_request.food_vendor}")
-        return MealPlan(foods=[])
+        return food_selection, None
+
+    # Compiled once per menu, the request only patches bounds on it
+    return food_selection, get_meal_plan_model(meal_plan_request.date, meal_plan_request.food_vendor, all_foods)
+
+
+def _solve_meal_plan(meal_plan_request: MealPlanRequest, food_selection: list[Food], model: MealPlanModel,
+                     reject_infeasible: bool = True, alternatives: int = 0) -> MealPlan:
+    fingerprint = RequestFingerprint.from_request(meal_plan_request, model.menu_version)
+
+    infeasibility = find_meal_plan_infeasibility(fingerprint, model, food_selection)
+    if infeasibility is not None:
+        if reject_infeasible:
+            raise MealPlanRequestException(infeasibility.message, f"unreachable_{infeasibility.constraint}",
+                                           infeasibility.constraint)
+        return _unavailable_meal_plan(meal_plan_request, MealPlanUnavailableReason.from_infeasibility(infeasibility))
+
+    if not alternatives:
+        return _to_meal_plan(meal_plan_request, food_selection, model,
+                             solve_meal_plan(fingerprint, model, food_selection))
+
+    best, *others = [_to_meal_plan(meal_plan_request, food_selection, model, solution)
+                     for solution in solve_meal_plan_alternatives(fingerprint, model, food_selection, alternatives)]
+    best.alternatives = [AlternativeMealPlan(meal_plan=other, cost_delta=other.total_price - best.total_price)
+                         for other in others]
+
+    return best
+
+
+def _to_meal_plan(meal_plan_request: MealPlanRequest, food_selection: list[Food], model: MealPlanModel,
+                  solution: MealPlanSolution, swapped_food_ids: frozenset[int] = frozenset()) -> MealPlan:
+    meal_plan = MealPlan.from_food_counts(food_selection, solution.food_counts, meal_plan_request.date,
+                                          meal_plan_request.food_vendor, model.duplicates,
+                                          meal_plan_request.max_food_repeat, solution.is_optimal,
+                                          solution.optimality_gap, solution.solver_path,
+                                          meal_plan_request.included_foods)
+    if meal_plan.foods:
+        meal_plan.plan_token = PLAN_SESSIONS.create(
+            PlanSession(meal_plan_request, model.menu_version, swapped_food_ids, solution))
+    else:
+        meal_plan.unavailable_reason = _NO_FEASIBLE_PLAN
+
+    return meal_plan
+
+
+def _unavailable_meal_plan(meal_plan_request: MealPlanRequest, reason: MealPlanUnavailableReason) -> MealPlan:
+    return MealPlan(foods=[], date=meal_plan_request.date, food_vendor=meal_plan_request.food_vendor,
+                    unavailable_reason=reason)
+
+
+def _empty_selection_reason(session: Session, meal_plan_request: MealPlanRequest) -> MealPlanUnavailableReason:
+    """Reason for a menu `_load_menu` found no food selection in, the menu is cached by then."""
+    if get_foods_for_given_date(session, meal_plan_request.date, meal_plan_request.food_vendor):
+        return MealPlanUnavailableReason(code="all_foods_blacklisted",
+                                         message="The food blacklist excludes every food of the menu.")
+
+    return MealPlanUnavailableReason(code="no_menu", message=f"{meal_plan_request.food_vendor.value} has no menu "
+                                                             f"for {meal_plan_request.date.isoformat()}.")
+
+
+@meal_planner.get("/cache-stats", response_model=CacheStats, tags=["Monitoring"])
+def get_cache_stats() -> CacheStats:
+    return get_solution_cache_stats()
 
-    food_counts = solve_meal_plan_ilp(food_selection, meal_plan_request.nutritional_constraints,
-                                      meal_plan_request.max_food_repeat)
 
-    return MealPlan.from_food_counts(food_selection, food_counts, meal_plan_request.date,
-                                     meal_plan_request.food_vendor)
+@meal_planner.get("/solve-stats", response_model=list[VendorSolveStats], tags=["Monitoring"])
+def get_solve_stats() -> list[VendorSolveStats]:
+    return SOLVE_TELEMETRY.summarize()
 
 
 @meal_planner.get("/health", tags=["Monitoring"])
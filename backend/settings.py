@@ -6,6 +6,8 @@ from pydantic import computed_field
 from pydantic_settings import BaseSettings
 
 from constants import ONE_DAY
+from optimizers.solver_backend_type import SolverBackendType
+from optimizers.solver_profile_type import SolverProfileType
 
 
 class RunMode(str, Enum):
@@ -31,6 +33,26 @@ class Settings(BaseSettings):
     DEFAULT_CACHE_TTL: int = 7 * ONE_DAY
     SHORT_CACHE_TTL: int = ONE_DAY
 
+    # Solver settings
+    SOLVER_BACKEND: SolverBackendType = SolverBackendType.CBC
+    SOLVER_PROFILE: SolverProfileType = SolverProfileType.DEFAULT
+    SOLVER_TIME_LIMIT: float = 2.0
+    # CBC reports its branch and bound nodes only in a log file, written per solve when enabled
+    SOLVER_CAPTURE_NODES: bool = False
+    # Cheapest plans are first searched among this many foods of the menu, 0 searches the whole menu at once
+    CANDIDATE_SUBSET_SIZE: int = 0
+    # Solves in-process by default, set to the number of worker processes to dispatch them to a solver pool
+    SOLVER_POOL_SIZE: int = 0
+    SOLVER_QUEUE_DEPTH: int = 32
+    MEAL_PLAN_BATCH_MAX_DATES: int = 14
+    MEAL_PLAN_MAX_ALTERNATIVES: int = 5
+    MEAL_PLAN_SWEEP_MAX_POINTS: int = 50
+    MEAL_PLAN_GROUP_MAX_MEMBERS: int = 10
+    PLAN_SESSION_CACHE_SIZE: int = 1000
+    PRECOMPUTE_POPULAR_REQUESTS: int = 10
+    PRECOMPUTE_CONCURRENCY: int = 2
+    SOLVE_TELEMETRY_SIZE: int = 10_000
+
     CITY_FOOD_ORDERING_URL: str = "https://rendel.cityfood.hu/"
     CITY_FOOD_API_BASE: str = "https://ca.cityfood.hu"
     CITY_FOOD_IMAGE_URL_TEMPLATE: str = "https://ca.cityfood.hu/api/v1/i?menu_item_id={food_id}&width=425&height=425"
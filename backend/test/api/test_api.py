@@ -7,9 +7,13 @@ from sqlalchemy import create_engine, StaticPool
 from sqlmodel import SQLModel, Session
 from starlette.testclient import TestClient
 
+from database.data_access import get_foods_for_given_date
 from database.db import get_session
+from exceptions import SolverPoolBusyError
 from food_vendors.food_vendor_type import FoodVendorType
 from main import app
+from optimizers.meal_plan_model import MealPlanModel
+from optimizers.meal_plan_solution import MealPlanSolution
 from routers.meal_planner import AppStatus
 from test.conftest import make_food
 
@@ -232,3 +236,407 @@ def test_create_meal_plan__returns_400_for_past_date(mock_date, forktimize_clien
 
     assert response.status_code == 400
     assert response.json() == {"detail": "Cannot generate meal plan for past dates"}
+
+
+@patch('routers.meal_planner.date')
+def test_get_cache_stats__counts_hits_of_equivalent_requests(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    before = forktimize_client.get("/cache-stats").json()
+
+    with patch.object(MealPlanModel, "find_proven_plan", return_value=None):
+        forktimize_client.post("/meal-plan", json=make_meal_request(food_blacklist=["Vagdalt", "rizs"]))
+        forktimize_client.post("/meal-plan", json=make_meal_request(food_blacklist=["RIZS", "vagdalt"]))
+
+    after = forktimize_client.get("/cache-stats").json()
+    assert after["hits"] - before["hits"] == 1
+    assert set(after) == {"hits", "misses", "size", "maxSize", "coalesced", "hitRate"}
+
+
+@patch('routers.meal_planner.date')
+def test_get_solve_stats__summarizes_requests_per_vendor(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    forktimize_client.post("/meal-plan", json=make_meal_request(nutritional_constraints={"min_calories": 1000}))
+
+    response = forktimize_client.get("/solve-stats")
+
+    assert response.status_code == 200
+    city_food = next(s for s in response.json() if s["foodVendor"] == "cityfood")
+    assert city_food["requests"] >= 1
+    assert set(city_food["durationMs"]) == {"p50", "p90", "p95", "p99", "max"}
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__returns_503_when_solver_pool_is_full(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    with patch("optimizers.meal_optimizer.SOLVER_POOL") as solver_pool, \
+            patch.object(MealPlanModel, "find_proven_plan", return_value=None):
+        solver_pool.submit.side_effect = SolverPoolBusyError("busy")
+        response = forktimize_client.post("/meal-plan", json=make_meal_request(max_food_repeat=3))
+
+    assert response.status_code == 503
+    assert response.json()["code"] == "SOLVER_BUSY"
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__reports_which_solver_path_answered(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    calories_only = forktimize_client.post("/meal-plan", json=make_meal_request(
+        nutritional_constraints={"min_calories": 1500, "max_calories": 2700}, max_food_repeat=1))
+    with patch.object(MealPlanModel, "find_proven_plan", return_value=None):
+        fallback = forktimize_client.post("/meal-plan", json=make_meal_request(
+            nutritional_constraints={"min_calories": 1500, "max_calories": 2600}, max_food_repeat=1))
+
+    assert calories_only.json()["solverPath"] == "heuristic"
+    assert fallback.json()["solverPath"] == "ilp"
+    assert calories_only.json()["totalPrice"] == 2800
+    assert fallback.json()["isOptimal"] is True
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__returns_alternatives_with_cost_delta(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    response = forktimize_client.post("/meal-plan?alternatives=2", json=make_meal_request(
+        nutritional_constraints={"min_calories": 1500, "max_calories": 2700}, max_food_repeat=1))
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["alternatives"]) == 2
+    for alternative in data["alternatives"]:
+        assert alternative["costDelta"] == alternative["mealPlan"]["totalPrice"] - data["totalPrice"]
+        assert alternative["costDelta"] >= 0
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__rejects_too_many_alternatives(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    response = forktimize_client.post("/meal-plan?alternatives=100", json=make_meal_request())
+
+    assert response.status_code == 422
+
+
+@patch('routers.meal_planner.date')
+def test_swap_meal_plan_food__reoptimizes_without_the_food(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    meal_plan = forktimize_client.post("/meal-plan", json=make_meal_request(
+        nutritional_constraints={"min_calories": 1500, "max_calories": 2700}, max_food_repeat=1)).json()
+    swapped_food_id = meal_plan["foods"][0]["foodId"]
+
+    response = forktimize_client.post("/meal-plan/swap", json={"planToken": meal_plan["planToken"],
+                                                               "foodId": swapped_food_id})
+
+    assert response.status_code == 200
+    swapped = response.json()
+    assert swapped_food_id not in [f["foodId"] for f in swapped["foods"]]
+    assert swapped["totalCalories"] >= 1500
+    assert swapped["totalPrice"] >= meal_plan["totalPrice"]
+    assert swapped["planToken"] not in (None, meal_plan["planToken"])
+
+
+@patch('routers.meal_planner.date')
+def test_swap_meal_plan_food__keeps_earlier_swaps(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    meal_plan = forktimize_client.post("/meal-plan", json=make_meal_request(
+        nutritional_constraints={"min_calories": 1000}, max_food_repeat=1)).json()
+
+    first_swap = meal_plan["foods"][0]["foodId"]
+    swapped = forktimize_client.post("/meal-plan/swap", json={"planToken": meal_plan["planToken"],
+                                                              "foodId": first_swap}).json()
+    swapped_again = forktimize_client.post("/meal-plan/swap", json={"planToken": swapped["planToken"],
+                                                                    "foodId": swapped["foods"][0]["foodId"]}).json()
+
+    assert first_swap not in [f["foodId"] for f in swapped_again["foods"]]
+
+
+def test_swap_meal_plan_food__returns_404_for_unknown_token(forktimize_client):
+    response = forktimize_client.post("/meal-plan/swap", json={"planToken": "expired", "foodId": 1})
+
+    assert response.status_code == 404
+
+
+@patch('routers.meal_planner.date')
+def test_swap_meal_plan_food__returns_422_for_food_outside_the_plan(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    meal_plan = forktimize_client.post("/meal-plan", json=make_meal_request(
+        nutritional_constraints={"min_calories": 1000}, max_food_repeat=1)).json()
+
+    response = forktimize_client.post("/meal-plan/swap", json={"planToken": meal_plan["planToken"], "foodId": -1})
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "food_not_in_plan"
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__maximizes_protein_under_max_price(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    response = forktimize_client.post("/meal-plan", json=make_meal_request(
+        nutritional_constraints={}, objective="max_protein", maxPrice=2000))
+
+    assert response.status_code == 200
+    data = response.json()
+    assert 0 < data["totalPrice"] <= 2000
+
+
+def test_create_meal_plan__requires_max_price_to_maximize_protein(forktimize_client):
+    response = forktimize_client.post("/meal-plan", json=make_meal_request(objective="max_protein"))
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "missing_max_price"
+
+
+def test_create_meal_plan__requires_lower_bound_to_minimize_fat(forktimize_client):
+    response = forktimize_client.post("/meal-plan", json=make_meal_request(nutritional_constraints={"max_fat": 80},
+                                                                           objective="min_fat"))
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "missing_lower_bound"
+
+
+@patch('routers.meal_planner.date')
+def test_sweep_meal_plans__returns_cost_curve(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    sweep_request = make_meal_request(nutritional_constraints={"min_calories": 400}, constraint="minCalories",
+                                      start=400, stop=1200, step=400)
+
+    response = forktimize_client.post("/meal-plans/sweep", json=sweep_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [point["value"] for point in data] == [400, 800, 1200]
+    assert [point["mealPlan"]["totalPrice"] for point in data] == sorted(p["mealPlan"]["totalPrice"] for p in data)
+    assert data[0]["mealPlan"]["totalPrice"] > 0
+
+
+@patch('routers.meal_planner.date')
+def test_sweep_meal_plans__rejects_unknown_constraint(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    sweep_request = make_meal_request(constraint="minVitamins", start=0, stop=10, step=5)
+
+    response = forktimize_client.post("/meal-plans/sweep", json=sweep_request)
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "invalid_sweep_constraint"
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plans_batch__returns_plan_for_every_date(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    batch_request = make_meal_request(dates=["2025-02-25", "2025-02-24", "2025-02-26"],
+                                      nutritional_constraints={"min_calories": 400})
+    del batch_request["date"]
+
+    response = forktimize_client.post("/meal-plans/batch", json=batch_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [plan["date"] for plan in data] == ["2025-02-24", "2025-02-25", "2025-02-26"]
+    assert data[0]["totalPrice"] == 800
+    assert data[1]["totalPrice"] == 800
+    assert data[2]["foods"] == []
+    assert data[2]["unavailableReason"]["code"] == "no_menu"
+    assert data[0]["unavailableReason"] is None
+
+
+@pytest.mark.parametrize("total_limits", [{}, {"maxTotalPrice": 10000}])
+@patch('routers.meal_planner.date')
+def test_create_meal_plans_batch__tells_infeasible_date_from_closed_one(mock_date, forktimize_client, total_limits):
+    mock_date.today.return_value = date(2025, 2, 23)
+    batch_request = make_meal_request(dates=["2025-02-24", "2025-02-25", "2025-02-26"], max_food_repeat=1,
+                                      nutritional_constraints={"min_calories": 1000}, **total_limits)
+    del batch_request["date"]
+
+    response = forktimize_client.post("/meal-plans/batch", json=batch_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["foods"] != []
+    assert data[1]["unavailableReason"]["code"] == "unreachable_min_calories"
+    assert data[2]["unavailableReason"]["code"] == "no_menu"
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plans_batch__accepts_date_range(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    batch_request = make_meal_request(startDate="2025-02-24", endDate="2025-02-25")
+    del batch_request["date"]
+
+    response = forktimize_client.post("/meal-plans/batch", json=batch_request)
+
+    assert response.status_code == 200
+    assert [plan["date"] for plan in response.json()] == ["2025-02-24", "2025-02-25"]
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plans_batch__returns_400_for_past_date(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 25)
+    batch_request = make_meal_request(dates=["2025-02-24", "2025-02-25"])
+    del batch_request["date"]
+
+    response = forktimize_client.post("/meal-plans/batch", json=batch_request)
+
+    assert response.status_code == 400
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plans_batch__solves_dates_jointly_with_total_limits(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    batch_request = make_meal_request(startDate="2025-02-24", endDate="2025-02-26", maxTotalPrice=1600,
+                                      maxTotalFoodRepeat=1, nutritional_constraints={"min_calories": 400})
+    del batch_request["date"]
+
+    response = forktimize_client.post("/meal-plans/batch", json=batch_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [plan["date"] for plan in data] == ["2025-02-24", "2025-02-25", "2025-02-26"]
+    assert sum(plan["totalPrice"] for plan in data) == 1600
+    assert data[2]["foods"] == []
+
+
+@patch('routers.meal_planner.date')
+def test_compare_meal_plans__ranks_vendors_with_menu_by_price(mock_date, forktimize_client, session):
+    mock_date.today.return_value = date(2025, 2, 23)
+    session.add(make_food(calories=1000, protein=100, price=1500, food_vendor=FoodVendorType.INTER_FOOD))
+    session.add(make_food(calories=2000, protein=200, price=9000, food_vendor=FoodVendorType.EFOOD))
+    comparison_request = make_meal_request(nutritional_constraints={"min_calories": 2000, "min_protein": 200})
+    del comparison_request["food_vendor"]
+
+    response = forktimize_client.post("/meal-plans/compare", json=comparison_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["foodVendor"] for p in data] == ["interfood", "cityfood", "efood"]
+    assert [p["mealPlan"]["totalPrice"] for p in data] == [3000, 4000, 9000]
+    assert all(p["solveTimeMs"] >= 0 for p in data)
+
+
+@patch('routers.meal_planner.date')
+def test_compare_meal_plans__ranks_vendor_without_plan_last_with_reason(mock_date, forktimize_client, session):
+    mock_date.today.return_value = date(2025, 2, 23)
+    # A date of its own, the menu cache still holds the other vendors' foods added for the usual one
+    plan_date = date(2025, 2, 27)
+    session.add_all([make_food(calories=800, price=1000, date=plan_date),
+                     make_food(calories=800, price=1200, date=plan_date),
+                     make_food(calories=300, price=100, date=plan_date, food_vendor=FoodVendorType.EFOOD)])
+    comparison_request = make_meal_request(date="2025-02-27", nutritional_constraints={"min_calories": 1500},
+                                           max_food_repeat=1)
+    del comparison_request["food_vendor"]
+
+    response = forktimize_client.post("/meal-plans/compare", json=comparison_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["foodVendor"] for p in data] == ["cityfood", "efood"]
+    assert data[0]["mealPlan"]["unavailableReason"] is None
+    assert data[1]["mealPlan"]["unavailableReason"]["code"] == "unreachable_min_calories"
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__returns_422_naming_unreachable_constraint(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+    meal_plan_request = make_meal_request(max_food_repeat=1,
+                                          nutritional_constraints={"min_calories": 1500, "min_protein": 250})
+
+    response = forktimize_client.post("/meal-plan", json=meal_plan_request)
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "unreachable_min_protein"
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__includes_requested_food_and_optimizes_the_rest(mock_date, forktimize_client, session):
+    mock_date.today.return_value = date(2025, 2, 23)
+    # The menu cache may hold an earlier test's food ids for the same menu content
+    menu = get_foods_for_given_date(session, date(2025, 2, 24), FoodVendorType.CITY_FOOD)
+    expensive_food = next(food for food in menu if food.price == 2000)
+
+    response = forktimize_client.post("/meal-plan", json=make_meal_request(
+        nutritional_constraints={"min_calories": 1500}, included_foods=[{"foodId": expensive_food.food_id}]))
+
+    assert response.status_code == 200
+    food_ids = [food["foodId"] for food in response.json()["foods"]]
+    assert food_ids.count(expensive_food.food_id) == 1
+    assert response.json()["totalCalories"] >= 1500
+
+
+@patch('routers.meal_planner.date')
+def test_create_meal_plan__returns_422_for_blacklisted_included_food(mock_date, forktimize_client, session):
+    mock_date.today.return_value = date(2025, 2, 23)
+    menu = get_foods_for_given_date(session, date(2025, 2, 24), FoodVendorType.CITY_FOOD)
+    food = next(food for food in menu if food.name == "Lencsefőzelék vagdalttal")
+
+    response = forktimize_client.post("/meal-plan", json=make_meal_request(
+        food_blacklist=["lencse"], included_foods=[{"foodId": food.food_id}]))
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "unreachable_included_foods"
+
+
+@patch('routers.meal_planner.date')
+def test_create_group_meal_plans__returns_plan_for_every_member_in_order(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    response = forktimize_client.post("/meal-plans/group", json={
+        "date": "2025-02-24", "foodVendor": "cityfood", "maxFoodRepeat": 1,
+        "members": [{"minCalories": 1500, "maxCalories": 2700}, {"minProtein": 150}]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert data[0]["totalCalories"] >= 1500
+    assert data[1]["totalProtein"] >= 150
+
+
+@patch('routers.meal_planner.date')
+def test_create_group_meal_plans__returns_422_naming_infeasible_member_within_budget(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    response = forktimize_client.post("/meal-plans/group", json={
+        "date": "2025-02-24", "foodVendor": "cityfood", "maxFoodRepeat": 1, "maxTotalPrice": 100000,
+        "members": [{"minCalories": 1500}, {"minProtein": 1000}]})
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "unreachable_min_protein"
+    assert response.json()["message"].startswith("Member 2:")
+
+
+@patch('routers.meal_planner.date')
+def test_create_group_meal_plans__tells_every_member_the_menu_is_missing(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    response = forktimize_client.post("/meal-plans/group", json={
+        "date": "2025-03-10", "foodVendor": "cityfood", "members": [{"minCalories": 1500}, {"minProtein": 100}]})
+
+    assert response.status_code == 200
+    assert [plan["unavailableReason"]["code"] for plan in response.json()] == ["no_menu", "no_menu"]
+
+
+@patch('routers.meal_planner.date')
+def test_create_group_meal_plans__returns_422_when_budget_is_too_small(mock_date, forktimize_client):
+    mock_date.today.return_value = date(2025, 2, 23)
+
+    response = forktimize_client.post("/meal-plans/group", json={
+        "date": "2025-02-24", "foodVendor": "cityfood", "maxTotalPrice": 3000,
+        "members": [{"minCalories": 1500}, {"minCalories": 1500}]})
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "unreachable_max_total_price"
+
+
+@patch('routers.meal_planner.date')
+def test_create_group_meal_plans__tells_budget_is_unproven_when_a_plan_was_cut_short(mock_date, forktimize_client,
+                                                                                      session):
+    mock_date.today.return_value = date(2025, 2, 23)
+    menu = get_foods_for_given_date(session, date(2025, 2, 24), FoodVendorType.CITY_FOOD)
+    expensive_food = next(food for food in menu if food.price == 2000)
+    cut_short = MealPlanSolution({expensive_food.food_id: 1}, is_optimal=False, optimality_gap=0.5)
+
+    with patch("routers.meal_planner.solve_meal_plan", return_value=cut_short):
+        response = forktimize_client.post("/meal-plans/group", json={
+            "date": "2025-02-24", "foodVendor": "cityfood", "maxTotalPrice": 3000,
+            "members": [{"minCalories": 500}, {"minCalories": 500}]})
+
+    assert response.status_code == 422
+    assert response.json()["code"] == "unproven_max_total_price"
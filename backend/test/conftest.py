@@ -4,10 +4,16 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from pydantic import BaseModel
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
 
 from food_vendors.food_vendor_type import FoodVendorType
 from food_vendors.strategies.teletal.teletal_client import TeletalClient
 from model.food import Food
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.solution_store import SOLUTION_STORE
 
 TEST_RESOURCES_DIR = Path(__file__).parent.resolve() / "resources"
 YEAR = 2025
@@ -16,6 +22,15 @@ DAY = 1
 CODE = "ZK"
 
 
+@pytest.fixture(autouse=True, scope="session")
+def solution_store_engine(tmp_path_factory):
+    """Keep the persistent solution cache of the tests out of the development database."""
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('solution_store') / 'solutions.db'}")
+    SQLModel.metadata.create_all(engine)
+    SOLUTION_STORE.engine = engine
+    yield engine
+
+
 @pytest.fixture
 def mock_teletal_client():
     def _make(
@@ -62,3 +77,12 @@ def make_food(
         fat=fat,
         price=price
     )
+
+
+def make_request(request_type: type[BaseModel] = MealPlanRequest, **overrides) -> BaseModel:
+    """A meal plan request of `request_type`, with the usual date, vendor and constraints where it has them."""
+    defaults = dict(date=datetime_date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                    nutritional_constraints=NutritionalConstraints(min_calories=2000))
+    defaults = {name: value for name, value in defaults.items() if name in request_type.model_fields}
+
+    return request_type(**(defaults | overrides))
@@ -5,7 +5,7 @@ from sqlmodel import SQLModel, create_engine, Session, select
 
 from database.data_access import get_unique_dates_after, get_foods_for_given_date, is_database_empty, \
     get_available_dates_for_vendor, has_successful_job_run, create_job_run, update_job_run, save_foods_to_db, filter_blacklisted_foods, \
-    has_recent_successful_backup
+    has_recent_successful_backup, get_menu_version
 from food_vendors.food_vendor_type import FoodVendorType
 from model.food import Food
 from model.job_run import JobRun, JobStatus, JobType, FoodDataCollectorDetails, DatabaseBackupDetails
@@ -191,6 +191,35 @@ def test_save_foods_to_db__updates_existing_foods_in_database(session):
     assert persisted_food.name == "Updated Name"
 
 
+def test_save_foods_to_db__updates_menu_version_of_changed_menu(session):
+    save_foods_to_db(session, [make_food(food_id=200, date=date(2025, 4, 7), price=1000)])
+    first_version = get_menu_version(session, date(2025, 4, 7), FoodVendorType.CITY_FOOD)
+
+    save_foods_to_db(session, [make_food(food_id=200, date=date(2025, 4, 7), price=900)])
+
+    assert first_version is not None
+    assert get_menu_version(session, date(2025, 4, 7), FoodVendorType.CITY_FOOD) != first_version
+
+
+def test_get_foods_for_given_date__returns_reingested_menu_despite_cache(session):
+    save_foods_to_db(session, [make_food(food_id=300, date=date(2025, 4, 8), price=1000)])
+    assert get_foods_for_given_date(session, date(2025, 4, 8), FoodVendorType.CITY_FOOD)[0].price == 1000
+
+    save_foods_to_db(session, [make_food(food_id=300, date=date(2025, 4, 8), price=900)])
+
+    assert get_foods_for_given_date(session, date(2025, 4, 8), FoodVendorType.CITY_FOOD)[0].price == 900
+
+
+def test_get_foods_for_given_date__looks_up_menu_version_once(session, mocker):
+    save_foods_to_db(session, [make_food(food_id=400, date=date(2025, 4, 9), price=1000)])
+    session_get = mocker.spy(session, "get")
+
+    get_foods_for_given_date(session, date(2025, 4, 9), FoodVendorType.CITY_FOOD)
+    get_foods_for_given_date(session, date(2025, 4, 9), FoodVendorType.CITY_FOOD)
+
+    assert session_get.call_count == 1
+
+
 def test_update_job_run_updates_existing_job(session):
     """Test that update_job_run successfully updates an existing job run."""
     # Create initial job run
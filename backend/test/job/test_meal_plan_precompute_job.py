@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import select, SQLModel, Session
+
+from database.data_access import save_foods_to_db
+from food_vendors.food_vendor_type import FoodVendorType
+from jobs.meal_plan_precompute_job import MealPlanPrecomputeJob
+from model.job_run import JobRun, JobStatus, JobType
+from model.nutritional_constraints import NutritionalConstraints
+from monitoring.solve_telemetry import AnswerTier
+from optimizers.meal_plan_solution import MealPlanSolution
+from optimizers.popular_requests import RequestShape
+from test.conftest import make_food
+
+
+@pytest.fixture(scope="function")
+def session():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def tomorrow(session) -> date:
+    tomorrow = date.today() + timedelta(days=1)
+    save_foods_to_db(session, [make_food(name="Precomputed Rakott krumpli", date=tomorrow, calories=800, price=900),
+                               make_food(name="Precomputed Halászlé", date=tomorrow, calories=400, price=1500)])
+    return tomorrow
+
+
+def test_run__solves_every_shape_for_upcoming_menus(session, tomorrow, mocker):
+    solve = mocker.patch("jobs.meal_plan_precompute_job.solve_meal_plan_ilp")
+    solve.return_value = (MealPlanSolution({1: 2}), AnswerTier.SOLVER)
+    shapes = [RequestShape(NutritionalConstraints(min_calories=1500)),
+              RequestShape(NutritionalConstraints(min_calories=1500), food_blacklist=("halászlé",))]
+
+    MealPlanPrecomputeJob(session, shapes, [FoodVendorType.CITY_FOOD]).run()
+
+    job_run = session.exec(select(JobRun)).one()
+    assert job_run.job_type == JobType.MEAL_PLAN_PRECOMPUTATION
+    assert job_run.status == JobStatus.SUCCESS
+    assert job_run.details == {"request_shapes": 2, "solved": 2, "skipped": 0}
+    fingerprints = [c.args[0] for c in solve.call_args_list]
+    assert {f.date for f in fingerprints} == {tomorrow}
+    assert {f.food_blacklist for f in fingerprints} == {(), ("halászlé",)}
+
+
+def test_run__skips_infeasible_shapes_without_solving(session, tomorrow, mocker):
+    solve = mocker.patch("jobs.meal_plan_precompute_job.solve_meal_plan_ilp")
+    shapes = [RequestShape(NutritionalConstraints(min_calories=1500), max_food_repeat=1)]
+
+    MealPlanPrecomputeJob(session, shapes, [FoodVendorType.CITY_FOOD]).run()
+
+    assert session.exec(select(JobRun)).one().details == {"request_shapes": 1, "solved": 0, "skipped": 1}
+    solve.assert_not_called()
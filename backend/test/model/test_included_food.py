@@ -0,0 +1,33 @@
+import pytest
+
+from exceptions import MealPlanRequestException
+from model.included_food import IncludedFood
+from test.conftest import make_request
+
+
+def test_included_food__defaults_to_at_least_one_portion():
+    included = IncludedFood.model_validate({"foodId": 7})
+
+    assert (included.min_count, included.max_count) == (1, None)
+
+
+def test_included_food__min_count_above_max_count_is_rejected():
+    with pytest.raises(MealPlanRequestException) as e:
+        IncludedFood(food_id=7, min_count=3, max_count=2)
+
+    assert e.value.error_code == "max_lower_than_min"
+
+
+def test_meal_plan_request__same_food_included_twice_is_rejected():
+    with pytest.raises(MealPlanRequestException) as e:
+        make_request(included_foods=[IncludedFood(food_id=7), IncludedFood(food_id=7, min_count=2)])
+
+    assert e.value.error_code == "duplicate_included_food"
+
+
+def test_meal_plan_request__min_count_above_max_food_repeat_is_rejected():
+    with pytest.raises(MealPlanRequestException) as e:
+        make_request(max_food_repeat=1, included_foods=[IncludedFood(food_id=7, min_count=2)])
+
+    assert e.value.error_code == "max_lower_than_min"
+    assert make_request(max_food_repeat=1, included_foods=[IncludedFood(food_id=7, min_count=2, max_count=2)])
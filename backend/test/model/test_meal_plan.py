@@ -5,6 +5,7 @@ import pytest
 from model.food import Food
 from food_vendors.food_vendor_type import FoodVendorType
 from model.food_log_entry import FoodLogEntry
+from model.included_food import IncludedFood
 from model.meal_plan import MealPlan
 
 
@@ -148,4 +149,44 @@ def test_meal_plan_from_food_counts():
 
     food_ids = [f.food_id for f in meal_plan.foods]
     assert set(food_ids).issubset({apple_id, chicken_id})
-    assert meal_plan.date == plan_date
\ No newline at end of file
+    assert meal_plan.date == plan_date
+
+def test_meal_plan_from_food_counts__spreads_merged_duplicates_over_group_members():
+    plan_date = date.today()
+    foods = [
+        Food(food_id=1, name="Soup", price=500, calories=200, protein=10, carb=20, fat=5),
+        Food(food_id=2, name="Same Soup", price=500, calories=200, protein=10, carb=20, fat=5),
+        Food(food_id=3, name="Blacklisted Soup", price=500, calories=200, protein=10, carb=20, fat=5),
+    ]
+    foods_without_blacklisted = foods[:2]
+
+    meal_plan = MealPlan.from_food_counts(foods_without_blacklisted, {3: 2}, plan_date, FoodVendorType.CITY_FOOD,
+                                          duplicates={3: [3, 1, 2]}, max_food_repeat=1)
+
+    assert sorted(f.food_id for f in meal_plan.foods) == [1, 2]
+
+
+def test_meal_plan_from_food_counts__gives_included_duplicates_their_portions_first():
+    foods = [
+        Food(food_id=1, name="Soup", price=500, calories=200, protein=10, carb=20, fat=5),
+        Food(food_id=2, name="Same Soup", price=500, calories=200, protein=10, carb=20, fat=5),
+        Food(food_id=3, name="Other Same Soup", price=500, calories=200, protein=10, carb=20, fat=5),
+    ]
+
+    included_foods = [IncludedFood(food_id=3), IncludedFood(food_id=1, max_count=1)]
+
+    meal_plan = MealPlan.from_food_counts(foods, {1: 4}, date.today(), FoodVendorType.CITY_FOOD,
+                                          duplicates={1: [1, 2, 3]}, max_food_repeat=2, included_foods=included_foods)
+
+    assert sorted(f.food_id for f in meal_plan.foods) == [1, 2, 2, 3]
+
+
+def test_meal_plan_from_food_counts__reports_optimality_gap():
+    foods = [Food(food_id=1, name="Soup", price=500, calories=200, protein=10, carb=20, fat=5)]
+
+    meal_plan = MealPlan.from_food_counts(foods, {1: 1}, date.today(), FoodVendorType.CITY_FOOD,
+                                          is_optimal=False, optimality_gap=0.05)
+
+    dumped = meal_plan.model_dump(by_alias=True)
+    assert dumped["isOptimal"] is False
+    assert dumped["optimalityGap"] == 0.05
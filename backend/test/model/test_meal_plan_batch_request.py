@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+from exceptions import MealPlanRequestException
+from model.meal_plan_batch_request import MealPlanBatchRequest
+from test.conftest import make_request
+
+
+def _make_batch_request(**overrides) -> MealPlanBatchRequest:
+    return make_request(MealPlanBatchRequest, **(dict(food_blacklist=["hal"], max_food_repeat=1) | overrides))
+
+
+def test_plan_dates__sorts_and_deduplicates_dates():
+    batch_request = _make_batch_request(dates=[date(2025, 2, 25), date(2025, 2, 24), date(2025, 2, 25)])
+
+    assert batch_request.plan_dates() == [date(2025, 2, 24), date(2025, 2, 25)]
+
+
+def test_plan_dates__expands_inclusive_range():
+    batch_request = _make_batch_request(start_date=date(2025, 2, 24), end_date=date(2025, 2, 28))
+
+    assert batch_request.plan_dates() == [date(2025, 2, d) for d in range(24, 29)]
+
+
+@pytest.mark.parametrize("dates", [
+    dict(),
+    dict(dates=[date(2025, 2, 24)], start_date=date(2025, 2, 24), end_date=date(2025, 2, 25)),
+    dict(start_date=date(2025, 2, 24)),
+    dict(start_date=date(2025, 2, 25), end_date=date(2025, 2, 24)),
+    dict(start_date=date(2025, 1, 1), end_date=date(2025, 3, 1)),
+])
+def test_validate_dates__rejects_invalid_selection(dates):
+    with pytest.raises(MealPlanRequestException):
+        _make_batch_request(**dates)
+
+
+def test_for_date__carries_over_constraints():
+    batch_request = _make_batch_request(dates=[date(2025, 2, 24)])
+
+    meal_plan_request = batch_request.for_date(date(2025, 2, 24))
+
+    assert meal_plan_request.date == date(2025, 2, 24)
+    assert meal_plan_request.nutritional_constraints == batch_request.nutritional_constraints
+    assert meal_plan_request.food_blacklist == ["hal"]
+    assert meal_plan_request.max_food_repeat == 1
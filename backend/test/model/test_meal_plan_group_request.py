@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+from exceptions import MealPlanRequestException
+from model.meal_plan_group_request import MealPlanGroupRequest
+from model.nutritional_constraints import NutritionalConstraints
+from settings import SETTINGS
+from test.conftest import make_request
+
+
+def _make_group_request(**overrides) -> MealPlanGroupRequest:
+    members = [NutritionalConstraints(min_calories=2000), NutritionalConstraints(min_protein=150)]
+    return make_request(MealPlanGroupRequest, **(dict(members=members) | overrides))
+
+
+def test_for_member__keeps_shared_fields_and_member_constraints():
+    group_request = _make_group_request(food_blacklist=["hal"], max_food_repeat=2)
+
+    meal_plan_request = group_request.for_member(group_request.members[1])
+
+    assert meal_plan_request.nutritional_constraints == NutritionalConstraints(min_protein=150)
+    assert meal_plan_request.food_blacklist == ["hal"]
+    assert meal_plan_request.max_food_repeat == 2
+    assert meal_plan_request.date == date(2025, 2, 24)
+
+
+def test_group_request__requires_a_member():
+    with pytest.raises(MealPlanRequestException) as e:
+        _make_group_request(members=[])
+
+    assert e.value.error_code == "empty_group"
+
+
+def test_group_request__rejects_too_many_members():
+    with pytest.raises(MealPlanRequestException) as e:
+        _make_group_request(members=[NutritionalConstraints(min_calories=2000)] *
+                                    (SETTINGS.MEAL_PLAN_GROUP_MAX_MEMBERS + 1))
+
+    assert e.value.error_code == "too_many_group_members"
@@ -0,0 +1,33 @@
+import pytest
+
+from exceptions import MealPlanRequestException
+from model.meal_plan_objective import MealPlanObjective
+from model.nutritional_constraints import NutritionalConstraints
+from test.conftest import make_request
+
+
+def test_meal_plan_request__max_protein_without_max_price_is_rejected():
+    with pytest.raises(MealPlanRequestException) as e:
+        make_request(objective=MealPlanObjective.MAX_PROTEIN)
+
+    assert e.value.error_code == "missing_max_price"
+
+
+@pytest.mark.parametrize("objective", [MealPlanObjective.MIN_FAT, MealPlanObjective.MIN_CALORIES])
+@pytest.mark.parametrize("constraints", [NutritionalConstraints(), NutritionalConstraints(max_fat=80),
+                                         NutritionalConstraints(min_calories=0, min_fat=0)])
+def test_meal_plan_request__minimizing_without_lower_bound_is_rejected(objective, constraints):
+    with pytest.raises(MealPlanRequestException) as e:
+        make_request(objective=objective, nutritional_constraints=constraints)
+
+    assert e.value.error_code == "missing_lower_bound"
+    assert e.value.field == "nutritional_constraints"
+
+
+@pytest.mark.parametrize("objective", [MealPlanObjective.MIN_FAT, MealPlanObjective.MIN_CALORIES])
+@pytest.mark.parametrize("constraints", [NutritionalConstraints(min_calories=1500),
+                                         NutritionalConstraints(min_protein=120),
+                                         NutritionalConstraints(min_carb=200),
+                                         NutritionalConstraints(min_fat=30)])
+def test_meal_plan_request__minimizing_with_any_lower_bound_is_accepted(objective, constraints):
+    assert make_request(objective=objective, nutritional_constraints=constraints).objective == objective
@@ -0,0 +1,49 @@
+from datetime import date
+
+import pytest
+
+from exceptions import MealPlanRequestException
+from model.meal_plan_sweep_request import MealPlanSweepRequest
+from model.nutritional_constraints import NutritionalConstraints
+from test.conftest import make_request
+
+
+def _make_sweep_request(**overrides) -> MealPlanSweepRequest:
+    sweep = dict(nutritional_constraints=NutritionalConstraints(min_calories=2000, max_protein=300),
+                 food_blacklist=["hal"], max_food_repeat=1, constraint="minProtein", start=100, stop=250, step=50)
+    return make_request(MealPlanSweepRequest, **(sweep | overrides))
+
+
+def test_values__includes_stop():
+    assert _make_sweep_request().values() == [100, 150, 200, 250]
+
+
+def test_values__ends_before_stop_when_step_overshoots():
+    assert _make_sweep_request(step=40).values() == [100, 140, 180, 220]
+
+
+def test_for_value__sets_swept_constraint_and_carries_over_the_rest():
+    meal_plan_request = _make_sweep_request().for_value(150)
+
+    assert meal_plan_request.nutritional_constraints == NutritionalConstraints(min_calories=2000, min_protein=150,
+                                                                               max_protein=300)
+    assert meal_plan_request.date == date(2025, 2, 24)
+    assert meal_plan_request.food_blacklist == ["hal"]
+    assert meal_plan_request.max_food_repeat == 1
+
+
+def test_constraint__accepts_snake_case():
+    assert _make_sweep_request(constraint="min_protein").for_value(100).nutritional_constraints.min_protein == 100
+
+
+@pytest.mark.parametrize("sweep, error_code", [
+    (dict(constraint="minVitamins"), "invalid_sweep_constraint"),
+    (dict(start=250, stop=100), "invalid_sweep_range"),
+    (dict(start=0, stop=1000, step=1), "too_many_sweep_points"),
+    (dict(stop=350), "max_lower_than_min"),
+])
+def test_validate_sweep__rejects_invalid_sweep(sweep, error_code):
+    with pytest.raises(MealPlanRequestException) as error:
+        _make_sweep_request(**sweep)
+
+    assert error.value.error_code == error_code
@@ -0,0 +1,21 @@
+import pytest
+
+from model.menu_version import compute_menu_digest
+from model.nutrients import NUTRIENTS
+from test.conftest import make_food
+
+
+def test_compute_menu_digest__ignores_order_but_not_content():
+    foods = [make_food(food_id=1, price=1000), make_food(food_id=2, price=800)]
+
+    assert compute_menu_digest(foods) == compute_menu_digest(list(reversed(foods)))
+    assert compute_menu_digest(foods) != compute_menu_digest([make_food(food_id=1, price=1000),
+                                                              make_food(food_id=2, price=900)])
+
+
+@pytest.mark.parametrize("nutrient", list(NUTRIENTS))
+def test_compute_menu_digest__changes_with_every_nutrient(nutrient):
+    food = make_food(food_id=1)
+
+    assert compute_menu_digest([food]) != compute_menu_digest([food.model_copy(
+        update={nutrient: getattr(food, nutrient) + 1})])
@@ -0,0 +1,31 @@
+import numpy as np
+
+from model.food import Food
+from model.nutrients import NUTRIENTS, nutrient_matrix
+from model.nutritional_constraints import NutritionalConstraints
+from test.conftest import make_food
+
+
+def test_nutrient_matrix__has_a_row_per_food_and_a_column_per_nutrient():
+    foods = [make_food(calories=500, protein=40, carb=60, fat=10), make_food(calories=300, protein=0, carb=20, fat=5)]
+
+    nutrients = nutrient_matrix(foods)
+
+    np.testing.assert_array_equal(nutrients, [[500, 40, 60, 10], [300, 0, 20, 5]])
+    assert nutrients.shape == (2, len(NUTRIENTS))
+
+
+def test_nutrient_matrix__keeps_its_shape_for_an_empty_menu():
+    assert nutrient_matrix([]).shape == (0, len(NUTRIENTS))
+
+
+def test_nutrients__each_has_a_food_column_and_min_max_constraints():
+    for nutrient in NUTRIENTS:
+        assert nutrient in Food.model_fields
+        assert {f"min_{nutrient}", f"max_{nutrient}"} <= NutritionalConstraints.model_fields.keys()
+
+
+def test_nutritional_constraints__every_min_max_field_is_a_nutrient():
+    bounded = {name.split("_", 1)[1] for name in NutritionalConstraints.model_fields}
+
+    assert bounded == set(NUTRIENTS)
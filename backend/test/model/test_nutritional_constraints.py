@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from exceptions import MealPlanRequestException
@@ -74,3 +75,12 @@ def test_min_macros_calories_bigger_than_max_calories():
         )
     assert e.value.error_code == "macro_calories_conflict"
     assert e.value.field == "min"
+
+
+def test_bounds__are_vectors_in_nutrient_order_with_nan_when_unconstrained():
+    constraints = NutritionalConstraints(min_calories=2000, max_calories=2500, max_fat=80)
+
+    min_values, max_values = constraints.bounds()
+
+    np.testing.assert_array_equal(min_values, [2000, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(max_values, [2500, np.nan, np.nan, 80])
@@ -0,0 +1,42 @@
+from datetime import date
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.nutritional_constraints import NutritionalConstraints
+from monitoring.solve_telemetry import SolveTelemetry, SolveRecord, AnswerTier
+
+
+def _make_record(answered_by=AnswerTier.SOLVER, duration=0.01, food_vendor=FoodVendorType.CITY_FOOD, **solver_fields):
+    if answered_by == AnswerTier.SOLVER:
+        solver_fields = dict(status="Optimal", variables=40, constraints=3, pruned_foods=10, nodes=0,
+                             optimality_gap=0.0) | solver_fields
+    return SolveRecord(date=date(2025, 2, 24), food_vendor=food_vendor,
+                       nutritional_constraints=NutritionalConstraints(min_calories=2000), max_food_repeat=None,
+                       answered_by=answered_by, duration=duration, **solver_fields)
+
+
+def test_record__keeps_only_the_latest_records():
+    telemetry = SolveTelemetry(max_size=3)
+
+    for duration in range(5):
+        telemetry.record(_make_record(duration=duration))
+
+    assert [r.duration for r in telemetry.records()] == [2, 3, 4]
+
+
+def test_summarize__groups_by_vendor_and_answer_tier():
+    telemetry = SolveTelemetry(max_size=100)
+    for duration in range(1, 101):
+        telemetry.record(_make_record(duration=duration / 1000, nodes=duration))
+    telemetry.record(_make_record(AnswerTier.MEMORY_CACHE, duration=0.0001))
+    telemetry.record(_make_record(AnswerTier.HEURISTIC, food_vendor=FoodVendorType.EFOOD))
+
+    stats = {s.food_vendor: s for s in telemetry.summarize()}
+
+    city_food = stats[FoodVendorType.CITY_FOOD]
+    assert city_food.requests == 99
+    assert city_food.answered_by == {"solver": 98, "memory_cache": 1}
+    assert city_food.solver_statuses == {"Optimal": 98}
+    assert city_food.solver_duration_ms.max == 100
+    assert city_food.nodes.p50 == 51.5
+    assert [s.duration_ms for s in city_food.slowest] == [100, 99, 98, 97, 96]
+    assert stats[FoodVendorType.EFOOD].nodes is None
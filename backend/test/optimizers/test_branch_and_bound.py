@@ -0,0 +1,88 @@
+import numpy as np
+
+from optimizers.branch_and_bound import solve_lp, solve_ilp
+
+
+def test_solve_lp__returns_fractional_optimum():
+    # min x + y  s.t.  x + 2y >= 3
+    result = solve_lp(np.array([1.0, 1.0]), np.array([[-1.0, -2.0]]), np.array([-3.0]),
+                      np.zeros(2), np.full(2, np.inf))
+
+    assert result.status == "Optimal"
+    assert result.objective == 1.5
+    np.testing.assert_allclose(result.x, [0.0, 1.5])
+
+
+def test_solve_lp__respects_variable_upper_bounds():
+    result = solve_lp(np.array([1.0, 1.0]), np.array([[-1.0, -2.0]]), np.array([-3.0]),
+                      np.zeros(2), np.array([np.inf, 1.0]))
+
+    assert result.status == "Optimal"
+    np.testing.assert_allclose(result.x, [1.0, 1.0])
+
+
+def test_solve_lp__detects_infeasibility():
+    # x <= 1 and x >= 2
+    result = solve_lp(np.array([1.0]), np.array([[1.0], [-1.0]]), np.array([1.0, -2.0]),
+                      np.zeros(1), np.full(1, np.inf))
+
+    assert result.status == "Infeasible"
+
+
+def test_solve_ilp__returns_integer_optimum():
+    # min 3x + 5y  s.t.  2x + 3y >= 7
+    result = solve_ilp(np.array([3.0, 5.0]), np.array([[-2.0, -3.0]]), np.array([-7.0]),
+                       np.zeros(2), np.full(2, np.inf))
+
+    assert result.status == "Optimal"
+    assert result.objective == 11
+    np.testing.assert_allclose(result.x, [2.0, 1.0])
+    assert result.gap == 0
+
+
+def test_solve_ilp__detects_infeasibility_without_integer_point():
+    # 2x == 1 has an LP solution but no integer one
+    result = solve_ilp(np.array([1.0]), np.array([[2.0], [-2.0]]), np.array([1.0, -1.0]),
+                       np.zeros(1), np.full(1, np.inf))
+
+    assert result.status == "Infeasible"
+
+
+def test_solve_ilp__detects_unbounded_problem():
+    result = solve_ilp(np.array([-1.0]), np.zeros((0, 1)), np.zeros(0), np.zeros(1), np.full(1, np.inf))
+
+    assert result.status == "Unbounded"
+
+
+def test_solve_ilp__matches_brute_force_on_small_knapsacks():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        c = rng.integers(1, 20, size=4).astype(float)
+        a_ub = -rng.integers(0, 10, size=(2, 4)).astype(float)
+        b_ub = -rng.integers(5, 15, size=2).astype(float)
+
+        grid = np.stack(np.meshgrid(*[np.arange(3)] * 4), axis=-1).reshape(-1, 4)
+        feasible = grid[np.all(grid @ a_ub.T <= b_ub, axis=1)]
+        result = solve_ilp(c, a_ub, b_ub, np.zeros(4), np.full(4, 2.0))
+
+        if feasible.size == 0:
+            assert result.status == "Infeasible"
+        else:
+            assert result.objective == (feasible @ c).min()
+
+
+def test_solve_ilp__starts_from_feasible_incumbent():
+    # min 3x + 5y  s.t.  2x + 3y >= 7, the incumbent (2, 1) is already optimal
+    result = solve_ilp(np.array([3.0, 5.0]), np.array([[-2.0, -3.0]]), np.array([-7.0]),
+                       np.zeros(2), np.full(2, np.inf), max_nodes=0, incumbent=np.array([2.0, 1.0]))
+
+    assert result.objective == 11
+    np.testing.assert_allclose(result.x, [2.0, 1.0])
+
+
+def test_solve_ilp__ignores_infeasible_incumbent():
+    result = solve_ilp(np.array([3.0, 5.0]), np.array([[-2.0, -3.0]]), np.array([-7.0]),
+                       np.zeros(2), np.full(2, np.inf), incumbent=np.array([1.0, 0.0]))
+
+    assert result.status == "Optimal"
+    assert result.objective == 11
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from optimizers.branch_and_bound import solve_ilp
+from optimizers.candidate_subset import rank_candidates, find_improving_foods
+
+NAN = np.nan
+
+
+def test_rank_candidates__orders_by_requirement_share_per_price():
+    prices = np.array([1000.0, 500.0, 800.0])
+    nutrients = np.array([[500, 50, 0, 0], [500, 10, 0, 0], [200, 80, 0, 0]], dtype=float)
+
+    ranking = rank_candidates(prices, nutrients, np.array([1000, 100, NAN, NAN]))
+
+    # Shares per price: 1.0 / 1000, 0.6 / 500, 1.0 / 800
+    assert list(ranking) == [2, 1, 0]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_find_improving_foods__never_rules_out_a_food_of_a_cheaper_plan(seed):
+    rng = np.random.default_rng(seed)
+    prices = rng.integers(50, 300, size=30).astype(float) * 5
+    nutrients = np.column_stack([rng.integers(200, 900, size=30), rng.integers(5, 60, size=(30, 3))]).astype(float)
+    capacities = np.full(30, 2.0)
+    min_values = np.array([2000, 120, NAN, NAN])
+    max_values = np.array([2600, NAN, NAN, 100])
+    a_ub = np.vstack([-nutrients[:, :2].T, nutrients[:, [0, 3]].T])
+    b_ub = np.array([-2000, -120, 2600, 100])
+    optimum = solve_ilp(prices, a_ub, b_ub, np.zeros(30), capacities)
+
+    improving = find_improving_foods(prices, nutrients, capacities, min_values, max_values, None,
+                                     optimum.objective + 500)
+
+    assert np.all(improving[optimum.x > 0])
+
+
+def test_find_improving_foods__rules_out_every_food_when_plan_meets_lp_bound():
+    prices = np.array([500.0, 600.0, 900.0])
+    nutrients = np.array([[500, 0, 0, 0], [500, 0, 0, 0], [500, 0, 0, 0]], dtype=float)
+
+    improving = find_improving_foods(prices, nutrients, np.full(3, np.inf), np.array([1000, NAN, NAN, NAN]),
+                                     np.full(4, NAN), None, 1000)
+
+    assert not np.any(improving)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from optimizers.branch_and_bound import solve_ilp
+from optimizers.heuristic import find_proven_optimal_counts
+
+NAN = np.nan
+
+
+def _solve_exactly(prices, nutrients, capacities, min_values, max_values) -> float | None:
+    has_min, has_max = ~np.isnan(min_values), ~np.isnan(max_values)
+    a_ub = np.vstack([-nutrients[:, has_min].T, nutrients[:, has_max].T])
+    b_ub = np.concatenate([-min_values[has_min], max_values[has_max]])
+    result = solve_ilp(prices, a_ub, b_ub, np.zeros(len(prices)), capacities)
+
+    return result.objective if result.status == "Optimal" else None
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("max_food_repeat", [1, 2, np.inf])
+def test_find_proven_optimal_counts__solves_calorie_only_requests_exactly(seed, max_food_repeat):
+    rng = np.random.default_rng(seed)
+    prices = rng.integers(50, 300, size=12).astype(float) * 5
+    nutrients = np.column_stack([rng.integers(200, 900, size=12), rng.integers(5, 60, size=(12, 3))]).astype(float)
+    capacities = np.full(12, max_food_repeat, dtype=float)
+    min_calories = float(rng.integers(500, 3000))
+    max_calories = min_calories + rng.choice([NAN, 0, 100, 600])
+    min_values = np.array([min_calories, NAN, NAN, NAN])
+    max_values = np.array([max_calories, NAN, NAN, NAN])
+
+    counts = find_proven_optimal_counts(prices, nutrients, capacities, min_values, max_values)
+
+    expected = _solve_exactly(prices, nutrients, capacities, min_values, max_values)
+    if expected is None:
+        assert counts is None
+    else:
+        assert prices @ counts == expected
+        assert np.all(counts <= capacities)
+        assert min_calories <= counts @ nutrients[:, 0] <= np.nan_to_num(max_calories, nan=np.inf)
+
+
+def test_find_proven_optimal_counts__accepts_rounding_that_meets_lp_bound():
+    prices = np.array([100.0, 300.0])
+    nutrients = np.array([[500, 10, 0, 0], [500, 50, 0, 0]], dtype=float)
+    # 2 of the first food reach both minimums at the LP bound
+    counts = find_proven_optimal_counts(prices, nutrients, np.full(2, np.inf),
+                                        np.array([1000, 20, NAN, NAN]), np.array([NAN, NAN, NAN, NAN]))
+
+    np.testing.assert_array_equal(counts, [2, 0])
+
+
+def test_find_proven_optimal_counts__gives_up_when_lp_bound_is_not_met():
+    prices = np.array([100.0, 310.0])
+    nutrients = np.array([[500, 10, 0, 0], [500, 50, 0, 0]], dtype=float)
+
+    # The cheapest plan (one of each, 410) is above the LP bound (331.25, i.e. 340 in steps of 10)
+    counts = find_proven_optimal_counts(prices, nutrients, np.full(2, np.inf),
+                                        np.array([1000, 45, NAN, NAN]), np.array([NAN, NAN, NAN, NAN]))
+
+    assert counts is None
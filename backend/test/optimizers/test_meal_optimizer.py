@@ -0,0 +1,270 @@
+from datetime import date
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan_objective import MealPlanObjective
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from monitoring.solve_telemetry import SOLVE_TELEMETRY, AnswerTier
+from optimizers.meal_optimizer import solve_meal_plan_ilp, get_solution_cache_stats, find_meal_plan_infeasibility, \
+    solve_meal_plan_alternatives, solve_swapped_meal_plan, solve_meal_plan_sweep, solve_meal_plan, \
+    clear_solution_cache
+from optimizers.meal_plan_model import MealPlanModel
+from optimizers.meal_plan_solution import MealPlanSolution
+from optimizers.request_fingerprint import RequestFingerprint
+from optimizers.solution_store import SOLUTION_STORE
+from optimizers.solver_path import SolverPath
+from optimizers.solver_pool import SolverPool
+from settings import SETTINGS
+from test.conftest import make_food
+
+
+def _solve(model: MealPlanModel, food_blacklist: list[str]) -> MealPlanSolution:
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=1000),
+                              food_blacklist=food_blacklist)
+    food_selection = [f for f in model.foods if not any(b.lower() in f.name.lower() for b in food_blacklist)]
+
+    solution, _ = solve_meal_plan_ilp(RequestFingerprint.from_request(request, model.menu_version), model,
+                                      food_selection)
+    return solution
+
+
+def test_solve_meal_plan_ilp__reuses_solution_for_equivalent_blacklist():
+    cheap = make_food(name="Rántott hal", calories=500, price=500)
+    model = MealPlanModel([cheap, make_food(name="Gulyás", calories=500, price=900)])
+    before = get_solution_cache_stats()
+
+    first = _solve(model, ["Hal", "leves"])
+    second = _solve(model, ["LEVES", "hal"])
+
+    after = get_solution_cache_stats()
+    assert first == second
+    assert cheap.food_id not in first.food_counts
+    assert after.misses - before.misses == 1
+    assert after.hits - before.hits == 1
+
+
+def test_get_solution_cache_stats__hit_rate():
+    stats = get_solution_cache_stats()
+
+    assert 0.0 <= stats.hit_rate <= 1.0
+    assert stats.max_size > 0
+
+
+def test_solve_meal_plan_ilp__reads_persisted_solution_after_restart(mocker):
+    model = MealPlanModel([make_food(name="Lecsó", calories=500, price=700)])
+    first = _solve(model, ["restart"])
+    SOLUTION_STORE.flush()
+    clear_solution_cache()
+    solver_pool = mocker.patch("optimizers.meal_optimizer.SOLVER_POOL")
+
+    assert _solve(model, ["restart"]) == first
+    solver_pool.submit.assert_not_called()
+
+
+def test_find_meal_plan_infeasibility__caches_rejection(mocker):
+    model = MealPlanModel([make_food(name="Saláta", calories=100, price=700)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=500), max_food_repeat=2)
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+
+    infeasibility = find_meal_plan_infeasibility(fingerprint, model, model.foods)
+    check = mocker.spy(model, "find_infeasibility")
+
+    assert infeasibility.constraint == "min_calories"
+    assert find_meal_plan_infeasibility(fingerprint, model, model.foods) == infeasibility
+    check.assert_not_called()
+
+
+def test_solve_meal_plan_ilp__does_not_persist_plan_cut_short_by_time_budget(mocker):
+    model = MealPlanModel([make_food(name="Főzelék", calories=500, price=600)])
+    solver_pool = mocker.patch("optimizers.meal_optimizer.SOLVER_POOL")
+    solver_pool.submit.return_value.result.return_value = MealPlanSolution({1: 2}, False, 0.1)
+    put = mocker.patch.object(SOLUTION_STORE, "put")
+
+    solution = _solve(model, ["budget"])
+
+    assert not solution.is_optimal
+    put.assert_not_called()
+
+
+def test_solve_meal_plan_ilp__neither_stores_nor_caches_solve_that_found_no_plan(mocker):
+    model = MealPlanModel([make_food(name="Kelkáposzta", calories=500, price=600)])
+    backend = mocker.patch("optimizers.meal_optimizer.get_solver_backend").return_value
+    backend.solve.return_value = "Not Solved"
+    put = mocker.patch.object(SOLUTION_STORE, "put")
+
+    first = _solve(model, ["unsolved"])
+    second = _solve(model, ["unsolved"])
+
+    assert (first.food_counts, first.is_optimal) == ({}, False)
+    assert second == first
+    assert backend.solve.call_count == 2
+    put.assert_not_called()
+
+
+def test_solve_meal_plan_sweep__solves_again_after_time_budget_ran_out(mocker):
+    model = MealPlanModel([make_food(name="Paradicsomleves", calories=500, price=400)])
+    requests = [MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                                nutritional_constraints=NutritionalConstraints(min_calories=value))
+                for value in (500, 1000)]
+    fingerprints = tuple(RequestFingerprint.from_request(r, model.menu_version) for r in requests)
+    backend = mocker.patch("optimizers.meal_optimizer.get_solver_backend").return_value
+    backend.solve.return_value = "Not Solved"
+
+    solve_meal_plan_sweep(fingerprints, model, model.foods)
+    solve_meal_plan_sweep(fingerprints, model, model.foods)
+
+    assert backend.solve.call_count == 4
+
+
+def test_solve_meal_plan_alternatives__returns_distinct_plans_cheapest_first():
+    model = MealPlanModel([make_food(name="Bableves", calories=500, price=500),
+                           make_food(name="Rakott kel", calories=500, price=600),
+                           make_food(name="Pörkölt", calories=500, price=900)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=1000), max_food_repeat=1)
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+
+    solutions = solve_meal_plan_alternatives(fingerprint, model, model.foods, 5)
+
+    prices = {f.food_id: f.price for f in model.foods}
+    assert [sum(prices[i] * n for i, n in s.food_counts.items()) for s in solutions] == [1100, 1400, 1500, 2000]
+
+
+def test_solve_meal_plan_alternatives__includes_plans_with_dominated_foods():
+    model = MealPlanModel([make_food(name="Krumplifőzelék", calories=500, protein=20, price=100),
+                           make_food(name="Sárgaborsó", calories=500, protein=20, price=110),
+                           make_food(name="Spenótfőzelék", calories=500, protein=20, price=300)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=500, max_calories=600))
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+
+    solutions = solve_meal_plan_alternatives(fingerprint, model, model.foods, 2)
+
+    assert [s.food_counts for s in solutions] == [{f.food_id: 1} for f in model.foods]
+
+
+def test_solve_meal_plan_sweep__returns_plan_for_every_point():
+    model = MealPlanModel([make_food(name="Bableves", calories=500, protein=10, price=500),
+                           make_food(name="Pörkölt", calories=500, protein=50, price=900)])
+    requests = [MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                                nutritional_constraints=NutritionalConstraints(min_calories=1000, min_protein=protein),
+                                max_food_repeat=2)
+                for protein in (0, 60, 100, 200)]
+    fingerprints = tuple(RequestFingerprint.from_request(r, model.menu_version) for r in requests)
+
+    solutions = solve_meal_plan_sweep(fingerprints, model, model.foods)
+
+    prices = {f.food_id: f.price for f in model.foods}
+    assert [sum(prices[i] * n for i, n in s.food_counts.items()) for s in solutions] == [1000, 1400, 1800, 0]
+
+
+def test_solve_meal_plan__breaks_price_ties_by_protein():
+    model = MealPlanModel([make_food(name="Rántott sajt", calories=500, protein=10, price=500),
+                           make_food(name="Lencsefőzelék", calories=500, protein=25, price=500)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=1000),
+                              objective=MealPlanObjective.MIN_PRICE_MAX_PROTEIN)
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+
+    solution = solve_meal_plan(fingerprint, model, model.foods)
+
+    assert solution.food_counts == {model.foods[1].food_id: 2}
+    assert solution.solver_path == SolverPath.ILP
+
+
+def test_solve_meal_plan__records_which_tier_answered():
+    model = MealPlanModel([make_food(name="Bableves", calories=500, protein=10, price=500),
+                           make_food(name="Pörkölt", calories=500, protein=50, price=900)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=1000, min_protein=70))
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+    SOLVE_TELEMETRY.clear()
+
+    solve_meal_plan(fingerprint, model, model.foods)
+    solve_meal_plan(fingerprint, model, model.foods)
+
+    first, second = SOLVE_TELEMETRY.records()
+    assert first.answered_by == AnswerTier.SOLVER
+    assert (first.status, first.variables, first.constraints) == ("Optimal", 2, 2)
+    assert second.answered_by == AnswerTier.MEMORY_CACHE
+    assert second.status is None
+
+
+def test_solve_meal_plan_ilp__tells_waiting_request_from_cached_one(mocker):
+    model = MealPlanModel([make_food(name="Tökfőzelék", calories=500, price=600)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=1000))
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+    mocker.patch("optimizers.meal_optimizer._IN_FLIGHT_SOLVES.run_shared",
+                 return_value=(MealPlanSolution({model.foods[0].food_id: 2}), True))
+
+    solution, answered_by = solve_meal_plan_ilp(fingerprint, model, model.foods)
+
+    assert answered_by == AnswerTier.IN_FLIGHT
+    assert solution.food_counts == {model.foods[0].food_id: 2}
+
+
+def test_solve_meal_plan_alternatives__records_solve_then_cache_hit():
+    model = MealPlanModel([make_food(name="Babgulyás", calories=500, price=500),
+                           make_food(name="Székelykáposzta", calories=500, price=700)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=1000))
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+    SOLVE_TELEMETRY.clear()
+
+    solve_meal_plan_alternatives(fingerprint, model, model.foods, 1)
+    solve_meal_plan_alternatives(fingerprint, model, model.foods, 1)
+
+    assert [r.answered_by for r in SOLVE_TELEMETRY.records()] == [AnswerTier.SOLVER, AnswerTier.MEMORY_CACHE]
+
+
+def test_solve_meal_plan_ilp__candidate_subset_finds_same_plan(monkeypatch):
+    foods = [make_food(calories=300 + 37 * i % 500, protein=10 + 13 * i % 60, price=400 + 55 * i % 1200)
+             for i in range(30)]
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD, max_food_repeat=1,
+                              nutritional_constraints=NutritionalConstraints(min_calories=2000, min_protein=150))
+    whole_menu, _ = solve_meal_plan_ilp(RequestFingerprint.from_request(request, "whole-menu"),
+                                        MealPlanModel(foods), foods)
+
+    monkeypatch.setattr(SETTINGS, "CANDIDATE_SUBSET_SIZE", 3)
+    model = MealPlanModel(foods)
+    on_candidates, _ = solve_meal_plan_ilp(RequestFingerprint.from_request(request, model.menu_version), model, foods)
+
+    prices = {f.food_id: f.price for f in foods}
+    assert (sum(prices[i] * n for i, n in on_candidates.food_counts.items())
+            == sum(prices[i] * n for i, n in whole_menu.food_counts.items()))
+
+
+def test_solve_swapped_meal_plan__replaces_swapped_out_food():
+    soup = make_food(name="Gyümölcsleves", calories=500, price=500)
+    model = MealPlanModel([soup, make_food(name="Rakott kel", calories=500, price=600),
+                           make_food(name="Pörkölt", calories=500, price=900)])
+    request = MealPlanRequest(date=date(2025, 2, 24), food_vendor=FoodVendorType.CITY_FOOD,
+                              nutritional_constraints=NutritionalConstraints(min_calories=1000), max_food_repeat=1)
+    fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+    previous, _ = solve_meal_plan_ilp(fingerprint, model, model.foods)
+
+    swapped = solve_swapped_meal_plan(fingerprint, model, model.foods[1:], previous)
+
+    assert soup.food_id in previous.food_counts
+    assert set(swapped.food_counts) == {f.food_id for f in model.foods[1:]}
+
+
+def test_solve_meal_plan_ilp__sends_menu_only_to_workers_without_its_model(mocker):
+    pool = SolverPool(size=1, queue_depth=1)
+    submit = mocker.spy(pool, "submit")
+    mocker.patch("optimizers.meal_optimizer.SOLVER_POOL", pool)
+    model = MealPlanModel([make_food(name="Tarhonya", calories=500, price=400),
+                           make_food(name="Paprikás", calories=500, price=800)])
+    try:
+        first = _solve(model, ["worker-first"])
+        second = _solve(model, ["tarhonya"])
+    finally:
+        pool.shutdown()
+
+    assert sum(first.food_counts.values()) == 2
+    assert second.food_counts == {model.foods[1].food_id: 2}
+    foods_sent = [call.args[-1] is not None for call in submit.call_args_list]
+    assert foods_sent == [False, True, False]
@@ -0,0 +1,244 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.included_food import IncludedFood
+from model.meal_plan_objective import MealPlanObjective
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.meal_plan_model import MealPlanModel, get_meal_plan_model
+from optimizers.solver_backend_type import SolverBackendType
+from optimizers.solver_backends import SOLVER_BACKENDS
+from test.conftest import make_food
+
+CBC = SOLVER_BACKENDS[SolverBackendType.CBC]
+
+
+@pytest.fixture
+def foods():
+    return [make_food(calories=500, protein=50, carb=20, fat=10, price=1000),
+            make_food(calories=600, protein=55, carb=10, fat=25, price=1200),
+            make_food(calories=400, protein=20, carb=50, fat=10, price=800),
+            make_food(calories=800, protein=70, carb=5, fat=40, price=2000),
+            make_food(calories=500, protein=15, carb=80, fat=5, price=800)]
+
+
+def _solve(model, constraints, max_food_repeat=None, excluded_food_ids=frozenset()):
+    problem = model.apply(constraints, max_food_repeat, excluded_food_ids)
+    assert CBC.solve(problem) == "Optimal"
+    return model.food_counts()
+
+
+def test_apply__only_adds_constraints_that_are_set(foods):
+    problem = MealPlanModel(foods).apply(NutritionalConstraints(min_calories=1500, max_fat=80))
+
+    assert set(problem.constraints) == {"MinCalories", "MaxFat"}
+    assert problem.constraints["MinCalories"].getLb() == 1500
+    assert problem.constraints["MaxFat"].getUb() == 80
+
+
+def test_apply__repatched_model_matches_freshly_built_model(foods):
+    model = MealPlanModel(foods)
+    _solve(model, NutritionalConstraints(min_calories=2000, min_protein=100), max_food_repeat=1,
+           excluded_food_ids=frozenset({foods[0].food_id}))
+
+    constraints = NutritionalConstraints(min_calories=1500, max_calories=2700, min_protein=200)
+
+    assert _solve(model, constraints) == _solve(MealPlanModel(foods), constraints)
+
+
+def test_apply__excluded_foods_are_never_selected(foods):
+    counts = _solve(MealPlanModel(foods), NutritionalConstraints(min_protein=150),
+                    excluded_food_ids=frozenset({foods[0].food_id}))
+
+    assert foods[0].food_id not in counts
+
+
+def test_apply__honors_max_food_repeat(foods):
+    counts = _solve(MealPlanModel(foods), NutritionalConstraints(min_calories=2000), max_food_repeat=1)
+
+    assert set(counts.values()) == {1}
+
+
+def test_get_meal_plan_model__reuses_model_until_menu_is_reloaded(foods):
+    target_date = date(2030, 1, 1)
+    model = get_meal_plan_model(target_date, FoodVendorType.CITY_FOOD, foods)
+
+    assert get_meal_plan_model(target_date, FoodVendorType.CITY_FOOD, foods) is model
+    assert get_meal_plan_model(target_date, FoodVendorType.CITY_FOOD, list(foods)) is not model
+
+
+def test_get_meal_plan_model__concurrent_cold_requests_share_one_model(foods):
+    target_date = date(2030, 1, 2)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        models = list(executor.map(lambda _: get_meal_plan_model(target_date, FoodVendorType.CITY_FOOD, foods),
+                                   range(8)))
+
+    assert all(model is models[0] for model in models)
+
+
+def test_model__merges_duplicate_foods_into_one_variable(foods):
+    duplicate = make_food(calories=500, protein=50, carb=20, fat=10, price=1000)
+    model = MealPlanModel(foods + [duplicate])
+
+    assert duplicate.food_id not in model.x_vars
+    assert model.duplicates[foods[0].food_id] == [foods[0].food_id, duplicate.food_id]
+
+
+def test_apply__merged_duplicates_share_repeat_limit(foods):
+    duplicate = make_food(calories=500, protein=50, carb=20, fat=10, price=1000)
+    model = MealPlanModel(foods + [duplicate])
+
+    model.apply(NutritionalConstraints(min_protein=100), max_food_repeat=1)
+    assert model.x_vars[foods[0].food_id].upBound == 2
+
+    model.apply(NutritionalConstraints(min_protein=100), max_food_repeat=1,
+                excluded_food_ids=frozenset({duplicate.food_id}))
+    assert model.x_vars[foods[0].food_id].upBound == 1
+
+
+def test_exclude_plan__next_solve_picks_a_food_outside_the_plan(foods):
+    model = MealPlanModel(foods)
+    problem = model.apply(NutritionalConstraints(min_calories=1500), max_food_repeat=1)
+    CBC.solve(problem)
+    best = model.food_counts()
+
+    model.exclude_plan(best)
+    assert CBC.solve(problem) == "Optimal"
+
+    assert set(model.food_counts()) - set(best)
+    assert problem.objective.value() >= sum(f.price * best.get(f.food_id, 0) for f in foods)
+
+
+def test_exclude_plan__cuts_are_dropped_by_next_apply(foods):
+    model = MealPlanModel(foods)
+    model.apply(NutritionalConstraints(min_calories=1500))
+    model.exclude_plan({foods[0].food_id: 1})
+
+    problem = model.apply(NutritionalConstraints(min_calories=1500))
+
+    assert set(problem.constraints) == {"MinCalories"}
+
+
+@pytest.fixture
+def objective_foods():
+    return [make_food(name="Rántott sajt", calories=500, protein=10, fat=30, price=500),
+            make_food(name="Csirkemell", calories=300, protein=40, fat=5, price=900),
+            make_food(name="Lencsefőzelék", calories=500, protein=25, fat=20, price=500)]
+
+
+@pytest.mark.parametrize("objective, constraints, max_price, expected", [
+    (MealPlanObjective.MAX_PROTEIN, NutritionalConstraints(), 1800, {1: 2}),
+    (MealPlanObjective.MIN_FAT, NutritionalConstraints(min_calories=1000), None, {1: 4}),
+    (MealPlanObjective.MIN_CALORIES, NutritionalConstraints(min_protein=50), None, {1: 2}),
+])
+def test_apply__swaps_in_requested_objective(objective_foods, objective, constraints, max_price, expected):
+    model = MealPlanModel(objective_foods)
+    model.apply(NutritionalConstraints(min_calories=1000))
+
+    problem = model.apply(constraints, objective=objective, max_price=max_price)
+    assert CBC.solve(problem) == "Optimal"
+
+    assert model.food_counts() == {objective_foods[i].food_id: n for i, n in expected.items()}
+
+
+def test_apply__restores_price_objective(objective_foods):
+    model = MealPlanModel(objective_foods)
+    model.apply(NutritionalConstraints(), objective=MealPlanObjective.MAX_PROTEIN, max_price=1800)
+
+    problem = model.apply(NutritionalConstraints(min_calories=1000))
+
+    assert set(problem.constraints) == {"MinCalories"}
+    assert CBC.solve(problem) == "Optimal"
+    assert problem.objective.value() == 1000
+
+
+def test_apply__max_price_makes_too_expensive_requests_infeasible(objective_foods):
+    problem = MealPlanModel(objective_foods).apply(NutritionalConstraints(min_protein=100), max_price=1500)
+
+    assert CBC.solve(problem) == "Infeasible"
+
+
+def test_apply_tie_break__keeps_price_and_maximizes_protein(objective_foods):
+    model = MealPlanModel(objective_foods)
+    problem = model.apply(NutritionalConstraints(min_calories=1000), objective=MealPlanObjective.MIN_PRICE_MAX_PROTEIN)
+    assert CBC.solve(problem) == "Optimal"
+
+    assert CBC.solve(model.apply_tie_break(), warm_start=True) == "Optimal"
+
+    assert model.food_counts() == {objective_foods[2].food_id: 2}
+
+
+def test_expand_candidates__finds_same_optimum_as_whole_menu():
+    foods = [make_food(calories=300 + 37 * i % 500, protein=10 + 13 * i % 60, fat=5 + 7 * i % 40,
+                       price=400 + 55 * i % 1200) for i in range(40)]
+    constraints = NutritionalConstraints(min_calories=2000, max_calories=2600, min_protein=150, max_fat=90)
+    model = MealPlanModel(foods)
+    problem = model.apply(constraints, max_food_repeat=1)
+    assert CBC.solve(problem) == "Optimal"
+    whole_menu_cost = problem.objective.value()
+
+    problem = model.apply(constraints, max_food_repeat=1)
+    assert model.restrict_to_candidates(3)
+    status = CBC.solve(problem)
+    while model.expand_candidates(problem.objective.value() if status == "Optimal" else None):
+        status = CBC.solve(problem)
+
+    assert status == "Optimal"
+    assert problem.objective.value() == whole_menu_cost
+    assert model.candidate_count < len(foods)
+
+
+def test_restrict_to_candidates__skips_small_menus(foods):
+    model = MealPlanModel(foods)
+    model.apply(NutritionalConstraints(min_calories=1500))
+
+    assert not model.restrict_to_candidates(3)
+
+
+def test_apply__included_foods_become_variable_bounds_not_constraints(foods):
+    model = MealPlanModel(foods)
+    included = (IncludedFood(food_id=foods[3].food_id, min_count=2), IncludedFood(food_id=foods[4].food_id,
+                                                                                   min_count=0, max_count=1))
+
+    problem = model.apply(NutritionalConstraints(min_calories=1500), max_food_repeat=3, included_foods=included)
+
+    assert set(problem.constraints) == {"MinCalories"}
+    assert (model.x_vars[foods[3].food_id].lowBound, model.x_vars[foods[3].food_id].upBound) == (2, 3)
+    assert model.x_vars[foods[4].food_id].upBound == 1
+
+
+def test_apply__includes_expensive_food_and_optimizes_the_rest(foods):
+    model = MealPlanModel(foods)
+    constraints = NutritionalConstraints(min_calories=2000)
+    included = (IncludedFood(food_id=foods[3].food_id),)
+
+    problem = model.apply(constraints, included_foods=included)
+    assert CBC.solve(problem) == "Optimal"
+    counts = model.food_counts()
+
+    assert counts[foods[3].food_id] == 1
+    assert sum(foods[i].calories * counts.get(foods[i].food_id, 0) for i in range(len(foods))) >= 2000
+    # The next request without it gets the bounds reset
+    assert foods[3].food_id not in _solve(model, constraints)
+
+
+def test_apply__included_duplicate_keeps_its_own_limit_within_the_group():
+    duplicate_foods = [make_food(calories=500, protein=50, price=1000), make_food(calories=500, protein=50, price=1000)]
+    model = MealPlanModel(duplicate_foods)
+
+    model.apply(NutritionalConstraints(min_calories=1500), max_food_repeat=3,
+                included_foods=(IncludedFood(food_id=duplicate_foods[1].food_id, min_count=1, max_count=1),))
+
+    assert model.x_vars[duplicate_foods[0].food_id].lowBound == 1
+    assert model.x_vars[duplicate_foods[0].food_id].upBound == 4
+
+
+def test_find_infeasibility__rejects_blacklisted_included_food(foods):
+    infeasibility = MealPlanModel(foods).find_infeasibility(
+        NutritionalConstraints(min_calories=1500), excluded_food_ids=frozenset({foods[3].food_id}),
+        included_foods=(IncludedFood(food_id=foods[3].food_id),))
+
+    assert infeasibility.constraint == "included_foods"
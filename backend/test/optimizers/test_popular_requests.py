@@ -0,0 +1,51 @@
+from datetime import date
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.popular_requests import PopularRequests, RequestShape
+
+
+def _make_request(min_calories: int, food_blacklist: list[str] = None,
+                  plan_date: date = date(2025, 2, 24)) -> MealPlanRequest:
+    return MealPlanRequest(date=plan_date, food_vendor=FoodVendorType.CITY_FOOD,
+                           nutritional_constraints=NutritionalConstraints(min_calories=min_calories),
+                           food_blacklist=food_blacklist or [])
+
+
+def test_most_common__counts_requests_of_other_dates_and_equivalent_blacklists_together():
+    popular_requests = PopularRequests(max_size=10)
+    popular_requests.record(_make_request(2000, ["Hal", "leves"]))
+    popular_requests.record(_make_request(2000, ["LEVES", "hal"], plan_date=date(2025, 2, 25)))
+    popular_requests.record(_make_request(2500))
+
+    assert popular_requests.most_common(1) == [
+        RequestShape(NutritionalConstraints(min_calories=2000), food_blacklist=("hal", "leves"))]
+
+
+def test_record__drops_least_requested_shape_when_full():
+    popular_requests = PopularRequests(max_size=2)
+    for min_calories in [2000, 2000, 2500, 3000]:
+        popular_requests.record(_make_request(min_calories))
+
+    assert [s.nutritional_constraints.min_calories for s in popular_requests.most_common(10)] == [2000, 3000]
+
+
+def test_decay__forgets_shapes_requested_only_once():
+    popular_requests = PopularRequests(max_size=10)
+    for min_calories in [2000, 2000, 2500]:
+        popular_requests.record(_make_request(min_calories))
+
+    popular_requests.decay()
+
+    assert [s.nutritional_constraints.min_calories for s in popular_requests.most_common(10)] == [2000]
+
+
+def test_for_menu__builds_request_of_the_shape():
+    shape = RequestShape.from_request(_make_request(2000, ["Hal"]))
+
+    request = shape.for_menu(date(2025, 3, 1), FoodVendorType.TELETAL)
+
+    assert request == MealPlanRequest(date=date(2025, 3, 1), food_vendor=FoodVendorType.TELETAL,
+                                      nutritional_constraints=NutritionalConstraints(min_calories=2000),
+                                      food_blacklist=["hal"])
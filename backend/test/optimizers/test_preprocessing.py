@@ -0,0 +1,120 @@
+import numpy as np
+
+from optimizers.preprocessing import group_duplicate_foods, find_dominated_foods, find_infeasibility
+from test.conftest import make_food
+
+NO_BOUND = np.nan
+
+
+def _dominated(prices, nutrients, min_values, max_values, capacities):
+    return find_dominated_foods(np.array(prices, dtype=float), np.array(nutrients, dtype=float),
+                                np.array(min_values, dtype=float), np.array(max_values, dtype=float),
+                                np.array(capacities, dtype=float)).tolist()
+
+
+def test_group_duplicate_foods__groups_foods_with_same_price_and_macros():
+    first = make_food(calories=500, protein=50, price=1000)
+    duplicate = make_food(calories=500, protein=50, price=1000)
+    different = make_food(calories=500, protein=50, price=1100)
+
+    assert group_duplicate_foods([first, duplicate, different]) == {
+        first.food_id: [first.food_id, duplicate.food_id],
+        different.food_id: [different.food_id],
+    }
+
+
+def test_find_dominated_foods__drops_pricier_food_with_less_protein():
+    # columns: calories, protein
+    dominated = _dominated([1000, 1200], [[500, 50], [500, 40]], [2000, 150], [NO_BOUND, NO_BOUND],
+                           [np.inf, np.inf])
+
+    assert dominated == [False, True]
+
+
+def test_find_dominated_foods__keeps_food_that_is_better_on_a_max_constraint():
+    dominated = _dominated([1000, 1200], [[500, 50], [300, 40]], [NO_BOUND, 150], [2500, NO_BOUND],
+                           [np.inf, np.inf])
+
+    assert dominated == [False, False]
+
+
+def test_find_dominated_foods__ignores_unconstrained_nutrients():
+    dominated = _dominated([1000, 1200], [[500, 50], [900, 40]], [NO_BOUND, 150], [NO_BOUND, NO_BOUND],
+                           [np.inf, np.inf])
+
+    assert dominated == [False, True]
+
+
+def test_find_dominated_foods__keeps_food_when_dominators_may_run_out_of_repeats():
+    dominated = _dominated([1000, 1200], [[500, 50], [500, 40]], [NO_BOUND, 150], [2000, NO_BOUND],
+                           [1, 1])
+
+    assert dominated == [False, False]
+
+
+def test_find_dominated_foods__drops_food_when_dominators_cover_largest_plan():
+    # max 1000 calories allows at most 2 portions, which the two dominators can cover
+    dominated = _dominated([1000, 1000, 1200], [[500, 50], [500, 50], [500, 40]], [NO_BOUND, 50],
+                           [1000, NO_BOUND], [1, 1, 1])
+
+    assert dominated == [False, False, True]
+
+
+def test_find_dominated_foods__unavailable_food_does_not_dominate():
+    dominated = _dominated([1000, 1200], [[500, 50], [500, 40]], [NO_BOUND, 150], [NO_BOUND, NO_BOUND],
+                           [0, np.inf])
+
+    assert dominated == [False, False]
+
+
+NAMES = ["calories", "protein", "carb", "fat"]
+
+
+def _bounds(**values) -> np.ndarray:
+    return np.array([values.get(name, np.nan) for name in NAMES], dtype=float)
+
+
+def test_find_infeasibility__min_above_menu_total_within_repeat_limit():
+    nutrients = np.array([[500, 40, 50, 10], [600, 30, 60, 20]], dtype=float)
+
+    infeasibility = find_infeasibility(nutrients, np.array([1.0, 1.0]), _bounds(protein=80), _bounds(), NAMES)
+
+    assert infeasibility.constraint == "min_protein"
+    assert find_infeasibility(nutrients, np.array([2.0, 2.0]), _bounds(protein=80), _bounds(), NAMES) is None
+
+
+def test_find_infeasibility__min_unreachable_within_other_max():
+    nutrients = np.array([[500, 40, 50, 10], [600, 30, 60, 20]], dtype=float)
+
+    infeasibility = find_infeasibility(nutrients, np.array([np.inf, np.inf]), _bounds(protein=100),
+                                       _bounds(calories=1000), NAMES)
+
+    assert infeasibility.constraint == "min_protein"
+    assert "max_calories" in infeasibility.message
+
+
+def test_find_infeasibility__ignores_foods_exceeding_a_max_alone():
+    nutrients = np.array([[1500, 150, 50, 10], [500, 20, 60, 20]], dtype=float)
+
+    infeasibility = find_infeasibility(nutrients, np.array([np.inf, np.inf]), _bounds(protein=100),
+                                       _bounds(calories=1200), NAMES)
+
+    assert infeasibility.constraint == "min_protein"
+
+
+def test_find_infeasibility__none_when_a_food_provides_nutrient_for_free():
+    nutrients = np.array([[0, 40, 0, 0], [500, 20, 60, 20]], dtype=float)
+
+    assert find_infeasibility(nutrients, np.array([np.inf, np.inf]), _bounds(protein=1000),
+                              _bounds(calories=600), NAMES) is None
+
+
+def test_find_infeasibility__included_portions_alone_exceed_a_max():
+    nutrients = np.array([[900, 40, 50, 10], [600, 30, 60, 20]], dtype=float)
+
+    infeasibility = find_infeasibility(nutrients, np.array([np.inf, np.inf]), _bounds(), _bounds(calories=1500),
+                                       NAMES, min_counts=np.array([2.0, 0.0]))
+
+    assert infeasibility.constraint == "max_calories"
+    assert find_infeasibility(nutrients, np.array([np.inf, np.inf]), _bounds(), _bounds(calories=1500),
+                              NAMES, min_counts=np.array([1.0, 1.0])) is None
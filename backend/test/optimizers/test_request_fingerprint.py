@@ -0,0 +1,51 @@
+from model.included_food import IncludedFood
+from model.meal_plan_objective import MealPlanObjective
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.request_fingerprint import RequestFingerprint
+from test.conftest import make_request
+
+
+def test_from_request__blacklist_order_and_case_do_not_matter():
+    first = RequestFingerprint.from_request(make_request(food_blacklist=["Csirke", "hal"]), "v1")
+    second = RequestFingerprint.from_request(make_request(food_blacklist=["HAL", "csirke", "hal"]), "v1")
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first.food_blacklist == ("csirke", "hal")
+
+
+def test_from_request__differs_by_menu_version_and_constraints():
+    fingerprint = RequestFingerprint.from_request(make_request(), "v1")
+
+    assert fingerprint != RequestFingerprint.from_request(make_request(), "v2")
+    assert fingerprint != RequestFingerprint.from_request(make_request(max_food_repeat=1), "v1")
+    assert fingerprint != RequestFingerprint.from_request(
+        make_request(nutritional_constraints=NutritionalConstraints(min_calories=2100)), "v1")
+    assert fingerprint != RequestFingerprint.from_request(
+        make_request(objective=MealPlanObjective.MIN_FAT, max_price=3000), "v1")
+
+
+def test_digest__is_stable_and_depends_on_content():
+    fingerprint = RequestFingerprint.from_request(make_request(food_blacklist=["Hal"]), "v1")
+
+    assert fingerprint.digest() == RequestFingerprint.from_request(make_request(food_blacklist=["hal"]), "v1").digest()
+    assert fingerprint.digest() != RequestFingerprint.from_request(make_request(), "v1").digest()
+
+
+def test_digest__depends_on_objective_and_max_price():
+    fingerprint = RequestFingerprint.from_request(make_request(), "v1")
+    min_fat = RequestFingerprint.from_request(make_request(objective=MealPlanObjective.MIN_FAT), "v1")
+    capped = RequestFingerprint.from_request(make_request(max_price=3000), "v1")
+
+    assert len({fingerprint.digest(), min_fat.digest(), capped.digest()}) == 3
+
+
+def test_from_request__included_food_order_does_not_matter():
+    first = RequestFingerprint.from_request(
+        make_request(included_foods=[IncludedFood(food_id=2), IncludedFood(food_id=1, max_count=2)]), "v1")
+    second = RequestFingerprint.from_request(
+        make_request(included_foods=[IncludedFood(food_id=1, max_count=2), IncludedFood(food_id=2)]), "v1")
+
+    assert first == second
+    assert first.digest() == second.digest()
+    assert first.digest() != RequestFingerprint.from_request(make_request(), "v1").digest()
@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from optimizers.single_flight import SingleFlight, single_flight
+
+
+def test_run__concurrent_calls_with_same_key_share_one_call():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_solve(value):
+        calls.append(value)
+        release.wait(timeout=5)
+        return value * 2
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flights.run, "key", slow_solve, 21) for _ in range(4)]
+        while flights.coalesced < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == [42] * 4
+    assert calls == [21]
+    assert flights.coalesced == 3
+
+
+def test_run_shared__tells_waiting_calls_from_the_computing_one():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def slow_solve():
+        release.wait(timeout=5)
+        return "plan"
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(flights.run_shared, "key", slow_solve) for _ in range(3)]
+        while flights.coalesced < 2:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert sorted(results) == [("plan", False), ("plan", True), ("plan", True)]
+
+
+def test_run__different_keys_are_not_coalesced():
+    flights = SingleFlight()
+
+    assert flights.run("a", lambda: 1) == 1
+    assert flights.run("b", lambda: 2) == 2
+    assert flights.coalesced == 0
+
+
+def test_run__propagates_error_and_allows_retry():
+    flights = SingleFlight()
+
+    def failing():
+        raise ValueError("solver crashed")
+
+    with pytest.raises(ValueError):
+        flights.run("key", failing)
+
+    assert flights.run("key", lambda: "ok") == "ok"
+
+
+def test_single_flight__keys_calls_with_key_function():
+    flights = SingleFlight()
+
+    @single_flight(flights, key=lambda a, b: a)
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    assert add.__name__ == "add"
@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+
+from food_vendors.food_vendor_type import FoodVendorType
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.meal_plan_solution import MealPlanSolution
+from optimizers.request_fingerprint import RequestFingerprint
+from optimizers.solution_store import SolutionStore
+
+
+@pytest.fixture
+def solution_store(solution_store_engine):
+    store = SolutionStore(solution_store_engine)
+    yield store
+    store.shutdown()
+
+
+def _make_fingerprint(plan_date: date = date(2025, 2, 24), menu_version: str = "v1") -> RequestFingerprint:
+    return RequestFingerprint(date=plan_date, food_vendor=FoodVendorType.CITY_FOOD, menu_version=menu_version,
+                              food_blacklist=("hal",), nutritional_constraints=NutritionalConstraints(min_calories=2000),
+                              max_food_repeat=1)
+
+
+def test_get__returns_solution_put_before(solution_store):
+    fingerprint = _make_fingerprint(menu_version="stored")
+
+    solution_store.put(fingerprint, MealPlanSolution({12: 2, 34: 1})).result()
+
+    assert solution_store.get(fingerprint) == MealPlanSolution({12: 2, 34: 1})
+
+
+def test_get__misses_other_menu_version(solution_store):
+    solution_store.put(_make_fingerprint(menu_version="old"), MealPlanSolution({12: 2})).result()
+
+    assert solution_store.get(_make_fingerprint(menu_version="new")) is None
+
+
+def test_purge_expired__deletes_solutions_of_past_dates(solution_store):
+    past = _make_fingerprint(plan_date=date(2025, 2, 20), menu_version="purge")
+    future = _make_fingerprint(plan_date=date(2025, 2, 28), menu_version="purge")
+    solution_store.put(past, MealPlanSolution({1: 1})).result()
+    solution_store.put(future, MealPlanSolution({2: 1})).result()
+
+    solution_store.purge_expired(date(2025, 2, 24))
+
+    assert solution_store.get(past) is None
+    assert solution_store.get(future) == MealPlanSolution({2: 1})
+
+
+def test_get__treats_database_errors_as_miss(solution_store, mocker):
+    mocker.patch("optimizers.solution_store.get_cached_solution", side_effect=RuntimeError("disk gone"))
+
+    assert solution_store.get(_make_fingerprint()) is None
@@ -0,0 +1,151 @@
+import tempfile
+
+import pytest
+from pulp import LpProblem, LpMinimize, LpVariable, LpInteger, LpStatusOptimal, LpSolutionIntegerFeasible
+
+from exceptions import SolverBackendUnavailableError
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.meal_plan_model import MealPlanModel
+from optimizers.solver_backend_type import SolverBackendType
+from optimizers.solver_profile_type import SolverProfileType
+from optimizers.solver_profiles import SOLVER_PROFILES
+from optimizers.solver_backends import SOLVER_BACKENDS, CbcBackend, get_solver_backend, optimality_gap, \
+    explored_nodes, is_solver_backend_available
+from test.conftest import make_food
+
+
+def _build_meal_plan_problem(foods, constraints, max_food_repeat=None):
+    model = MealPlanModel(foods)
+    return model.apply(constraints, max_food_repeat), model.x_vars
+
+
+@pytest.fixture
+def foods():
+    return [make_food(calories=500, protein=50, carb=20, fat=10, price=1000),
+            make_food(calories=600, protein=55, carb=10, fat=25, price=1200),
+            make_food(calories=400, protein=20, carb=50, fat=10, price=800),
+            make_food(calories=800, protein=70, carb=5, fat=40, price=2000),
+            make_food(calories=500, protein=15, carb=80, fat=5, price=800)]
+
+
+@pytest.mark.parametrize("max_food_repeat", [None, 1, 2])
+def test_branch_and_bound_backend__finds_same_optimum_as_cbc(foods, max_food_repeat):
+    constraints = NutritionalConstraints(min_calories=1500, max_calories=2700, min_protein=150, max_fat=80)
+    costs = {}
+    for backend_type in [SolverBackendType.CBC, SolverBackendType.BRANCH_AND_BOUND]:
+        problem, x_vars = _build_meal_plan_problem(foods, constraints, max_food_repeat)
+
+        assert SOLVER_BACKENDS[backend_type].solve(problem) == "Optimal"
+        costs[backend_type] = sum(f.price * x_vars[f.food_id].varValue for f in foods)
+
+    assert costs[SolverBackendType.CBC] == costs[SolverBackendType.BRANCH_AND_BOUND]
+
+
+@pytest.mark.parametrize("profile_type", list(SolverProfileType))
+def test_cbc_backend__every_profile_finds_same_optimum(foods, profile_type):
+    constraints = NutritionalConstraints(min_calories=1500, max_calories=2700, min_protein=150, max_fat=80)
+    problem, _ = _build_meal_plan_problem(foods, constraints, max_food_repeat=2)
+
+    assert CbcBackend(SOLVER_PROFILES[profile_type]).solve(problem) == "Optimal"
+    profile_cost = problem.objective.value()
+    assert CbcBackend().solve(problem) == "Optimal"
+
+    assert profile_cost == problem.objective.value()
+
+
+def test_branch_and_bound_backend__reports_infeasible_problem(foods):
+    constraints = NutritionalConstraints(min_protein=1000)
+    problem, _ = _build_meal_plan_problem(foods, constraints, max_food_repeat=1)
+
+    assert SOLVER_BACKENDS[SolverBackendType.BRANCH_AND_BOUND].solve(problem) == "Infeasible"
+
+
+def test_branch_and_bound_backend__rejects_free_variables():
+    problem = LpProblem("free", LpMinimize)
+    x = LpVariable("x", cat=LpInteger)
+    problem += x
+    problem += x >= 1
+
+    with pytest.raises(ValueError):
+        SOLVER_BACKENDS[SolverBackendType.BRANCH_AND_BOUND].solve(problem)
+
+
+@pytest.mark.parametrize("backend_type", [SolverBackendType.CBC, SolverBackendType.BRANCH_AND_BOUND])
+def test_solve__warm_start_from_previous_plan_finds_same_optimum(foods, backend_type):
+    constraints = NutritionalConstraints(min_calories=1500, max_calories=2700, min_protein=150)
+    model = MealPlanModel(foods)
+    problem = model.apply(constraints, max_food_repeat=2)
+    SOLVER_BACKENDS[backend_type].solve(problem)
+    cold = model.food_counts()
+
+    problem = model.apply(constraints, max_food_repeat=2, excluded_food_ids=frozenset({foods[0].food_id}))
+    model.set_initial_counts(cold)
+    assert SOLVER_BACKENDS[backend_type].solve(problem, warm_start=True) == "Optimal"
+    warm = problem.objective.value()
+    assert SOLVER_BACKENDS[backend_type].solve(problem) == "Optimal"
+
+    assert warm == problem.objective.value()
+
+
+@pytest.mark.parametrize("backend", [CbcBackend(capture_nodes=True),
+                                     SOLVER_BACKENDS[SolverBackendType.BRANCH_AND_BOUND]])
+def test_explored_nodes__are_reported_after_solve(foods, backend):
+    constraints = NutritionalConstraints(min_calories=1500, max_calories=2700, min_protein=150, max_fat=80)
+    problem, _ = _build_meal_plan_problem(foods, constraints, max_food_repeat=2)
+
+    backend.solve(problem)
+
+    assert explored_nodes(problem) >= 0
+
+
+def test_cbc_backend__writes_no_log_unless_capturing_nodes(foods, mocker):
+    temporary_directory = mocker.spy(tempfile, "TemporaryDirectory")
+    problem, _ = _build_meal_plan_problem(foods, NutritionalConstraints(min_calories=1500), max_food_repeat=2)
+
+    assert CbcBackend().solve(problem) == "Optimal"
+
+    temporary_directory.assert_not_called()
+    assert explored_nodes(problem) is None
+
+
+def test_optimality_gap__is_zero_for_proven_optimum(foods):
+    problem, _ = _build_meal_plan_problem(foods, NutritionalConstraints(min_calories=1500), max_food_repeat=2)
+
+    SOLVER_BACKENDS[SolverBackendType.BRANCH_AND_BOUND].solve(problem, time_limit=10)
+
+    assert optimality_gap(problem) == 0.0
+
+
+def test_optimality_gap__bounds_saving_of_incumbent(foods):
+    problem, x_vars = _build_meal_plan_problem(foods, NutritionalConstraints(min_calories=1500), max_food_repeat=2)
+    # An incumbent a solver stopped by its time limit could be left with, 1800 kcal for 4000
+    for i, food in enumerate(foods):
+        x_vars[food.food_id].varValue = 1.0 if i in (1, 2, 3) else 0.0
+    problem.assignStatus(LpStatusOptimal, LpSolutionIntegerFeasible)
+
+    # The relaxation takes 2 of the 1.6 per kcal food and 500 kcal at 2 per kcal, 2600 in total
+    assert optimality_gap(problem) == pytest.approx((4000 - 2600) / 4000)
+
+
+def test_get_solver_backend__raises_when_backend_is_unavailable(mocker):
+    is_solver_backend_available.cache_clear()
+    mocker.patch.object(SOLVER_BACKENDS[SolverBackendType.HIGHS], "is_available", return_value=False)
+
+    try:
+        with pytest.raises(SolverBackendUnavailableError):
+            get_solver_backend(SolverBackendType.HIGHS)
+    finally:
+        is_solver_backend_available.cache_clear()
+
+
+def test_get_solver_backend__checks_availability_once(mocker):
+    is_solver_backend_available.cache_clear()
+    is_available = mocker.patch.object(SOLVER_BACKENDS[SolverBackendType.CBC], "is_available", return_value=True)
+
+    try:
+        get_solver_backend(SolverBackendType.CBC)
+        get_solver_backend(SolverBackendType.CBC)
+    finally:
+        is_solver_backend_available.cache_clear()
+
+    is_available.assert_called_once()
@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+from exceptions import SolverPoolBusyError
+from optimizers.solver_pool import SolverPool
+
+
+@pytest.fixture
+def solver_pool():
+    pool = SolverPool(size=1, queue_depth=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_submit__runs_in_worker_process(solver_pool):
+    assert solver_pool.submit(pow, 2, 10).result() == 1024
+
+
+def test_submit__raises_when_queue_is_full(solver_pool):
+    running = solver_pool.submit(time.sleep, 0.5)
+    queued = solver_pool.submit(time.sleep, 0)
+
+    with pytest.raises(SolverPoolBusyError):
+        solver_pool.submit(time.sleep, 0)
+
+    running.result()
+    queued.result()
+    assert solver_pool.submit(pow, 2, 2).result() == 4
+
+
+def test_enabled__false_for_zero_size():
+    assert not SolverPool(size=0, queue_depth=10).enabled
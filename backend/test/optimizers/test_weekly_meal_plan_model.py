@@ -0,0 +1,57 @@
+from datetime import date
+
+import pytest
+
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.solver_backend_type import SolverBackendType
+from optimizers.solver_backends import SOLVER_BACKENDS
+from optimizers.weekly_meal_plan_model import WeeklyMealPlanModel
+from test.conftest import make_food
+
+CBC = SOLVER_BACKENDS[SolverBackendType.CBC]
+MONDAY = date(2025, 2, 24)
+TUESDAY = date(2025, 2, 25)
+CONSTRAINTS = NutritionalConstraints(min_calories=1000)
+
+
+@pytest.fixture
+def daily_foods():
+    # The cheap dish is on both days under different ids, as vendors list it
+    return {
+        MONDAY: [make_food(name="Gulyás", calories=500, price=500, date=MONDAY),
+                 make_food(name="Rántott hal", calories=500, price=900, date=MONDAY)],
+        TUESDAY: [make_food(name="gulyás ", calories=500, price=500, date=TUESDAY),
+                  make_food(name="Lecsó", calories=500, price=800, date=TUESDAY)],
+    }
+
+
+def _solve(model: WeeklyMealPlanModel) -> dict[date, dict[int, int]]:
+    assert CBC.solve(model.problem) == "Optimal"
+    return model.food_counts()
+
+
+def _total_price(daily_foods, daily_counts) -> int:
+    prices = {f.food_id: f.price for foods in daily_foods.values() for f in foods}
+    return sum(prices[food_id] * count for counts in daily_counts.values() for food_id, count in counts.items())
+
+
+def test_food_counts__without_total_limits_matches_independent_days(daily_foods):
+    daily_counts = _solve(WeeklyMealPlanModel(daily_foods, CONSTRAINTS))
+
+    assert daily_counts == {MONDAY: {daily_foods[MONDAY][0].food_id: 2},
+                            TUESDAY: {daily_foods[TUESDAY][0].food_id: 2}}
+
+
+def test_max_total_food_repeat__limits_dish_across_dates(daily_foods):
+    daily_counts = _solve(WeeklyMealPlanModel(daily_foods, CONSTRAINTS, max_total_food_repeat=2))
+
+    goulash_count = daily_counts[MONDAY].get(daily_foods[MONDAY][0].food_id, 0) + \
+        daily_counts[TUESDAY].get(daily_foods[TUESDAY][0].food_id, 0)
+    assert goulash_count == 2
+    assert _total_price(daily_foods, daily_counts) == 2 * 500 + 800 + 800
+
+
+def test_max_total_price__makes_too_expensive_plans_infeasible(daily_foods):
+    problem = WeeklyMealPlanModel(daily_foods, CONSTRAINTS, max_total_food_repeat=2, max_total_price=2500).problem
+
+    assert CBC.solve(problem) == "Infeasible"
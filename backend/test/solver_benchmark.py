@@ -0,0 +1,70 @@
+"""Compare per-solve latency of the solver backends. Run from backend/: python -m test.solver_benchmark"""
+
+import json
+import statistics
+import time
+from collections import defaultdict
+
+from food_vendors.strategies.e_inter_city_food.city_food_strategy import CityFoodStrategy
+from model.food import Food
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.meal_plan_model import MealPlanModel
+from optimizers.solver_backend_type import SolverBackendType
+from optimizers.solver_backends import SOLVER_BACKENDS
+from settings import SETTINGS
+
+MENU_FILE = SETTINGS.data_dir / "city-response-week-10.json"
+NUM_REPEATS = 5
+
+CONSTRAINTS = NutritionalConstraints(min_calories=2300, max_calories=2700, min_protein=180, max_fat=100)
+MAX_FOOD_REPEAT = 1
+
+
+def load_daily_menus() -> dict:
+    with open(MENU_FILE, encoding="utf-8") as f:
+        foods = CityFoodStrategy()._deserialize_food_items(json.load(f))
+
+    menus: dict = defaultdict(list)
+    for food in foods:
+        menus[food.date].append(food)
+    return menus
+
+
+def time_solve(backend_type: SolverBackendType, foods: list[Food]) -> tuple[float, float]:
+    model = MealPlanModel(foods)
+    problem = model.apply(CONSTRAINTS, MAX_FOOD_REPEAT)
+
+    start_time = time.perf_counter()
+    status = SOLVER_BACKENDS[backend_type].solve(problem)
+    duration = time.perf_counter() - start_time
+
+    cost = problem.objective.value() if status == "Optimal" else None
+    return duration, cost
+
+
+def run_benchmark():
+    menus = load_daily_menus()
+    print(f"🚀 Benchmarking solver backends on {len(menus)} menus from {MENU_FILE.name}, {NUM_REPEATS} runs each...\n")
+
+    for backend_type, backend in SOLVER_BACKENDS.items():
+        if not backend.is_available():
+            print(f"⏭️ {backend_type.value}: not available")
+            continue
+
+        durations, costs = [], []
+        for menu_date, foods in sorted(menus.items()):
+            for _ in range(NUM_REPEATS):
+                duration, cost = time_solve(backend_type, foods)
+                durations.append(duration)
+            costs.append(cost)
+
+        durations.sort()
+        print(f"📊 {backend_type.value}:")
+        print(f"  - p50: {statistics.median(durations) * 1000:.2f} ms")
+        print(f"  - p95: {durations[int(len(durations) * 0.95) - 1] * 1000:.2f} ms")
+        print(f"  - Max: {durations[-1] * 1000:.2f} ms")
+        print(f"  - Daily optimal costs: {costs}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,178 @@
+"""
+Replay a corpus of constraint sets against the stored vendor menus to tune and regression-check the solver.
+Run from backend/:
+
+    python -m test.solver_tuning tune                # time every CBC profile, set SOLVER_PROFILE to the winner
+    python -m test.solver_tuning record BASELINE     # store optimal costs and timings of the current code
+    python -m test.solver_tuning check BASELINE      # compare a change against the stored baseline
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+from food_vendors.food_vendor_type import FoodVendorType
+from food_vendors.strategies.e_inter_city_food.city_food_strategy import CityFoodStrategy
+from food_vendors.strategies.e_inter_city_food.inter_food_strategy import InterFoodStrategy
+from model.food import Food
+from model.meal_plan_request import MealPlanRequest
+from model.nutritional_constraints import NutritionalConstraints
+from optimizers.meal_optimizer import solve_meal_plan, clear_solution_cache
+from optimizers.meal_plan_model import MealPlanModel
+from optimizers.request_fingerprint import RequestFingerprint
+from optimizers.solution_store import SOLUTION_STORE
+from optimizers.solver_backends import CbcBackend
+from optimizers.solver_profile_type import SolverProfileType
+from optimizers.solver_profiles import SOLVER_PROFILES
+from settings import SETTINGS
+
+CORPUS_FILE = Path(__file__).parent / "resources" / "solver-corpus.json"
+MENU_FILES = {
+    "city-response-week-9.json": CityFoodStrategy,
+    "city-response-week-10.json": CityFoodStrategy,
+    "interfood-response.json": InterFoodStrategy,
+}
+# Saturday menus only have a handful of foods
+MIN_MENU_SIZE = 50
+NUM_REPEATS = 3
+
+
+def load_corpus() -> list[tuple[NutritionalConstraints, int | None]]:
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        return [(NutritionalConstraints(**entry["nutritionalConstraints"]), entry["maxFoodRepeat"])
+                for entry in json.load(f)]
+
+
+def load_menus() -> dict[tuple[FoodVendorType, date], list[Food]]:
+    menus: dict = defaultdict(list)
+    for file_name, strategy in MENU_FILES.items():
+        with open(SETTINGS.data_dir / file_name, encoding="utf-8") as f:
+            for food in strategy()._deserialize_food_items(json.load(f)):
+                menus[(food.food_vendor, food.date)].append(food)
+
+    return {menu: foods for menu, foods in sorted(menus.items()) if len(foods) >= MIN_MENU_SIZE}
+
+
+def _cost(foods: list[Food], food_counts: dict[int, int]) -> int | None:
+    prices = {food.food_id: food.price for food in foods}
+    return sum(prices[food_id] * count for food_id, count in food_counts.items()) if food_counts else None
+
+
+def time_profile(profile_type: SolverProfileType, models: dict, corpus: list) -> tuple[list[float], list]:
+    backend = CbcBackend(SOLVER_PROFILES[profile_type])
+    durations, costs = [], []
+    for model in models.values():
+        for constraints, max_food_repeat in corpus:
+            problem = model.apply(constraints, max_food_repeat)
+            runs = []
+            for _ in range(NUM_REPEATS):
+                start_time = time.perf_counter()
+                status = backend.solve(problem)
+                runs.append(time.perf_counter() - start_time)
+            durations.append(statistics.median(runs))
+            costs.append(round(problem.objective.value()) if status == "Optimal" else None)
+
+    return durations, costs
+
+
+def tune(menus: dict, corpus: list) -> bool:
+    models = {menu: MealPlanModel(foods) for menu, foods in menus.items()}
+    print(f"🚀 Timing {len(SOLVER_PROFILES)} CBC profiles on {len(models)} menus x {len(corpus)} constraint sets, "
+          f"median of {NUM_REPEATS} runs each...\n")
+    print(f"{'profile':<16} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'total s':>8} {'cost diffs':>10}")
+
+    reference_costs, totals = None, {}
+    for profile_type in SOLVER_PROFILES:
+        durations, costs = time_profile(profile_type, models, corpus)
+        reference_costs = reference_costs or costs
+        cost_diffs = sum(1 for cost, reference in zip(costs, reference_costs) if cost != reference)
+        if cost_diffs == 0:
+            totals[profile_type] = sum(durations)
+
+        durations.sort()
+        print(f"{profile_type.value:<16} {statistics.median(durations) * 1000:>8.2f} "
+              f"{durations[int(len(durations) * 0.95) - 1] * 1000:>8.2f} {durations[-1] * 1000:>8.2f} "
+              f"{sum(durations):>8.2f} {cost_diffs:>10}")
+
+    if not totals:
+        print("\n❌ No profile reproduced the reference costs")
+        return False
+
+    winner = min(totals, key=totals.get)
+    print(f"\n🏆 Fastest profile with identical optimal costs: {winner.value}, set SOLVER_PROFILE={winner.value}")
+
+    return True
+
+
+def solve_corpus(menus: dict, corpus: list) -> list[dict]:
+    """Every instance through `solve_meal_plan` with the solution caches out of the way."""
+    results = []
+    with patch.object(SOLUTION_STORE, "get", return_value=None), patch.object(SOLUTION_STORE, "put"):
+        for (food_vendor, menu_date), foods in menus.items():
+            model = MealPlanModel(foods)
+            for index, (constraints, max_food_repeat) in enumerate(corpus):
+                request = MealPlanRequest(date=menu_date, food_vendor=food_vendor,
+                                          nutritional_constraints=constraints, max_food_repeat=max_food_repeat)
+                fingerprint = RequestFingerprint.from_request(request, model.menu_version)
+                runs = []
+                for _ in range(NUM_REPEATS):
+                    clear_solution_cache()
+                    start_time = time.perf_counter()
+                    solution = solve_meal_plan(fingerprint, model, foods)
+                    runs.append(time.perf_counter() - start_time)
+                results.append({"vendor": food_vendor.value, "date": menu_date.isoformat(), "constraints": index,
+                                "cost": _cost(foods, solution.food_counts), "duration": statistics.median(runs)})
+
+    return results
+
+
+def record(menus: dict, corpus: list, baseline_file: Path):
+    results = solve_corpus(menus, corpus)
+    baseline_file.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"💾 Recorded {len(results)} instances, {sum(r['duration'] for r in results):.2f} s in total, "
+          f"to {baseline_file}")
+
+
+def check(menus: dict, corpus: list, baseline_file: Path) -> bool:
+    baseline = {(r["vendor"], r["date"], r["constraints"]): r for r in json.loads(baseline_file.read_text("utf-8"))}
+    results = solve_corpus(menus, corpus)
+
+    mismatches = [r for r in results if baseline[(r["vendor"], r["date"], r["constraints"])]["cost"] != r["cost"]]
+    for r in mismatches:
+        expected = baseline[(r["vendor"], r["date"], r["constraints"])]["cost"]
+        print(f"❌ {r['vendor']} {r['date']} constraint set {r['constraints']}: cost {r['cost']}, expected {expected}")
+
+    before = sum(r["duration"] for r in baseline.values())
+    after = sum(r["duration"] for r in results)
+    print(f"⏱️ {len(results)} instances took {after:.2f} s, {before:.2f} s in the baseline ({after / before:.2f}x)")
+    print(f"{'✅' if not mismatches else '❌'} {len(results) - len(mismatches)} of {len(results)} optimal costs match")
+
+    return not mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["tune", "record", "check"])
+    parser.add_argument("baseline", nargs="?", type=Path, help="baseline file of record and check")
+    args = parser.parse_args()
+    if args.command != "tune" and args.baseline is None:
+        parser.error(f"{args.command} needs a baseline file")
+
+    menus, corpus = load_menus(), load_corpus()
+    if args.command == "tune":
+        if not tune(menus, corpus):
+            sys.exit(1)
+    elif args.command == "record":
+        record(menus, corpus, args.baseline)
+    elif not check(menus, corpus, args.baseline):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
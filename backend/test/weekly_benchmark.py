@@ -0,0 +1,57 @@
+"""Show how the joint weekly solve scales with days x menu size. Run from backend/: python -m test.weekly_benchmark"""
+
+import statistics
+import time
+
+from optimizers.meal_plan_model import MealPlanModel
+from optimizers.solver_backend_type import SolverBackendType
+from optimizers.solver_backends import SOLVER_BACKENDS
+from optimizers.weekly_meal_plan_model import WeeklyMealPlanModel
+from test.solver_benchmark import CONSTRAINTS, MAX_FOOD_REPEAT, MENU_FILE, load_daily_menus
+
+NUM_REPEATS = 3
+DAY_COUNTS = [1, 3, 5]
+MENU_SIZES = [25, 50, 100]
+MAX_TOTAL_FOOD_REPEAT = 2
+
+CBC = SOLVER_BACKENDS[SolverBackendType.CBC]
+
+
+def time_joint_solve(daily_foods: dict) -> float:
+    durations = []
+    for _ in range(NUM_REPEATS):
+        start_time = time.perf_counter()
+        model = WeeklyMealPlanModel(daily_foods, CONSTRAINTS, MAX_FOOD_REPEAT, MAX_TOTAL_FOOD_REPEAT)
+        CBC.solve(model.problem)
+        durations.append(time.perf_counter() - start_time)
+
+    return statistics.median(durations)
+
+
+def time_independent_solves(daily_foods: dict) -> float:
+    durations = []
+    for _ in range(NUM_REPEATS):
+        start_time = time.perf_counter()
+        for foods in daily_foods.values():
+            CBC.solve(MealPlanModel(foods).apply(CONSTRAINTS, MAX_FOOD_REPEAT))
+        durations.append(time.perf_counter() - start_time)
+
+    return statistics.median(durations)
+
+
+def run_benchmark():
+    menus = dict(sorted(load_daily_menus().items()))
+    print(f"🚀 Benchmarking joint weekly solves on {MENU_FILE.name}, median of {NUM_REPEATS} runs, "
+          f"each dish at most {MAX_TOTAL_FOOD_REPEAT} times...\n")
+    print(f"{'days':>4} {'foods/day':>9} {'joint ms':>9} {'independent ms':>15}")
+
+    for day_count in DAY_COUNTS:
+        for menu_size in MENU_SIZES:
+            daily_foods = {plan_date: foods[:menu_size] for plan_date, foods in list(menus.items())[:day_count]}
+            joint = time_joint_solve(daily_foods)
+            independent = time_independent_solves(daily_foods)
+            print(f"{day_count:>4} {menu_size:>9} {joint * 1000:>9.1f} {independent * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()